@@ -235,71 +235,14 @@ def main():
             if not epub_source_exists:
                 print("❌ Arquivo EPUB fonte não encontrado! Verifique se 'Introduction_to_the_Devout_Life.epub' está na pasta 'data'.")
             else:
-                print(f"\n🔄 EXECUTANDO PIPELINE COMPLETO...")
-                success = True
-                
-                # 1. Processar EPUB
-                if 'epub_process_new' not in missing_scripts:
-                    success = run_script_with_args(scripts['epub_process_new'], [data_files['epub_source']], 
-                                                 "Processamento de EPUB") and success
-                    if success:
-                        copy_to_webapp(data_files['json_en_output'], data_files['json_en_webapp'], "JSON inglês")
-                
-                # 2. Aplicar correções ad hoc
-                if 'fix_ad_hoc' not in missing_scripts and success:
-                    success = run_script(scripts['fix_ad_hoc'], "Correções ad hoc") and success
-                    if success:
-                        copy_to_webapp(data_files['json_en_output'], data_files['json_en_webapp'], "JSON inglês com correções ad hoc")
-               
-                # 3. Reorganizar JSON
-                if 'reorganize_json' not in missing_scripts and success:
-                    success = run_script(scripts['reorganize_json'], "Reorganização do JSON") and success
-                    if success:
-                        copy_to_webapp(data_files['json_en_output'], data_files['json_en_webapp'], "JSON inglês reorganizado")
-                
-                # 4. Corrigir OCR
-                if 'ocr_fix' not in missing_scripts and success:
-                    success = run_script(scripts['ocr_fix'], "Correção de OCR") and success
-                    if success:
-                        copy_to_webapp(data_files['json_en_output'], data_files['json_en_webapp'], "JSON inglês corrigido")
-                
-                # 5. Split part titles
-                if 'split_part_titles' not in missing_scripts and success:
-                    success = run_script(scripts['split_part_titles'], "Split part titles") and success
-                    if success:
-                        copy_to_webapp(data_files['json_en_output'], data_files['json_en_webapp'], "JSON inglês com part titles divididos")
-                
-                # 6. Gerar DOCX
-                if 'docx_clean' not in missing_scripts and success:
-                    success = run_script(scripts['docx_clean'], "Geração de DOCX") and success
-                
-                # 7. Reconstruir JSON português (se existir tradução)
-                if 'json_reconstruct' not in missing_scripts and success:
-                    # Verificar se existe arquivo de tradução para reconstruir
-                    output_dir = 'output'
-                    docx_files = []
-                    if os.path.exists(output_dir):
-                        docx_files = [f for f in os.listdir(output_dir) if f.endswith('.docx') and 'traduzido' in f.lower()]
-                    
-                    if docx_files:
-                        success = run_script(scripts['json_reconstruct'], "Reconstrução de JSON português") and success
-                        if success:
-                            copy_to_webapp(data_files['json_pt_output'], data_files['json_pt_webapp'], "JSON português")
-                    else:
-                        print(f"\n⚠️  Arquivo de tradução não encontrado.")
-                        print(f"   Para completar o pipeline, traduza o DOCX gerado e salve com 'traduzido' no nome.")
-                
-                # 8. Gerar EPUBs (se JSON português existir)
-                if 'epub_generate' not in missing_scripts and success:
-                    if os.path.exists(data_files['json_pt_output']):  # Verificar na pasta output
-                        run_script_with_args(scripts['epub_generate'], ['--auto'], "Geração de EPUBs")
-                    else:
-                        print(f"\n⚠️  JSON português não encontrado.")
-                        print(f"   Execute a tradução no Google Translate e depois a reconstrução (opção 6).")
-                
-                if success:
-                    print(f"\n🎉 PIPELINE CONCLUÍDO!")
-                else:
+                # Todas as etapas no mesmo processo, passando o livro em memória
+                try:
+                    from pipeline import InProcessPipeline
+                    success = InProcessPipeline().run()
+                    if not success:
+                        print(f"\n❌ Pipeline completo não terminou. Corrija os erros acima e execute a opção 9 novamente.")
+                except Exception as e:
+                    print(f"❌ Erro no pipeline: {e}")
                     print(f"\n❌ Pipeline interrompido devido a erros.")
                 
         elif choice == '10':
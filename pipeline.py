@@ -0,0 +1,628 @@
+#!/usr/bin/env python3
+"""
+Pipeline completo executado em processo, como um grafo de etapas.
+
+Importa as funções de cada etapa e passa o livro em memória de uma etapa
+para a outra (EPUB → Ad hoc → Reorganizar → OCR → Split → DOCX →
+Reconstruir → EPUBs). O JSON só é gravado no final, ou após as etapas
+pedidas como checkpoint, em vez de cada script reler e regravar o
+livro_en.json em um subprocesso próprio.
+
+As etapas declaram os artefatos que leem e produzem (scripts/common/stage_graph.py).
+Etapas independentes — DOCX, reconstrução, EPUB inglês, análises — rodam
+ao mesmo tempo em um pool de processos; ao final é exibido o caminho
+crítico do grafo.
+
+Cada etapa passa pelo cache de etapas (scripts/common/stage_cache.py):
+a chave combina o hash do livro de entrada, os arquivos de dados que a
+etapa lê e o código-fonte dos scripts envolvidos. Etapas cujas entradas
+não mudaram reaproveitam a saída armazenada, e uma alteração (por exemplo,
+na tabela de OCR) só executa de novo a própria etapa e as seguintes.
+"""
+
+import copy
+import io
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import redirect_stdout
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(PROJECT_ROOT, 'scripts')
+
+for _subdir in ('common', 'epub_processing', 'json_processing', 'ocr_fixes', 'translation'):
+    _path = os.path.join(SCRIPTS_DIR, _subdir)
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+from book_model import Book
+from stage_cache import StageCache
+from stage_graph import Stage, StageGraph
+from epub_to_json_processor import EpubToJsonProcessor
+import book_binary
+import book_model
+import book_stream
+import chapter_matching
+import content_parsers
+import docx_ooxml
+import element_classifier
+import epub_spine
+import epub_to_json_processor
+import fix_ad_hoc
+import front_matter
+import near_duplicates
+import reorganize_final
+import fix_ocr_manual
+import replacement_automaton
+import rule_engine
+import word_counts
+import word_segmenter
+import split_part_titles
+import tradutor_docx_clean
+import gerar_epub_atualizado
+
+
+PATHS = {
+    'epub_source': os.path.join('data', 'Introduction_to_the_Devout_Life.epub'),
+    'json_en_output': os.path.join('output', 'livro_en.json'),
+    'json_pt_output': os.path.join('output', 'livro_pt-BR.json'),
+    'json_en_webapp': os.path.join('webapp', 'public', 'data', 'livro_en.json'),
+    'json_pt_webapp': os.path.join('webapp', 'public', 'data', 'livro_pt-BR.json'),
+    'docx_clean': os.path.join('output', 'livro_en_CLEAN_for_translation.docx'),
+    'epub_en': os.path.join('output', 'Introduction to the Devout Life_EN.epub'),
+    'epub_pt': os.path.join('output', 'Filoteia - Introdução à vida devota pt-BR.epub'),
+    'summary_csv': os.path.join('data', 'summary.csv'),
+    'checkpoints_dir': os.path.join('output', 'checkpoints'),
+    'cache_dir': os.path.join('output', '.pipeline_cache'),
+}
+
+# Etapas do livro em inglês, na ordem em que são aplicadas
+BOOK_STAGES = ('epub', 'ad_hoc', 'reorganize', 'ocr', 'split')
+
+# Artefatos que não são arquivos: o livro em memória após cada etapa
+BOOK_ARTIFACT_PREFIX = 'book:'
+
+# Formatos dos livros intermediários (cache e checkpoints)
+BOOK_FORMATS = ('json', 'binary')
+
+_EPUB_ASSETS_DIR = os.path.join('scripts', 'epub_processing')
+_EN_FRONT_MATTER = [os.path.join(_EPUB_ASSETS_DIR, 'dedicatory_prayer_en.xhtml'),
+                    os.path.join(_EPUB_ASSETS_DIR, 'preface_en.xhtml')]
+
+
+# Modelo do livro em memória (leitura, gravação e word_count), usado por todas as etapas do livro
+MODEL_INPUTS = [book_model.__file__, word_counts.__file__]
+
+
+def _rule_inputs(rule_set):
+    """Arquivos de que depende uma etapa que aplica um conjunto de data/rules/"""
+    return [rule_engine.__file__, replacement_automaton.__file__,
+            os.path.join('data', 'rules', f"{rule_set}.json")] + MODEL_INPUTS
+
+
+# Arquivos auxiliares gravados pela reconstrução, além do JSON português
+RECONSTRUCT_SIDE_OUTPUTS = [
+    os.path.join(_EPUB_ASSETS_DIR, 'dedicatory_prayer_pt-BR.xhtml'),
+    os.path.join(_EPUB_ASSETS_DIR, 'preface_pt-BR.xhtml'),
+]
+
+# Relatórios gravados pelas análises (na raiz do projeto)
+COMPARE_REPORTS = ['sample_text_original.txt', 'sample_text_inglês_gerado.txt', 'sample_text_português_gerado.txt']
+ANALYZE_REPORTS = ['conteudo_adicionado_ingles.txt']
+
+
+def book_artifact(stage):
+    return f"{BOOK_ARTIFACT_PREFIX}{stage}"
+
+
+def serialize_book(book, book_format='json'):
+    """
+    Bytes do livro no formato dos artefatos intermediários: 'json' (json.dump
+    com indent=2, ensure_ascii=False) ou 'binary' (book_binary.py)
+    """
+    if book_format == 'binary':
+        return book_binary.dumps(book)
+    return json.dumps(book, indent=2, ensure_ascii=False, default=book_model.to_json_value).encode('utf-8')
+
+
+def validating_word_counts(func, output_path=None):
+    """
+    Envolve a função de uma etapa com a validação do word_count (modo de validação).
+
+    A etapa falha se algum parágrafo do livro produzido (ou do JSON gravado
+    em output_path) tiver word_count diferente do número de palavras do texto.
+    """
+    def run(book):
+        result = func(book)
+        if result is False or (output_path is None and result is None):
+            return result
+        produced = Book.load(output_path) if output_path else result
+        mismatches = word_counts.validate_word_counts(produced)
+        if mismatches:
+            print(f"❌ word_count divergente em {len(mismatches)} parágrafos:")
+            for mismatch in mismatches[:5]:
+                print(f"   {mismatch['location']}: gravado {mismatch['word_count']}, "
+                      f"correto {mismatch['expected']}")
+            return False if output_path else None
+        print("   ✅ word_count validado")
+        return result
+    return run
+
+
+def find_translated_docx(output_dir='output'):
+    """
+    Procura o DOCX traduzido (nome contendo 'traduzido') em output/. Se o
+    DOCX limpo foi dividido em partes, devolve a lista das partes traduzidas.
+    Uma parte ('_partNN') nunca é usada como o documento inteiro.
+    """
+    if not os.path.exists(output_dir):
+        return None
+    shard_files = tradutor_docx_clean.find_translated_shards(output_dir, PATHS['docx_clean'])
+    if shard_files:
+        return shard_files
+    single_docx = tradutor_docx_clean.find_translated_single(output_dir)
+    if single_docx is None and any(docx_ooxml.is_shard_file(f) and 'traduzido' in f.lower()
+                                   for f in os.listdir(output_dir) if f.endswith('.docx')):
+        print(f"⚠️  Partes traduzidas em {output_dir}/ sem o manifesto {docx_ooxml.manifest_path(PATHS['docx_clean'])}; ignoradas")
+    return single_docx
+
+
+def build_stages(options):
+    """
+    Monta as etapas do pipeline.
+
+    Args:
+        options (dict): workers, translated_docx (caminho, lista de partes ou None),
+            translated_manifest (manifesto das partes, lido antes das etapas),
+            analyze (bool), validate_word_counts (bool)
+
+    Returns:
+        list: Etapas (Stage) com inputs/outputs declarados
+    """
+    processor = EpubToJsonProcessor()
+    translated_docx = options['translated_docx']
+    translated_files = translated_docx if isinstance(translated_docx, list) else [translated_docx]
+
+    def extract(book):
+        return processor.extract_book(PATHS['epub_source'], options['workers'])
+
+    def fix_ocr(book):
+        fix_ocr_manual.fix_book_manual_only(book, options['workers'])
+        return book
+
+    def split_titles(book):
+        split_part_titles.split_book_part_titles(book)
+        return book
+
+    def reconstruct(book):
+        if os.path.exists(PATHS['json_pt_output']):
+            shutil.copy2(PATHS['json_pt_output'],
+                         PATHS['json_pt_output'].replace('.json', '_backup_before_translation.json'))
+        tradutor_docx_clean.reconstruct_from_clean_docx(
+            translated_docx, PATHS['json_pt_output'], PATHS['json_en_output'], original_data=copy.deepcopy(book),
+            workers=options['workers'], manifest=options['translated_manifest'])
+
+    def run_report(module_name):
+        def run(book):
+            __import__(module_name).main()
+        return run
+
+    en_book = book_artifact('split')
+    stages = [
+        Stage('epub', "Processamento de EPUB", extract,
+              inputs=[PATHS['epub_source'], epub_to_json_processor.__file__, content_parsers.__file__,
+                      element_classifier.__file__, epub_spine.__file__, book_stream.__file__,
+                      front_matter.__file__]
+                     + MODEL_INPUTS,
+              outputs=[book_artifact('epub')]),
+        Stage('ad_hoc', "Correções ad hoc", fix_ad_hoc.fix_book,
+              inputs=[book_artifact('epub'), fix_ad_hoc.__file__] + _rule_inputs('ad_hoc_en'),
+              outputs=[book_artifact('ad_hoc')]),
+        Stage('reorganize', "Reorganização do JSON", reorganize_final.reorganize_book,
+              inputs=[book_artifact('ad_hoc'), reorganize_final.__file__, chapter_matching.__file__,
+                      near_duplicates.__file__, front_matter.__file__, PATHS['summary_csv']] + MODEL_INPUTS,
+              outputs=[book_artifact('reorganize')]),
+        Stage('ocr', "Correção de OCR", fix_ocr,
+              inputs=[book_artifact('reorganize'), fix_ocr_manual.__file__, word_segmenter.__file__]
+                     + _rule_inputs('ocr_en'),
+              outputs=[book_artifact('ocr')]),
+        Stage('split', "Split part titles", split_titles,
+              inputs=[book_artifact('ocr'), split_part_titles.__file__] + MODEL_INPUTS,
+              outputs=[en_book]),
+        Stage('publish_en', "Gravação do JSON inglês", None,
+              inputs=[en_book], outputs=[PATHS['json_en_output']], cached=False),
+        Stage('webapp_en', "Cópia do JSON inglês para a webapp", None,
+              inputs=[PATHS['json_en_output']], outputs=[PATHS['json_en_webapp']], cached=False),
+        Stage('docx', "Geração de DOCX",
+              lambda book: tradutor_docx_clean.create_clean_docx_for_translation(
+                  PATHS['json_en_output'], PATHS['docx_clean'], book_data=book),
+              inputs=[en_book, tradutor_docx_clean.__file__, docx_ooxml.__file__] + _EN_FRONT_MATTER + MODEL_INPUTS,
+              outputs=[PATHS['docx_clean']]),
+    ]
+
+    if translated_docx:
+        stages += [
+            Stage('reconstruct', "Reconstrução de JSON português", reconstruct,
+                  inputs=[en_book] + translated_files + [tradutor_docx_clean.__file__, docx_ooxml.__file__]
+                         + _EN_FRONT_MATTER + _rule_inputs('ad_hoc_pt'),
+                  outputs=[PATHS['json_pt_output']] + RECONSTRUCT_SIDE_OUTPUTS),
+            Stage('webapp_pt', "Cópia do JSON português para a webapp", None,
+                  inputs=[PATHS['json_pt_output']], outputs=[PATHS['json_pt_webapp']], cached=False),
+        ]
+
+    # EPUBs só são gerados quando há JSON português (já existente ou reconstruído)
+    if translated_docx or os.path.exists(PATHS['json_pt_output']):
+        stages += [
+            Stage('epub_en', "Geração do EPUB inglês",
+                  lambda book: gerar_epub_atualizado.generate_epub(
+                      PATHS['json_en_output'], PATHS['epub_en'], 'en', book_data=book),
+                  inputs=[en_book, gerar_epub_atualizado.__file__, book_model.__file__, front_matter.__file__,
+                          os.path.join(_EPUB_ASSETS_DIR, 'license.xhtml'),
+                          os.path.join(_EPUB_ASSETS_DIR, 'title_page_en.xhtml')],
+                  outputs=[PATHS['epub_en']]),
+            Stage('epub_pt', "Geração do EPUB português",
+                  lambda book: gerar_epub_atualizado.generate_epub(PATHS['json_pt_output'], PATHS['epub_pt'], 'pt'),
+                  inputs=[PATHS['json_pt_output'], gerar_epub_atualizado.__file__, book_model.__file__, front_matter.__file__,
+                          os.path.join(_EPUB_ASSETS_DIR, 'license.xhtml'),
+                          os.path.join(_EPUB_ASSETS_DIR, 'title_page_pt-BR.xhtml'),
+                          os.path.join('covers', 'cover_pt-BR.png')],
+                  outputs=[PATHS['epub_pt']]),
+        ]
+        if options['analyze']:
+            stages += [
+                Stage('compare', "Comparação de caracteres dos EPUBs", run_report('compare_epub_text'),
+                      inputs=[PATHS['epub_source'], PATHS['epub_en'], PATHS['epub_pt'],
+                              os.path.join(PROJECT_ROOT, 'compare_epub_text.py')],
+                      outputs=COMPARE_REPORTS),
+                Stage('analyze', "Análise de conteúdo adicionado", run_report('analyze_added_content'),
+                      inputs=[PATHS['epub_source'], PATHS['epub_en'],
+                              os.path.join(PROJECT_ROOT, 'analyze_added_content.py')],
+                      outputs=ANALYZE_REPORTS),
+            ]
+
+    if options.get('validate_word_counts'):
+        for stage in stages:
+            if stage.name in BOOK_STAGES:
+                stage.func = validating_word_counts(stage.func)
+            elif stage.name == 'reconstruct':
+                stage.func = validating_word_counts(stage.func, PATHS['json_pt_output'])
+
+    return stages
+
+
+def _book_input(stage):
+    return next((a for a in stage.inputs if a.startswith(BOOK_ARTIFACT_PREFIX)), None)
+
+
+def _book_output(stage):
+    return next((a for a in stage.outputs if a.startswith(BOOK_ARTIFACT_PREFIX)), None)
+
+
+def execute_stage(stage, cache, values, key, book=None, book_format='json'):
+    """
+    Executa uma etapa e registra suas saídas no cache.
+
+    Args:
+        stage (Stage): Etapa a executar
+        cache (StageCache): Cache de etapas
+        values (dict): Hash de cada artefato já produzido
+        key (str): Chave da etapa no cache
+        book (list, optional): Livro de entrada já em memória
+        book_format (str): Formato em que o livro produzido é armazenado ('json' ou 'binary')
+
+    Returns:
+        tuple: (saídas {artefato: hash}, livro produzido) — saídas None em caso de falha
+    """
+    book_input = _book_input(stage)
+    if book_input and book is None:
+        # JSON ou binário (aberto com mmap direto do objeto do cache)
+        book = book_binary.load_book(cache.object_path(values[book_input]))
+
+    result = stage.func(book)
+
+    outputs = {}
+    book_output = _book_output(stage)
+    if book_output:
+        if result is None:
+            return None, None
+        outputs[book_output] = cache.put_bytes(serialize_book(result, book_format))
+    elif result is False:
+        return None, None
+    for path in stage.outputs:
+        if not path.startswith(BOOK_ARTIFACT_PREFIX) and os.path.exists(path):
+            outputs[path] = cache.put_file(path)
+    cache.record(key, stage.name, outputs)
+    return outputs, (result if book_output else None)
+
+
+# Etapas e opções montadas em cada processo do pool (por _init_worker)
+_WORKER_STAGES = None
+_WORKER_OPTIONS = None
+
+
+def _init_worker(options):
+    global _WORKER_STAGES, _WORKER_OPTIONS
+    os.chdir(PROJECT_ROOT)
+    _WORKER_STAGES = {stage.name: stage for stage in build_stages(options)}
+    _WORKER_OPTIONS = options
+
+
+def _run_stage_worker(name, values, key):
+    """Executa uma etapa em um processo do pool, capturando a saída impressa"""
+    cache = StageCache(PATHS['cache_dir'])
+    buffer = io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(buffer):
+        try:
+            outputs, _ = execute_stage(_WORKER_STAGES[name], cache, values, key,
+                                       book_format=_WORKER_OPTIONS['book_format'])
+        except Exception as e:
+            print(f"❌ Erro: {e}")
+            outputs = None
+    return outputs, buffer.getvalue(), time.perf_counter() - start
+
+
+class InProcessPipeline:
+    """
+    Executa o pipeline completo como grafo de etapas, com cache.
+
+    Etapas prontas ao mesmo tempo rodam em paralelo em um pool de processos;
+    quando só uma etapa está pronta (a cadeia do livro em inglês), ela roda
+    no processo principal e o livro passa de uma etapa à outra em memória.
+
+    Args:
+        checkpoints (iterable): Etapas (de BOOK_STAGES) cujo resultado deve ser
+            gravado em output/checkpoints/<nn>_<etapa>.json
+        workers (int): Processos para o parsing do EPUB e para os capítulos
+            da correção de OCR (1 = serial)
+        force (bool): Ignora as entradas do cache e executa todas as etapas
+        analyze (bool): Inclui compare_epub_text.py e analyze_added_content.py
+        max_parallel (int): Etapas simultâneas (padrão: número de CPUs)
+        validate_word_counts (bool): Confere o word_count do livro produzido
+            por cada etapa executada (etapas vindas do cache não são conferidas)
+        book_format (str): Formato dos livros intermediários no cache e nos
+            checkpoints: 'json' ou 'binary' (colunar, book_binary.py). Os
+            JSON publicados (livro_en.json, webapp) são sempre JSON.
+    """
+
+    def __init__(self, checkpoints=(), workers=1, force=False, analyze=False, max_parallel=None,
+                 validate_word_counts=False, book_format='json'):
+        unknown = set(checkpoints) - set(BOOK_STAGES)
+        if unknown:
+            raise ValueError(f"Checkpoints desconhecidos: {', '.join(sorted(unknown))}")
+        if book_format not in BOOK_FORMATS:
+            raise ValueError(f"Formato de livro desconhecido: {book_format}")
+        self.checkpoints = set(checkpoints)
+        self.force = force
+        self.max_parallel = max_parallel or os.cpu_count() or 1
+        self.options = {'workers': workers, 'translated_docx': None, 'translated_manifest': None, 'analyze': analyze,
+                        'validate_word_counts': validate_word_counts, 'book_format': book_format}
+        self.cache = StageCache(PATHS['cache_dir'])
+        self.durations = {}
+        self.cached = set()
+        # Hash de cada artefato produzido e o livro ainda em memória (hash → livro)
+        self._values = {}
+        self._books = {}
+
+    def _input_values(self, stage):
+        """
+        Hash de cada input: valor produzido nesta execução ou hash do arquivo.
+        Etapas que produzem o livro em formato binário incluem o formato e o
+        código do book_binary.py, para não reaproveitar um livro em outro formato.
+        """
+        values = [self._values[a] if a in self._values else self.cache.file_digest(a) for a in stage.inputs]
+        if _book_output(stage) and self.options['book_format'] != 'json':
+            values += [f"book_format={self.options['book_format']}", self.cache.file_digest(book_binary.__file__)]
+        return values
+
+    def _book_object_is_binary(self, digest):
+        with open(self.cache.object_path(digest), 'rb') as f:
+            return book_binary.is_binary(f.read(len(book_binary.MAGIC)))
+
+    def _complete(self, stage, outputs):
+        self._values.update(outputs)
+        book_output = _book_output(stage)
+        if book_output and stage.name in self.checkpoints:
+            extension = book_binary.BINARY_EXTENSION if self._book_object_is_binary(outputs[book_output]) else '.json'
+            path = os.path.join(PATHS['checkpoints_dir'],
+                                f"{BOOK_STAGES.index(stage.name) + 1:02d}_{stage.name}{extension}")
+            self.cache.restore(outputs[book_output], path)
+            print(f"💾 Checkpoint '{stage.name}': {path}")
+
+    def _run_copy(self, stage):
+        """Etapas sem cache: gravam um artefato já conhecido no destino"""
+        source, target = stage.inputs[0], stage.outputs[0]
+        digest = self._values.get(source) or self.cache.file_digest(source)
+        if source.startswith(BOOK_ARTIFACT_PREFIX) and self._book_object_is_binary(digest):
+            # Livro intermediário binário: o arquivo publicado continua em JSON
+            book = book_binary.load(self.cache.object_path(digest))
+            digest = self.cache.put_bytes(serialize_book(book))
+        if self.cache.restore(digest, target):
+            print(f"📋 {stage.description}: {target}")
+        return {target: digest}
+
+    def _run_inline(self, stage, key):
+        """Executa uma etapa no processo principal, reaproveitando o livro em memória"""
+        print(f"\n🔄 Executando: {stage.description}")
+        print("=" * 50)
+        book_input = _book_input(stage)
+        # A etapa pode alterar o livro: ele sai do cache em memória
+        book = self._books.pop(self._values[book_input], None) if book_input else None
+        start = time.perf_counter()
+        try:
+            outputs, result = execute_stage(stage, self.cache, self._values, key, book,
+                                            self.options['book_format'])
+        except Exception as e:
+            print(f"❌ Erro: {e}")
+            outputs, result = None, None
+        self.durations[stage.name] = time.perf_counter() - start
+        if outputs is not None and result is not None:
+            self._books = {outputs[_book_output(stage)]: result}
+        return outputs
+
+    def run(self):
+        """
+        Executa todas as etapas.
+
+        Returns:
+            bool: True se o pipeline foi concluído sem erros
+        """
+        start = time.perf_counter()
+        print(f"\n🔄 EXECUTANDO PIPELINE COMPLETO (em processo)...")
+
+        if not os.path.exists(PATHS['epub_source']):
+            print(f"❌ Arquivo EPUB fonte não encontrado: {PATHS['epub_source']}")
+            return False
+
+        self.options['translated_docx'] = find_translated_docx()
+        # O manifesto é lido agora: a etapa do DOCX limpo roda em paralelo com a reconstrução
+        if isinstance(self.options['translated_docx'], list):
+            self.options['translated_manifest'] = tradutor_docx_clean.load_translation_manifest(PATHS['docx_clean'])
+        if not self.options['translated_docx']:
+            print(f"\n⚠️  Arquivo de tradução não encontrado.")
+            print(f"   Para completar o pipeline, traduza o DOCX gerado e salve com 'traduzido' no nome.")
+            if not os.path.exists(PATHS['json_pt_output']):
+                print(f"\n⚠️  JSON português não encontrado.")
+                print(f"   Execute a tradução no Google Translate e depois a reconstrução (opção 7).")
+
+        graph = StageGraph(build_stages(self.options))
+        done, failed, started = set(), set(), set()
+        running = {}
+        executor = None
+
+        try:
+            while True:
+                blocked = graph.blocked(failed, started)
+                started |= blocked
+                failed |= blocked
+
+                to_submit = []
+                progressed = False
+                for name in graph.ready(done, started):
+                    stage = graph.stages[name]
+                    started.add(name)
+                    progressed = True
+                    if not stage.cached:
+                        self._complete(stage, self._run_copy(stage))
+                        done.add(name)
+                        continue
+                    key = self.cache.stage_key(name, self._input_values(stage))
+                    outputs = None if self.force else self.cache.lookup(key)
+                    if outputs is not None:
+                        self.cache.hits += 1
+                        self.cached.add(name)
+                        for artifact, digest in outputs.items():
+                            if not artifact.startswith(BOOK_ARTIFACT_PREFIX):
+                                self.cache.restore(digest, artifact)
+                        print(f"♻️  {stage.description}: entradas inalteradas, usando o cache")
+                        self._complete(stage, outputs)
+                        done.add(name)
+                        continue
+                    self.cache.misses += 1
+                    to_submit.append((stage, key))
+
+                # Uma única etapa pronta e nada rodando: executa aqui, com o livro em memória
+                if len(to_submit) == 1 and not running:
+                    stage, key = to_submit.pop()
+                    outputs = self._run_inline(stage, key)
+                    if outputs is None:
+                        failed.add(stage.name)
+                    else:
+                        self._complete(stage, outputs)
+                        done.add(stage.name)
+
+                for stage, key in to_submit:
+                    if executor is None:
+                        executor = ProcessPoolExecutor(max_workers=self.max_parallel,
+                                                       initializer=_init_worker, initargs=(self.options,))
+                    print(f"🚀 Em paralelo: {stage.description}")
+                    future = executor.submit(_run_stage_worker, stage.name, dict(self._values), key)
+                    running[future] = stage
+
+                if progressed:
+                    continue
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage = running.pop(future)
+                    outputs, output_text, seconds = future.result()
+                    print(f"\n🔄 Concluído: {stage.description}")
+                    print("=" * 50)
+                    print(output_text, end='')
+                    self.durations[stage.name] = seconds
+                    if outputs is None:
+                        failed.add(stage.name)
+                    else:
+                        self._complete(stage, outputs)
+                        done.add(stage.name)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        wall = time.perf_counter() - start
+        self._report(graph, wall, failed)
+        if failed:
+            print(f"\n❌ Pipeline interrompido devido a erros: {', '.join(n for n in graph.order if n in failed)}")
+            return False
+        print(f"\n🎉 PIPELINE CONCLUÍDO!")
+        return True
+
+    def _report(self, graph, wall, failed):
+        """Tempos por etapa, paralelismo obtido e caminho crítico"""
+        print(f"\n⏱️  TEMPOS POR ETAPA:")
+        for name in graph.order:
+            stage = graph.stages[name]
+            if name in self.cached:
+                label = f"{stage.description} (cache)"
+            elif name in failed and name not in self.durations:
+                label = f"{stage.description} (não executada)"
+            else:
+                label = stage.description
+            print(f"   {label:<48} {self.durations.get(name, 0.0):7.2f}s")
+        work = sum(self.durations.values())
+        print(f"   {'Total (relógio)':<48} {wall:7.2f}s")
+        print(f"   {'Soma das etapas':<48} {work:7.2f}s")
+        if wall > 0:
+            print(f"   {'Paralelismo efetivo':<48} {work / wall:7.2f}x")
+        path, length = graph.critical_path(self.durations)
+        print(f"\n🧭 Caminho crítico ({length:.2f}s): {' → '.join(path)}")
+        print(f"   ♻️  Cache: {self.cache.hits} etapas reaproveitadas, {self.cache.misses} executadas")
+
+
+def main():
+    """Executa o pipeline em processo pela linha de comando"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pipeline completo em um único processo")
+    parser.add_argument('--checkpoint', action='append', default=[], choices=BOOK_STAGES,
+                        help="Grava o livro após esta etapa em output/checkpoints/ (pode repetir)")
+    parser.add_argument('--workers', type=int, default=1, metavar='N',
+                        help="Processos para o parsing do EPUB e a correção de OCR (padrão: 1)")
+    parser.add_argument('--force', action='store_true',
+                        help="Ignora o cache e executa todas as etapas")
+    parser.add_argument('--analyze', action='store_true',
+                        help="Roda também compare_epub_text.py e analyze_added_content.py")
+    parser.add_argument('--parallel', type=int, default=None, metavar='N',
+                        help="Etapas simultâneas (padrão: número de CPUs)")
+    parser.add_argument('--validate-word-counts', action='store_true',
+                        help="Confere o word_count após cada etapa executada (use com --force para todas)")
+    parser.add_argument('--book-format', choices=BOOK_FORMATS, default='json',
+                        help="Formato dos livros intermediários no cache e nos checkpoints (padrão: json)")
+    args = parser.parse_args()
+
+    os.chdir(PROJECT_ROOT)
+    pipeline = InProcessPipeline(args.checkpoint, args.workers, force=args.force,
+                                 analyze=args.analyze, max_parallel=args.parallel,
+                                 validate_word_counts=args.validate_word_counts,
+                                 book_format=args.book_format)
+    success = pipeline.run()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Formato binário colunar do livro, aberto com mmap.
+
+O livro_en.json (indent=2, ensure_ascii=False) é relido e regravado por
+cada etapa. Para os artefatos intermediários de execuções em volume, este
+formato guarda o mesmo livro em colunas: uma tabela de strings (textos,
+títulos, tipos), arrays de offsets com os limites de partes, capítulos e
+parágrafos e um array tipado de word_count. A abertura não desserializa
+nada; as colunas são memoryviews sobre as páginas do arquivo, e o texto de
+um parágrafo é uma fatia do arquivo (paragraph_bytes) até ser decodificado.
+
+A conversão de e para o JSON não perde nada: cada objeto guarda o seu
+formato (as chaves na ordem original, como string da tabela), e valores
+fora do esquema (chaves desconhecidas, campos que não são texto) vão para
+um JSON de extras do próprio objeto. to_json(dumps(livro)) == livro.
+
+Layout (little-endian):
+    cabeçalho (HEADER)
+    string_offsets      u32 × (n_strings + 1)    início de cada string em strings
+    strings             UTF-8 concatenado
+    part_chapters       u32 × (n_parts + 1)      primeiro capítulo de cada parte
+    chapter_paragraphs  u32 × (n_chapters + 1)   primeiro parágrafo de cada capítulo
+    part_fields         u32 × 4 × n_parts        formato, part_title, part_subtitle, extras
+    chapter_fields      u32 × 3 × n_chapters     formato, chapter_title, extras
+    paragraph_fields    u32 × 4 × n_paragraphs   formato, type, content, extras
+    word_counts         i32 × n_paragraphs
+
+Campos são ids da tabela de strings; NO_STRING representa None (ou campo
+ausente, conforme o formato do objeto).
+
+Uso:
+    python scripts/common/book_binary.py to-binary output/livro_en.json output/livro_en.book
+    python scripts/common/book_binary.py to-json output/livro_en.book output/livro_en.json
+    python scripts/common/book_binary.py benchmark output/livro_en.json
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+
+from book_model import JSON_FORMAT, Book, Chapter, Paragraph, Part, to_json_value
+
+
+MAGIC = b'BOOKCOLS'
+FORMAT_VERSION = 1
+BINARY_EXTENSION = '.book'
+
+# magic, versão, n_strings, n_parts, n_chapters, n_paragraphs e offsets das 8 seções
+HEADER = struct.Struct('<8sIIIII8Q')
+NO_STRING = 0xFFFFFFFF
+KEY_SEPARATOR = '\0'
+
+# Campos de cada nível guardados em colunas (os demais vão para os extras)
+PART_FIELDS = ('part_title', 'part_subtitle')
+CHAPTER_FIELDS = ('chapter_title',)
+PARAGRAPH_FIELDS = ('type', 'content')
+INT32_RANGE = range(-2**31, 2**31)
+
+
+def is_binary(data):
+    """True se os bytes (ou o início do arquivo) são do formato binário"""
+    return bytes(data[:len(MAGIC)]) == MAGIC
+
+
+class _Encoder:
+    """Acumula a tabela de strings e as colunas durante a conversão"""
+
+    def __init__(self):
+        self.string_ids = {}
+        self.string_offsets = [0]
+        self.strings = bytearray()
+        self.part_chapters = [0]
+        self.chapter_paragraphs = [0]
+        self.part_fields = []
+        self.chapter_fields = []
+        self.paragraph_fields = []
+        self.word_counts = []
+
+    def string(self, text):
+        string_id = self.string_ids.get(text)
+        if string_id is None:
+            string_id = self.string_ids[text] = len(self.string_offsets) - 1
+            self.strings += text.encode('utf-8')
+            self.string_offsets.append(len(self.strings))
+        return string_id
+
+    def node(self, obj, fields, children=None, int_field=None):
+        """
+        Separa um objeto em formato, ids dos campos em colunas, inteiro tipado e extras.
+
+        Returns:
+            tuple: (ids [formato, campos..., extras], filhos ou None, inteiro)
+        """
+        if not isinstance(obj, dict) and not hasattr(obj, 'to_json'):
+            raise ValueError(f"Objeto fora do esquema do livro: {obj!r}")
+        ids = {}
+        extra = {}
+        kids = None
+        number = 0
+        for key, value in obj.items():
+            if key in fields and (value is None or isinstance(value, str)):
+                ids[key] = NO_STRING if value is None else self.string(value)
+            elif key == children and isinstance(value, list):
+                kids = value
+            elif (key == int_field and type(value) is int and value in INT32_RANGE):
+                number = value
+            else:
+                extra[key] = value
+        shape = self.string(KEY_SEPARATOR.join(obj.keys()))
+        extra_id = (self.string(json.dumps(extra, ensure_ascii=False, default=to_json_value))
+                    if extra else NO_STRING)
+        return [shape] + [ids.get(field, NO_STRING) for field in fields] + [extra_id], kids, number
+
+    def add_book(self, book):
+        for part in book:
+            row, chapters, _ = self.node(part, PART_FIELDS, 'chapters')
+            self.part_fields.extend(row)
+            for chapter in chapters or ():
+                row, paragraphs, _ = self.node(chapter, CHAPTER_FIELDS, 'content')
+                self.chapter_fields.extend(row)
+                for paragraph in paragraphs or ():
+                    row, _, word_count = self.node(paragraph, PARAGRAPH_FIELDS, int_field='word_count')
+                    self.paragraph_fields.extend(row)
+                    self.word_counts.append(word_count)
+                self.chapter_paragraphs.append(len(self.word_counts))
+            self.part_chapters.append(len(self.chapter_paragraphs) - 1)
+
+    def sections(self):
+        return [
+            _u32_array(self.string_offsets),
+            bytes(self.strings),
+            _u32_array(self.part_chapters),
+            _u32_array(self.chapter_paragraphs),
+            _u32_array(self.part_fields),
+            _u32_array(self.chapter_fields),
+            _u32_array(self.paragraph_fields),
+            struct.pack(f'<{len(self.word_counts)}i', *self.word_counts),
+        ]
+
+
+def _u32_array(values):
+    return struct.pack(f'<{len(values)}I', *values)
+
+
+def dumps(book):
+    """
+    Livro (Book ou lista de dicts no esquema do livro_en.json) no formato binário.
+
+    Returns:
+        bytes
+    """
+    encoder = _Encoder()
+    encoder.add_book(book)
+    sections = encoder.sections()
+    offsets = []
+    position = HEADER.size
+    for section in sections:
+        # Seções alinhadas a 4 bytes, para as colunas serem lidas com memoryview.cast
+        position += -position % 4
+        offsets.append(position)
+        position += len(section)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(encoder.string_offsets) - 1,
+                         len(encoder.part_chapters) - 1, len(encoder.chapter_paragraphs) - 1,
+                         len(encoder.word_counts), *offsets)
+    data = bytearray(header)
+    for offset, section in zip(offsets, sections):
+        data += bytes(offset - len(data))
+        data += section
+    return bytes(data)
+
+
+def save(book, path):
+    """Grava o livro no formato binário (substituição atômica)"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp-{os.getpid()}"
+    with open(temp_path, 'wb') as f:
+        f.write(dumps(book))
+    os.replace(temp_path, path)
+
+
+class BinaryBook:
+    """
+    Livro no formato binário, sobre um arquivo mapeado em memória (open) ou
+    sobre bytes já lidos (from_bytes).
+
+    As colunas (part_chapters, chapter_paragraphs, word_counts...) são
+    memoryviews tipadas sobre o buffer, sem cópia. to_book() monta o Book
+    do modelo para as etapas que alteram o livro.
+    """
+
+    def __init__(self, buffer, path=None):
+        self.path = path
+        self._mmap = buffer if isinstance(buffer, mmap.mmap) else None
+        self._buffer = memoryview(buffer)
+        try:
+            fields = HEADER.unpack_from(self._buffer, 0)
+        except struct.error:
+            self.close()
+            raise ValueError(f"Livro binário inválido: {path or '<bytes>'}")
+        (magic, version, self.n_strings, self.n_parts, self.n_chapters, self.n_paragraphs,
+         *offsets) = fields
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Livro binário inválido: {path or '<bytes>'}")
+        (strings_offsets, self._strings, part_chapters, chapter_paragraphs,
+         part_fields, chapter_fields, paragraph_fields, word_counts) = offsets
+        self._views = []
+        self.string_offsets = self._column(strings_offsets, self.n_strings + 1, 'I')
+        self.part_chapters = self._column(part_chapters, self.n_parts + 1, 'I')
+        self.chapter_paragraphs = self._column(chapter_paragraphs, self.n_chapters + 1, 'I')
+        self.part_fields = self._column(part_fields, 4 * self.n_parts, 'I')
+        self.chapter_fields = self._column(chapter_fields, 3 * self.n_chapters, 'I')
+        self.paragraph_fields = self._column(paragraph_fields, 4 * self.n_paragraphs, 'I')
+        self.word_counts = self._column(word_counts, self.n_paragraphs, 'i')
+
+    @classmethod
+    def open(cls, path):
+        """Abre um arquivo binário com mmap"""
+        with open(path, 'rb') as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), path)
+
+    @classmethod
+    def from_bytes(cls, data):
+        return cls(data)
+
+    def _column(self, offset, count, typecode):
+        view = self._buffer[offset:offset + 4 * count]
+        if sys.byteorder == 'little':
+            view = view.cast(typecode)
+        else:
+            # Máquinas big-endian: cópia com a ordem dos bytes invertida
+            import array
+            column = array.array(typecode, view)
+            column.byteswap()
+            view = memoryview(column)
+        self._views.append(view)
+        return view
+
+    def close(self):
+        for view in getattr(self, '_views', ()):
+            view.release()
+        self._views = []
+        self._buffer.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Acesso direto às colunas
+
+    def string_bytes(self, string_id):
+        """Fatia UTF-8 de uma string da tabela, sem cópia (None para NO_STRING)"""
+        if string_id == NO_STRING:
+            return None
+        start = self._strings + self.string_offsets[string_id]
+        return self._buffer[start:self._strings + self.string_offsets[string_id + 1]]
+
+    def string(self, string_id):
+        data = self.string_bytes(string_id)
+        return None if data is None else str(data, 'utf-8')
+
+    def chapter_range(self, part_index):
+        """range dos índices globais dos capítulos de uma parte"""
+        return range(self.part_chapters[part_index], self.part_chapters[part_index + 1])
+
+    def paragraph_range(self, chapter_index):
+        """range dos índices globais dos parágrafos de um capítulo"""
+        return range(self.chapter_paragraphs[chapter_index], self.chapter_paragraphs[chapter_index + 1])
+
+    def paragraph_bytes(self, paragraph_index):
+        """Texto UTF-8 de um parágrafo como fatia do arquivo, sem cópia"""
+        return self.string_bytes(self.paragraph_fields[4 * paragraph_index + 2])
+
+    def paragraph_text(self, paragraph_index):
+        return self.string(self.paragraph_fields[4 * paragraph_index + 2])
+
+    def total_words(self):
+        """Soma do word_count de todos os parágrafos, direto da coluna tipada"""
+        return sum(self.word_counts)
+
+    # Conversão para o esquema JSON
+
+    def _materialize(self, make_part, make_chapter, make_paragraph):
+        """
+        Monta o livro inteiro; cada make_* recebe (chaves, valores) de um objeto.
+        Os valores das colunas são completados pelos extras, que têm prioridade.
+        """
+        blob = self._buffer[self._strings:self._strings + self.string_offsets[self.n_strings]].tobytes()
+        offsets = self.string_offsets.tolist()
+        strings = [blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(self.n_strings)]
+        shapes = {}
+
+        def fields(row, names, values):
+            keys = shapes.get(row[0])
+            if keys is None:
+                shape = strings[row[0]]
+                keys = shapes[row[0]] = tuple(shape.split(KEY_SEPARATOR)) if shape else ()
+            for name, string_id in zip(names, row[1:-1]):
+                if name in keys:
+                    values[name] = None if string_id == NO_STRING else strings[string_id]
+            if row[-1] != NO_STRING:
+                values.update(json.loads(strings[row[-1]]))
+            return keys, values
+
+        part_fields = self.part_fields.tolist()
+        chapter_fields = self.chapter_fields.tolist()
+        paragraph_fields = self.paragraph_fields.tolist()
+        word_counts = self.word_counts.tolist()
+        part_chapters = self.part_chapters.tolist()
+        chapter_paragraphs = self.chapter_paragraphs.tolist()
+        book = []
+        for part_index in range(self.n_parts):
+            chapters = []
+            for chapter_index in range(part_chapters[part_index], part_chapters[part_index + 1]):
+                content = [make_paragraph(*fields(paragraph_fields[4 * i:4 * i + 4], PARAGRAPH_FIELDS,
+                                                  {'word_count': word_counts[i]}))
+                           for i in range(chapter_paragraphs[chapter_index], chapter_paragraphs[chapter_index + 1])]
+                chapters.append(make_chapter(*fields(chapter_fields[3 * chapter_index:3 * chapter_index + 3],
+                                                     CHAPTER_FIELDS, {'content': content})))
+            book.append(make_part(*fields(part_fields[4 * part_index:4 * part_index + 4],
+                                          PART_FIELDS, {'chapters': chapters})))
+        return book
+
+    def to_json(self):
+        """Livro como listas e dicts, idêntico ao que json.load devolveria"""
+        def make(keys, values):
+            return {key: values[key] for key in keys}
+        return self._materialize(make, make, make)
+
+    def to_book(self):
+        """Book do modelo (book_model.py) com o conteúdo do arquivo, sem passar por dicts"""
+        return Book(self._materialize(Part.from_fields, Chapter.from_fields, Paragraph.from_fields))
+
+
+def loads(data):
+    """Book a partir de bytes no formato binário"""
+    with BinaryBook.from_bytes(data) as binary:
+        return binary.to_book()
+
+
+def load(path):
+    """Book a partir de um arquivo binário (aberto com mmap)"""
+    with BinaryBook.open(path) as binary:
+        return binary.to_book()
+
+
+def load_book(path):
+    """Book a partir de um arquivo em qualquer um dos formatos (JSON ou binário)"""
+    with open(path, 'rb') as f:
+        binary = is_binary(f.read(len(MAGIC)))
+    return load(path) if binary else Book.load(path)
+
+
+def loads_book(data):
+    """Book a partir de bytes em qualquer um dos formatos (JSON ou binário)"""
+    return loads(data) if is_binary(data) else Book.loads(data)
+
+
+def save_book(book, path):
+    """Grava no formato binário se o caminho terminar em .book; senão, em JSON"""
+    if path.endswith(BINARY_EXTENSION):
+        save(book, path)
+    else:
+        Book.from_json(book).save(path)
+
+
+def benchmark(json_path, rounds=20):
+    """
+    Tempos médios de leitura e gravação do mesmo livro nos dois formatos.
+
+    Returns:
+        dict: nome da medida → segundos (ou bytes, para os tamanhos)
+    """
+    with open(json_path, 'rb') as f:
+        json_bytes = f.read()
+    book = Book.loads(json_bytes)
+    binary_bytes = dumps(book)
+
+    def timed(func):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        return (time.perf_counter() - start) / rounds
+
+    def word_total_json():
+        return sum(p['word_count'] for part in json.loads(json_bytes)
+                   for chapter in part['chapters'] for p in chapter['content'])
+
+    def word_total_binary():
+        with BinaryBook.from_bytes(binary_bytes) as binary:
+            return binary.total_words()
+
+    return {
+        'json_size': len(json_bytes),
+        'binary_size': len(binary_bytes),
+        'json_load': timed(lambda: Book.loads(json_bytes)),
+        'binary_load': timed(lambda: loads(binary_bytes)),
+        'json_dump': timed(lambda: json.dumps(book, default=to_json_value, **JSON_FORMAT).encode('utf-8')),
+        'binary_dump': timed(lambda: dumps(book)),
+        'json_word_total': timed(word_total_json),
+        'binary_word_total': timed(word_total_binary),
+    }
+
+
+def main():
+    """Conversão entre os formatos e comparação de tempos pela linha de comando"""
+    if len(sys.argv) < 3 or sys.argv[1] not in ('to-binary', 'to-json', 'benchmark'):
+        print("Uso: book_binary.py to-binary LIVRO.json LIVRO.book")
+        print("     book_binary.py to-json LIVRO.book LIVRO.json")
+        print("     book_binary.py benchmark LIVRO.json")
+        return False
+    command, source = sys.argv[1], sys.argv[2]
+    if command == 'benchmark':
+        results = benchmark(source)
+        print(f"📦 {source}: JSON {results['json_size'] / 1024:.0f} KiB, "
+              f"binário {results['binary_size'] / 1024:.0f} KiB")
+        for label, key in (("Leitura para Book", 'load'), ("Gravação", 'dump'),
+                           ("Soma dos word_count", 'word_total')):
+            print(f"   {label:<22} JSON {results[f'json_{key}'] * 1000:7.2f} ms   "
+                  f"binário {results[f'binary_{key}'] * 1000:7.2f} ms")
+        return True
+    if len(sys.argv) < 4:
+        print("❌ Informe o arquivo de destino")
+        return False
+    target = sys.argv[3]
+    if command == 'to-binary':
+        save(Book.load(source), target)
+    else:
+        load(source).save(target)
+    print(f"✅ {source} → {target}")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
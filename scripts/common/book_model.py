@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Modelo compacto do livro em memória: Book, Part, Chapter e Paragraph.
+
+json.load devolve um dict para cada parte, capítulo e parágrafo. Com muitos
+livros carregados, o custo fixo de cada dict (tabela de hash e chaves)
+pesa mais que o próprio texto dos parágrafos curtos. As classes do modelo
+guardam os campos conhecidos em __slots__, sem um __dict__ por objeto, e o
+"type" dos parágrafos é internado.
+
+A ida e volta pelo JSON não perde nada. Cada objeto lembra quais chaves
+tinha e em que ordem, em uma tupla compartilhada entre objetos com o mesmo
+formato. Chaves desconhecidas ficam à parte, em _extra. Assim,
+Book.load(path).save(path) grava um arquivo idêntico byte a byte.
+
+O Paragraph mantém o word_count em dia: trocar o texto recalcula o
+word_count só quando o texto muda (ver word_counts.py).
+
+Para o código que ainda trata o livro como dicts (motor de regras,
+validação), os objetos também aceitam item['campo'], item.get('campo'),
+item.pop('campo'), 'campo' in item, keys() e items().
+
+Uso:
+    book = Book.load('output/livro_en.json')
+    for part in book:
+        for chapter in part.chapters:
+            for paragraph in chapter.content:
+                paragraph.content = paragraph.content.replace('tbe', 'the')
+    book.save('output/livro_en.json')
+"""
+
+import json
+import sys
+import tracemalloc
+
+
+JSON_FORMAT = {'indent': 2, 'ensure_ascii': False}
+
+# Tuplas de chaves compartilhadas (uma por formato de objeto)
+_KEY_TUPLES = {}
+
+
+def count_words(text):
+    """Número de palavras de um texto (separadas por qualquer espaço em branco)"""
+    return len(text.split()) if isinstance(text, str) else 0
+
+
+def _shared_keys(keys):
+    return _KEY_TUPLES.setdefault(keys, keys)
+
+
+class _Node:
+    """
+    Base dos objetos do modelo: campos conhecidos (FIELDS) em slots, chaves
+    presentes em _keys (na ordem do JSON) e chaves desconhecidas em _extra.
+    Campos ausentes valem None.
+    """
+
+    __slots__ = ('_keys', '_extra')
+    FIELDS = ()
+    CHILDREN = {}    # campo → classe dos itens da lista desse campo
+
+    def __init__(self, **fields):
+        object.__setattr__(self, '_keys', ())
+        object.__setattr__(self, '_extra', None)
+        for name in self.FIELDS:
+            object.__setattr__(self, name, None)
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_json(cls, obj):
+        """Objeto do modelo a partir de um dict lido do JSON (outros valores passam intactos)"""
+        if not isinstance(obj, dict):
+            return obj
+        node = cls.__new__(cls)
+        for name in cls.FIELDS:
+            object.__setattr__(node, name, None)
+        extra = None
+        for key, value in obj.items():
+            if key in cls.FIELDS:
+                object.__setattr__(node, key, cls._convert(key, value))
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        object.__setattr__(node, '_keys', _shared_keys(tuple(obj)))
+        object.__setattr__(node, '_extra', extra)
+        return node
+
+    @classmethod
+    def from_fields(cls, keys, values):
+        """
+        Objeto a partir das chaves (na ordem do JSON) e dos valores já separados,
+        com os filhos já convertidos (usado pelo formato binário, book_binary.py)
+        """
+        node = cls.__new__(cls)
+        for name in cls.FIELDS:
+            object.__setattr__(node, name, None)
+        extra = None
+        for key in keys:
+            value = values[key]
+            if key in cls.CHILDREN:
+                object.__setattr__(node, key, value)
+            elif key in cls.FIELDS:
+                object.__setattr__(node, key, cls._convert(key, value))
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        object.__setattr__(node, '_keys', _shared_keys(keys))
+        object.__setattr__(node, '_extra', extra)
+        return node
+
+    @classmethod
+    def _convert(cls, key, value):
+        child = cls.CHILDREN.get(key)
+        if child is not None and isinstance(value, list):
+            return [child.from_json(item) for item in value]
+        return value
+
+    def to_json(self):
+        """dict com as chaves na ordem original (os filhos continuam objetos do modelo)"""
+        return {key: self[key] for key in self._keys}
+
+    def __setattr__(self, name, value):
+        if name in self.FIELDS and name not in self._keys:
+            object.__setattr__(self, '_keys', _shared_keys(self._keys + (name,)))
+        object.__setattr__(self, name, value)
+
+    # Interface de dict, para o código que ainda trata o livro como dicts
+
+    def __getitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        return getattr(self, key) if key in self.FIELDS else self._extra[key]
+
+    def __setitem__(self, key, value):
+        if key in self.FIELDS:
+            setattr(self, key, value)
+            return
+        if self._extra is None:
+            object.__setattr__(self, '_extra', {})
+        self._extra[key] = value
+        if key not in self._keys:
+            object.__setattr__(self, '_keys', _shared_keys(self._keys + (key,)))
+
+    def get(self, key, default=None):
+        return self[key] if key in self._keys else default
+
+    def pop(self, key, default=None):
+        """Remove a chave (campo volta a None) e devolve o valor, como dict.pop"""
+        if key not in self._keys:
+            return default
+        value = self[key]
+        object.__setattr__(self, '_keys', _shared_keys(tuple(k for k in self._keys if k != key)))
+        if key in self.FIELDS:
+            object.__setattr__(self, key, None)
+        else:
+            del self._extra[key]
+            if not self._extra:
+                object.__setattr__(self, '_extra', None)
+        return value
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def keys(self):
+        return list(self._keys)
+
+    def items(self):
+        return [(key, self[key]) for key in self._keys]
+
+    def __eq__(self, other):
+        if isinstance(other, _Node):
+            return type(self) is type(other) and self.to_json() == other.to_json()
+        if isinstance(other, dict):
+            return self.to_json() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_json()!r})"
+
+    def __reduce__(self):
+        # pickle / copy.deepcopy (pool de processos, cópia do livro para a tradução)
+        return type(self).from_json, (self.to_json(),)
+
+
+class Paragraph(_Node):
+    """Item de conteúdo: type ('p', 'h1'...), content (texto) e word_count"""
+
+    __slots__ = ('type', 'content', 'word_count')
+    FIELDS = ('type', 'content', 'word_count')
+
+    @classmethod
+    def _convert(cls, key, value):
+        if key == 'type' and isinstance(value, str):
+            return sys.intern(value)
+        return value
+
+    def __setattr__(self, name, value):
+        if name == 'content' and 'content' in self._keys:
+            self.set_content(value)
+        else:
+            _Node.__setattr__(self, name, value)
+
+    def set_content(self, text, word_count=None):
+        """
+        Troca o texto, recalculando o word_count só se o texto mudou.
+
+        Args:
+            text (str): Texto novo
+            word_count (int, optional): Número de palavras já conhecido pelo chamador
+
+        Returns:
+            bool: True se o texto mudou
+        """
+        if self.content == text and 'word_count' in self._keys:
+            return False
+        _Node.__setattr__(self, 'content', text)
+        _Node.__setattr__(self, 'word_count', count_words(text) if word_count is None else word_count)
+        return True
+
+
+class Chapter(_Node):
+    """Capítulo: chapter_title e content (lista de Paragraph)"""
+
+    __slots__ = ('chapter_title', 'content')
+    FIELDS = ('chapter_title', 'content')
+    CHILDREN = {'content': Paragraph}
+
+
+class Part(_Node):
+    """
+    Parte: part_title, part_subtitle (opcional), section_kind (opcional, ver
+    front_matter.py) e chapters (lista de Chapter)
+    """
+
+    __slots__ = ('part_title', 'part_subtitle', 'section_kind', 'chapters')
+    FIELDS = ('part_title', 'part_subtitle', 'section_kind', 'chapters')
+    CHILDREN = {'chapters': Chapter}
+
+
+def to_json_value(value):
+    """default de json.dump: objetos do modelo são gravados como os dicts originais"""
+    if isinstance(value, _Node):
+        return value.to_json()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class Book(list):
+    """Livro: lista de Part, com leitura e gravação no formato de livro_en.json"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(Part.from_json(part) for part in data)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_json(json.load(f))
+
+    @classmethod
+    def loads(cls, data):
+        """Como load, a partir de str ou bytes"""
+        return cls.from_json(json.loads(data))
+
+    def dumps(self):
+        """Texto do livro no formato padrão (json.dump com indent=2, ensure_ascii=False)"""
+        return json.dumps(self, default=to_json_value, **JSON_FORMAT)
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self, f, default=to_json_value, **JSON_FORMAT)
+
+    def chapters(self):
+        """Todos os capítulos, na ordem do livro"""
+        return [chapter for part in self for chapter in part.chapters or []]
+
+
+def measure_corpus(path, copies):
+    """
+    Memória alocada para carregar o mesmo livro `copies` vezes, como dicts
+    (json.load) e como Book.
+
+    Returns:
+        tuple: (bytes com dicts, bytes com o modelo)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    results = []
+    for load in (json.loads, Book.loads):
+        tracemalloc.start()
+        corpus = [load(text) for _ in range(copies)]
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del corpus
+        results.append(current)
+    return tuple(results)
+
+
+def main():
+    """Compara a memória de um corpus de livros carregado como dicts e como Book"""
+    path = sys.argv[1] if len(sys.argv) > 1 else 'output/livro_en.json'
+    copies = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    dict_bytes, model_bytes = measure_corpus(path, copies)
+    print(f"📚 {copies} cópias de {path}")
+    print(f"   dicts (json.load): {dict_bytes / 2**20:.1f} MiB")
+    print(f"   Book (__slots__):  {model_bytes / 2**20:.1f} MiB")
+    print(f"   Economia: {(1 - model_bytes / dict_bytes) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Leitura e escrita em streaming do JSON do livro (livro_en.json / livro_pt-BR.json).
+
+O escritor emite cada parte/capítulo assim que é produzido, no mesmo
+formato de json.dump(..., indent=2, ensure_ascii=False), de modo que o
+arquivo gerado é idêntico byte a byte ao da gravação tradicional. O leitor
+percorre o arquivo em blocos e devolve partes ou capítulos um a um, sem
+carregar o livro inteiro na memória.
+"""
+
+import json
+import os
+
+from book_model import to_json_value
+
+
+INDENT = 2
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def _dumps(value, level):
+    """Serializa um valor como json.dump(indent=2) o faria no nível de aninhamento dado"""
+    text = json.dumps(value, indent=INDENT, ensure_ascii=False, default=to_json_value)
+    if level == 0:
+        return text
+    # Strings JSON não contêm quebras de linha literais: indentar por linha é seguro
+    return text.replace('\n', '\n' + ' ' * (INDENT * level))
+
+
+class BookJsonWriter:
+    """
+    Escritor em streaming da lista de partes do livro.
+
+    Uso:
+        with BookJsonWriter(path) as writer:
+            writer.begin_part(part_title="...")
+            writer.write_chapter(chapter)
+            writer.end_part()
+            writer.write_part(part_completa)
+
+    O arquivo é gravado em um temporário no mesmo diretório e só substitui
+    o destino no fechamento, então é seguro ler e escrever o mesmo caminho.
+    Se ocorrer uma exceção dentro do bloco with, o destino não é alterado.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.parts_written = 0
+        self.chapters_written = 0
+        self._file = None
+        self._temp_path = None
+        self._in_part = False
+        self._part_chapters = 0
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def open(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._temp_path = f"{self.path}.tmp-{os.getpid()}"
+        self._file = open(self._temp_path, 'w', encoding='utf-8')
+        self._file.write('[')
+
+    def begin_part(self, **fields):
+        """Abre uma parte; os campos são gravados, nesta ordem, antes de "chapters"."""
+        if self._in_part:
+            raise RuntimeError("begin_part() chamado com uma parte ainda aberta")
+        separator = ',' if self.parts_written else ''
+        self._file.write(f"{separator}\n{' ' * INDENT}{{")
+        for key, value in fields.items():
+            self._file.write(f"\n{' ' * (INDENT * 2)}{_dumps(key, 0)}: {_dumps(value, 2)},")
+        self._file.write(f"\n{' ' * (INDENT * 2)}\"chapters\": [")
+        self._in_part = True
+        self._part_chapters = 0
+
+    def write_chapter(self, chapter):
+        """Grava um capítulo da parte aberta"""
+        if not self._in_part:
+            raise RuntimeError("write_chapter() chamado sem parte aberta")
+        separator = ',' if self._part_chapters else ''
+        self._file.write(f"{separator}\n{' ' * (INDENT * 3)}{_dumps(chapter, 3)}")
+        self._part_chapters += 1
+        self.chapters_written += 1
+
+    def end_part(self, **trailing_fields):
+        """Fecha a parte aberta; campos extras são gravados depois de "chapters"."""
+        if not self._in_part:
+            raise RuntimeError("end_part() chamado sem parte aberta")
+        if self._part_chapters:
+            self._file.write(f"\n{' ' * (INDENT * 2)}]")
+        else:
+            self._file.write("]")
+        for key, value in trailing_fields.items():
+            self._file.write(f",\n{' ' * (INDENT * 2)}{_dumps(key, 0)}: {_dumps(value, 2)}")
+        self._file.write(f"\n{' ' * INDENT}}}")
+        self._in_part = False
+        self.parts_written += 1
+
+    def write_part(self, part):
+        """Grava uma parte completa (dict com "chapters"), preservando a ordem das chaves"""
+        if 'chapters' not in part:
+            separator = ',' if self.parts_written else ''
+            self._file.write(f"{separator}\n{' ' * INDENT}{_dumps(part, 1)}")
+            self.parts_written += 1
+            return
+        leading = {}
+        trailing = {}
+        target = leading
+        for key, value in part.items():
+            if key == 'chapters':
+                target = trailing
+                continue
+            target[key] = value
+        self.begin_part(**leading)
+        for chapter in part['chapters']:
+            self.write_chapter(chapter)
+        self.end_part(**trailing)
+
+    def close(self):
+        """Finaliza a lista e substitui o arquivo de destino"""
+        if self._file is None:
+            return
+        if self._in_part:
+            self.end_part()
+        self._file.write('\n]' if self.parts_written else ']')
+        self._file.close()
+        self._file = None
+        os.replace(self._temp_path, self.path)
+
+    def abort(self):
+        """Descarta o que foi escrito, mantendo o arquivo de destino intacto"""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        os.remove(self._temp_path)
+
+
+class _JsonTokenStream:
+    """Buffer sobre o arquivo que decodifica valores JSON incrementalmente"""
+
+    def __init__(self, f):
+        self._file = f
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self):
+        if self._eof:
+            return False
+        chunk = self._file.read(READ_CHUNK_SIZE)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self):
+        """Próximo caractere não branco (sem consumir) ou '' no fim do arquivo"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in ' \t\r\n':
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"JSON do livro inválido: esperado {char!r} na posição {self._pos}")
+        self._pos += 1
+
+    def value(self):
+        """Decodifica o próximo valor JSON completo"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # Números e literais no fim do buffer podem estar incompletos
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            if not self._fill():
+                value, self._pos = self._decoder.raw_decode(self._buffer, self._pos)
+                return value
+
+
+def _iter_array(stream):
+    """Percorre os itens de um array JSON, chamando o consumidor de cada item"""
+    stream.expect('[')
+    if stream.peek() == ']':
+        stream.expect(']')
+        return
+    while True:
+        yield
+        if stream.peek() == ',':
+            stream.expect(',')
+            continue
+        stream.expect(']')
+        return
+
+
+def iter_book_chapters(path):
+    """
+    Percorre os capítulos do livro sem carregar o arquivo inteiro.
+
+    Args:
+        path (str): Arquivo JSON do livro
+
+    Yields:
+        tuple: (índice da parte, campos da parte lidos até "chapters", capítulo)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = _JsonTokenStream(f)
+        for part_index, _ in enumerate(_iter_array(stream)):
+            stream.expect('{')
+            part_fields = {}
+            if stream.peek() == '}':
+                stream.expect('}')
+                continue
+            while True:
+                key = stream.value()
+                stream.expect(':')
+                if key == 'chapters' and stream.peek() == '[':
+                    for _ in _iter_array(stream):
+                        yield part_index, part_fields, stream.value()
+                else:
+                    part_fields[key] = stream.value()
+                if stream.peek() == ',':
+                    stream.expect(',')
+                    continue
+                stream.expect('}')
+                break
+
+
+def iter_book_parts(path):
+    """
+    Percorre as partes do livro, uma de cada vez.
+
+    Args:
+        path (str): Arquivo JSON do livro
+
+    Yields:
+        dict: Parte completa (mesma forma de json.load(...)[i])
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = _JsonTokenStream(f)
+        for _ in _iter_array(stream):
+            yield stream.value()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Classificação das seções pré-textuais do livro (section_kind).
+
+O EPUB traz a página de título, a oração dedicatória e o prefácio no
+primeiro capítulo da primeira parte. tag_front_matter percorre esse
+capítulo uma única vez, na ingestão (epub_to_json_processor.py), com uma
+máquina de estados, e marca cada parágrafo pré-textual com section_kind.
+As etapas seguintes leem a marcação em vez de procurar substrings no texto:
+
+- reorganize_final.py separa os parágrafos marcados e monta as partes
+  DEDICATORY PRAYER e PREFACE com section_kind na própria parte (as partes
+  numeradas recebem 'body'); a marcação dos parágrafos é removida.
+- gerar_epub_atualizado.py decide o que é pré-textual por part.section_kind,
+  sem converter para maiúsculas o texto do livro inteiro.
+
+Livros gravados antes da marcação (sem section_kind) continuam funcionando
+pela detecção antiga (legacy_section_kind e legacy_front_matter_kinds).
+"""
+
+TITLE_PAGE = 'title_page'
+DEDICATORY_PRAYER = 'dedicatory_prayer'
+PREFACE = 'preface'
+BODY = 'body'
+
+# Seções tratadas como itens independentes no índice do EPUB
+FRONT_MATTER_KINDS = (DEDICATORY_PRAYER, PREFACE)
+
+# Máquina de estados do primeiro capítulo: (estado ou None = qualquer estado,
+# marcador no texto, próximo estado, seção do parágrafo). A primeira regra
+# que casa decide; sem regra, o parágrafo fica na seção do estado (STATE_KIND).
+TRANSITIONS = (
+    (None, 'DEDICATORY PRAYER', 'prayer_start', None),
+    ('prayer_start', 'O SWEET JESUS', 'prayer', DEDICATORY_PRAYER),
+    ('prayer', 'St. Francis de Sales', 'preface_wait', DEDICATORY_PRAYER),
+    ('preface_wait', 'Dear reader', 'preface', PREFACE),
+    ('title', 'This is a digital copy', 'title', TITLE_PAGE),
+)
+STATE_KIND = {'prayer': DEDICATORY_PRAYER, 'preface': PREFACE}
+INITIAL_STATE = 'title'
+
+# Títulos que identificam as seções em inglês e português (detecção antiga)
+_LEGACY_TITLES = {
+    DEDICATORY_PRAYER: ('DEDICATORY PRAYER', 'ORAÇÃO DEDICATÓRIA'),
+    PREFACE: ('PREFACE', 'PREFÁCIO'),
+}
+
+
+def classify_paragraphs(texts):
+    """
+    Seção de cada parágrafo do primeiro capítulo, em uma passada.
+
+    Args:
+        texts (iterable): Textos dos parágrafos, em ordem
+
+    Returns:
+        list: section_kind de cada parágrafo (None para os que não pertencem a
+            nenhuma seção, como os próprios cabeçalhos)
+    """
+    state = INITIAL_STATE
+    kinds = []
+    for text in texts:
+        text = text or ''
+        for from_state, marker, next_state, kind in TRANSITIONS:
+            if (from_state is None or from_state == state) and marker in text:
+                state = next_state
+                break
+        else:
+            kind = STATE_KIND.get(state)
+        kinds.append(kind)
+    return kinds
+
+
+def tag_front_matter(chapter):
+    """
+    Marca com section_kind os parágrafos pré-textuais de um capítulo.
+
+    Returns:
+        dict: Número de parágrafos marcados por seção
+    """
+    counts = {}
+    paragraphs = chapter.content or []
+    for paragraph, kind in zip(paragraphs, classify_paragraphs(p.content for p in paragraphs)):
+        if kind is not None:
+            paragraph['section_kind'] = kind
+            counts[kind] = counts.get(kind, 0) + 1
+    return counts
+
+
+def split_front_matter(chapter):
+    """
+    Parágrafos marcados de um capítulo, agrupados por seção, com a marcação removida.
+
+    Returns:
+        dict: section_kind → lista de parágrafos, na ordem do capítulo
+    """
+    sections = {TITLE_PAGE: [], DEDICATORY_PRAYER: [], PREFACE: []}
+    for paragraph in chapter.content or []:
+        kind = paragraph.pop('section_kind', None)
+        if kind is not None:
+            sections.setdefault(kind, []).append(paragraph)
+    return sections
+
+
+def legacy_section_kind(part):
+    """section_kind de uma parte sem marcação, pelo título do primeiro capítulo"""
+    if not part.chapters:
+        return None
+    first_chapter_title = (part.chapters[0].chapter_title or '').upper()
+    for kind, titles in _LEGACY_TITLES.items():
+        if any(title in first_chapter_title for title in titles):
+            return kind
+    return None
+
+
+def part_section_kind(part):
+    """section_kind da parte (marcação da ingestão ou, sem ela, detecção antiga)"""
+    return part.get('section_kind') or legacy_section_kind(part)
+
+
+def _mentions(text, kind):
+    if kind == DEDICATORY_PRAYER:
+        return ('ORAÇÃO' in text and 'DEDICATÓRIA' in text) or ('DEDICATORY' in text and 'PRAYER' in text)
+    return 'PREFÁCIO' in text or 'PREFACE' in text
+
+
+def legacy_front_matter_kinds(book):
+    """
+    Seções pré-textuais de um livro sem marcação, procurando os nomes das
+    seções nos títulos e no texto em maiúsculas (percorre o livro inteiro).
+    """
+    found = set()
+    for part in book:
+        part_title = (part.part_title or '').upper()
+        found.update(kind for kind in FRONT_MATTER_KINDS if _mentions(part_title, kind))
+        for chapter in part.chapters or []:
+            chapter_title = (chapter.chapter_title or '').upper()
+            found.update(kind for kind in FRONT_MATTER_KINDS if _mentions(chapter_title, kind))
+            for item in chapter.content or []:
+                text = (item.content or '').upper()
+                if _mentions(text, DEDICATORY_PRAYER):
+                    found.add(DEDICATORY_PRAYER)
+                # Menção ao prefácio só conta em linhas curtas (títulos)
+                if _mentions(text, PREFACE) and len(text.strip()) < 200:
+                    found.add(PREFACE)
+                if len(found) == len(FRONT_MATTER_KINDS):
+                    return found
+    return found
+
+
+def front_matter_kinds(book):
+    """
+    Seções pré-textuais presentes no livro: lidas de part.section_kind em
+    O(partes) ou, se nenhuma parte tiver marcação, pela detecção antiga.
+    """
+    kinds = [part.get('section_kind') for part in book]
+    if any(kinds):
+        return {kind for kind in kinds if kind in FRONT_MATTER_KINDS}
+    return legacy_front_matter_kinds(book)
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Detecção de capítulos quase duplicados (shingles + MinHash + LSH).
+
+Comparar o texto de cada capítulo com o de todos os outros é quadrático.
+Cada texto vira um conjunto de shingles (sequências de SHINGLE_SIZE
+palavras), resumido por uma assinatura MinHash: a fração de posições iguais
+entre duas assinaturas estima a similaridade de Jaccard dos conjuntos. A
+assinatura é dividida em bandas (LSH); só capítulos que coincidem em pelo
+menos uma banda inteira viram candidatos, e só os candidatos têm a
+similaridade estimada. O custo é praticamente linear no número de
+capítulos, o que permite procurar duplicatas em uma biblioteca inteira.
+
+A assinatura usa MinHash de uma permutação (one permutation hashing): o
+hash de 64 bits (dois CRC-32) de cada shingle escolhe uma das num_perm posições
+e disputa o mínimo só dela, em uma única passada pelos shingles, em vez de
+num_perm passadas. Posições vazias herdam o valor da próxima posição
+preenchida (densificação por rotação), o que preserva a estimativa. A
+assinatura é a mesma em qualquer processo.
+
+Uso:
+    python scripts/common/near_duplicates.py [--threshold 0.5] livro_en.json [outro_livro.json ...]
+"""
+
+import re
+import sys
+import zlib
+
+
+DEFAULT_THRESHOLD = 0.5
+DEFAULT_NUM_PERM = 64
+SHINGLE_SIZE = 3
+
+_WORD = re.compile(r"\w+", flags=re.UNICODE)
+_CRC_SEED = 0x9E3779B9
+
+
+def shingle_hashes(text, size=SHINGLE_SIZE):
+    """
+    Hashes de 64 bits dos shingles (size palavras seguidas, em minúsculas) de um texto.
+
+    Textos com menos de size palavras formam um único shingle.
+    """
+    words = _WORD.findall(text.lower())
+    if not words:
+        return set()
+    if len(words) < size:
+        shingles = [' '.join(words)]
+    else:
+        shingles = map(' '.join, zip(*(words[i:] for i in range(size))))
+    return set(map(_hash64, map(str.encode, shingles)))
+
+
+def _hash64(data):
+    # Dois CRC-32 com sementes diferentes: estável entre processos e calculado em C
+    return zlib.crc32(data) << 32 | zlib.crc32(data, _CRC_SEED)
+
+
+def optimal_bands(threshold, num_perm):
+    """
+    Número de bandas e de linhas por banda que minimiza a soma das áreas de
+    falsos positivos (abaixo do limiar) e falsos negativos (acima dele).
+
+    Returns:
+        tuple: (bandas, linhas por banda)
+    """
+    def area(func, start, end, steps=100):
+        width = (end - start) / steps
+        return sum(func(start + (k + 0.5) * width) for k in range(steps)) * width
+
+    best = None
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            false_positive = area(lambda s: 1 - (1 - s ** rows) ** bands, 0.0, threshold)
+            false_negative = area(lambda s: (1 - s ** rows) ** bands, threshold, 1.0)
+            error = false_positive + false_negative
+            if best is None or error < best[0]:
+                best = (error, bands, rows)
+    return best[1], best[2]
+
+
+class NearDuplicateIndex:
+    """
+    Índice LSH de assinaturas MinHash.
+
+    Args:
+        threshold (float): Similaridade de Jaccard (estimada) a partir da qual
+            dois textos são quase duplicados
+        num_perm (int): Tamanho da assinatura (mais permutações, estimativa mais precisa)
+        shingle_size (int): Palavras por shingle
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM, shingle_size=SHINGLE_SIZE):
+        if not 0 < threshold <= 1:
+            raise ValueError(f"Limiar de similaridade fora de (0, 1]: {threshold}")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+        self.keys = []
+        self._signatures = []
+        self._buckets = {}
+
+    def signature(self, text):
+        """Assinatura MinHash do texto (None se o texto não tiver palavras)"""
+        hashes = shingle_hashes(text, self.shingle_size)
+        if not hashes:
+            return None
+        num_perm = self.num_perm
+        minimums = [None] * num_perm
+        for h in hashes:
+            position, value = h % num_perm, h // num_perm
+            current = minimums[position]
+            if current is None or value < current:
+                minimums[position] = value
+        # Densificação: posição vazia herda a próxima preenchida, marcada pela distância
+        signature = []
+        for position in range(num_perm):
+            distance = 0
+            value = minimums[position]
+            while value is None:
+                distance += 1
+                value = minimums[(position + distance) % num_perm]
+            signature.append(value if not distance else (distance << 64) | value)
+        return tuple(signature)
+
+    def add(self, key, text):
+        """Indexa um texto; key identifica o texto nos grupos devolvidos"""
+        signature = self.signature(text)
+        doc_id = len(self.keys)
+        self.keys.append(key)
+        self._signatures.append(signature)
+        if signature is None:
+            return
+        for band in range(self.bands):
+            start = band * self.rows
+            self._buckets.setdefault((band, signature[start:start + self.rows]), []).append(doc_id)
+
+    def similarity(self, a, b):
+        """Similaridade de Jaccard estimada entre dois textos indexados (por posição)"""
+        sig_a, sig_b = self._signatures[a], self._signatures[b]
+        return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / self.num_perm
+
+    def candidate_pairs(self):
+        """Pares (a, b), a < b, que coincidem em pelo menos uma banda"""
+        pairs = set()
+        for members in self._buckets.values():
+            for i, a in enumerate(members):
+                for b in members[i + 1:]:
+                    pairs.add((a, b))
+        return pairs
+
+    def clusters(self):
+        """
+        Grupos de textos quase duplicados (união dos pares acima do limiar).
+
+        Returns:
+            list: Grupos com 2 ou mais textos, cada um {'members': [chaves, na
+                ordem de inserção], 'similarity': [similaridade estimada de
+                cada membro com o primeiro]}, na ordem do primeiro membro
+        """
+        parent = list(range(len(self.keys)))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for a, b in sorted(self.candidate_pairs()):
+            if self.similarity(a, b) >= self.threshold:
+                root_a, root_b = find(a), find(b)
+                if root_a != root_b:
+                    parent[max(root_a, root_b)] = min(root_a, root_b)
+
+        groups = {}
+        for doc_id in range(len(self.keys)):
+            groups.setdefault(find(doc_id), []).append(doc_id)
+        return [{'members': [self.keys[doc_id] for doc_id in members],
+                 'similarity': [round(self.similarity(members[0], doc_id), 3) for doc_id in members]}
+                for root, members in sorted(groups.items()) if len(members) > 1]
+
+
+def chapter_text(chapter):
+    """Texto completo de um capítulo (parágrafos separados por quebra de linha)"""
+    return '\n'.join(paragraph.get('content') or '' for paragraph in chapter.get('content') or [])
+
+
+def main():
+    """Procura capítulos quase duplicados em um ou mais livros JSON"""
+    import argparse
+    from book_model import Book
+
+    parser = argparse.ArgumentParser(description="Capítulos quase duplicados (MinHash + LSH)")
+    parser.add_argument('books', nargs='*', default=['output/livro_en.json'], help="Livros JSON")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Similaridade de Jaccard mínima (padrão: {DEFAULT_THRESHOLD})")
+    parser.add_argument('--num-perm', type=int, default=DEFAULT_NUM_PERM,
+                        help=f"Tamanho da assinatura MinHash (padrão: {DEFAULT_NUM_PERM})")
+    args = parser.parse_args()
+
+    index = NearDuplicateIndex(args.threshold, args.num_perm)
+    titles = {}
+    for path in args.books:
+        for part_index, part in enumerate(Book.load(path)):
+            for chapter_index, chapter in enumerate(part.chapters or []):
+                key = (path, part_index, chapter_index)
+                titles[key] = chapter.chapter_title
+                index.add(key, chapter_text(chapter))
+
+    clusters = index.clusters()
+    print(f"🧬 {len(index.keys)} capítulos, {index.bands} bandas × {index.rows} linhas, "
+          f"limiar {args.threshold}: {len(clusters)} grupos de quase duplicatas")
+    for cluster in clusters:
+        print(f"   • {len(cluster['members'])} capítulos:")
+        for (path, part_index, chapter_index), similarity in zip(cluster['members'], cluster['similarity']):
+            print(f"      {similarity:.2f}  {path} [{part_index}/{chapter_index}] "
+                  f"{(titles[(path, part_index, chapter_index)] or '')[:60]}")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
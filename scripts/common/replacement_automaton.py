@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Substituição de muitos padrões literais em uma única passada (Aho-Corasick).
+
+O autômato é compilado uma vez a partir do dicionário de correções e
+percorre cada texto da esquerda para a direita, encontrando todas as
+ocorrências de todos os padrões em tempo proporcional ao tamanho do texto,
+independentemente de quantos padrões existem.
+
+O resultado é idêntico ao da aplicação sequencial de str.replace na ordem
+do dicionário (inclusive a contagem de padrões aplicados). Quando essa
+ordem pode fazer diferença — ocorrências de padrões diferentes que se
+sobrepõem, ou uma substituição capaz de formar um padrão posterior — o
+texto é processado pelo caminho sequencial, que é raro na prática.
+"""
+
+
+def _common_prefix_length(a, b):
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return n
+
+
+class ReplacementAutomaton:
+    """
+    Autômato de Aho-Corasick sobre as chaves de um dicionário de substituições.
+
+    Args:
+        replacements (dict): padrão → substituição; a ordem define a prioridade,
+            como no laço sequencial de str.replace
+    """
+
+    def __init__(self, replacements):
+        self.patterns = [p for p in replacements if p]
+        self.replacements = [replacements[p] for p in self.patterns]
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        self._build()
+        # Transições completas (com as falhas já resolvidas), preenchidas sob demanda
+        self._delta = [dict() for _ in self._goto]
+        self._cascade = {}
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def _build(self):
+        goto, fail, out = self._goto, self._fail, self._out
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    fail.append(0)
+                    out.append(())
+                state = nxt
+            out[state] = out[state] + (index,)
+
+        # Falhas em largura; cada estado herda as saídas do seu estado de falha
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                if out[fail[nxt]]:
+                    out[nxt] = out[nxt] + out[fail[nxt]]
+
+    def _step(self, state, ch):
+        """Transição completa de state por ch (resolvendo falhas), memorizada"""
+        goto, fail = self._goto, self._fail
+        s = state
+        while True:
+            nxt = goto[s].get(ch)
+            if nxt is not None:
+                break
+            if s == 0:
+                nxt = 0
+                break
+            s = fail[s]
+        self._delta[state][ch] = nxt
+        return nxt
+
+    def find_all(self, text):
+        """
+        Todas as ocorrências de todos os padrões, em uma passada.
+
+        Returns:
+            list: (início, índice do padrão), na ordem em que terminam no texto
+        """
+        delta, out, patterns = self._delta, self._out, self.patterns
+        step = self._step
+        matches = []
+        state = 0
+        transitions = delta[0]
+        position = -1
+        for ch in text:
+            position += 1
+            nxt = transitions.get(ch)
+            if nxt is None:
+                nxt = step(state, ch)
+            if nxt != state:
+                state = nxt
+                transitions = delta[state]
+            elif not state:
+                continue
+            if out[state]:
+                for index in out[state]:
+                    matches.append((position - len(patterns[index]) + 1, index))
+        return matches
+
+    def _may_form_later_pattern(self, index):
+        """
+        Indica se a substituição do padrão index pode formar, junto do texto
+        vizinho, uma ocorrência nova de um padrão posterior (que o laço
+        sequencial substituiria e a passada única não).
+        """
+        cached = self._cascade.get(index)
+        if cached is not None:
+            return cached
+        pattern, replacement = self.patterns[index], self.replacements[index]
+        result = not replacement
+        if not result:
+            # Trechos iguais no início/fim do padrão e da substituição não formam
+            # nada novo: ocorrências ali já existiam e se sobrepunham ao padrão
+            prefix = _common_prefix_length(pattern, replacement)
+            suffix = _common_prefix_length(pattern[::-1], replacement[::-1])
+            suffix = min(suffix, len(pattern) - prefix, len(replacement) - prefix)
+            for later in self.patterns[index + 1:]:
+                if later in replacement or replacement in later:
+                    result = True
+                    break
+                limit = min(len(replacement), len(later))
+                if any(replacement.endswith(later[:m]) for m in range(suffix + 1, limit)):
+                    result = True
+                    break
+                if any(replacement.startswith(later[-m:]) for m in range(prefix + 1, limit)):
+                    result = True
+                    break
+        self._cascade[index] = result
+        return result
+
+    def apply_sequential(self, text):
+        """Aplicação padrão por padrão com str.replace (semântica de referência)"""
+        hits = []
+        for index, pattern in enumerate(self.patterns):
+            if pattern in text:
+                replaced = text.replace(pattern, self.replacements[index])
+                if replaced != text:
+                    hits.append(index)
+                text = replaced
+        return text, hits
+
+    def apply(self, text):
+        """
+        Aplica todas as substituições.
+
+        Args:
+            text (str): Texto original
+
+        Returns:
+            tuple: (texto corrigido, índices dos padrões que alteraram o texto)
+        """
+        matches = self.find_all(text)
+        if not matches:
+            return text, []
+
+        # Como str.replace: por padrão, ocorrências mais à esquerda sem sobreposição
+        by_pattern = {}
+        for start, index in matches:
+            by_pattern.setdefault(index, []).append(start)
+        selected = []
+        for index in sorted(by_pattern):
+            if self._may_form_later_pattern(index):
+                return self.apply_sequential(text)
+            length = len(self.patterns[index])
+            last_end = -1
+            for start in sorted(by_pattern[index]):
+                if start >= last_end:
+                    selected.append((start, start + length, index))
+                    last_end = start + length
+
+        selected.sort()
+        for (_, end, _), (next_start, _, _) in zip(selected, selected[1:]):
+            if next_start < end:
+                return self.apply_sequential(text)
+
+        pieces = []
+        position = 0
+        for start, end, index in selected:
+            pieces.append(text[position:start])
+            pieces.append(self.replacements[index])
+            position = end
+        pieces.append(text[position:])
+        hits = [index for index in sorted(by_pattern) if self.patterns[index] != self.replacements[index]]
+        return ''.join(pieces), hits
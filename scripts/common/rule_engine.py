@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Motor declarativo de regras de substituição de texto.
+
+As regras ficam em arquivos de dados (data/rules/<nome>.json), um por
+conjunto: correções ad hoc do inglês, correções manuais de OCR, correções
+do português. Cada conjunto é compilado uma única vez em um autômato
+(replacement_automaton.py), com a mesma semântica de str.replace aplicado
+regra por regra na ordem do arquivo.
+
+O RuleEngine aplica todos os conjuntos recebidos em uma única passada pelo
+livro (títulos de partes, subtítulos, títulos de capítulos e parágrafos),
+atualiza o word_count apenas dos parágrafos alterados e registra cada
+alteração em um log estruturado.
+
+Formato do arquivo de regras:
+    {
+      "description": "...",
+      "language": "en",
+      "fields": ["part_title", "chapter_title", "content"],
+      "collapse_spaces": false,
+      "groups": [{"name": "...", "rules": {"errado": "correto", ...}}, ...]
+    }
+"""
+
+import json
+import os
+import re
+
+from book_model import Paragraph
+from replacement_automaton import ReplacementAutomaton
+from word_counts import set_content
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RULES_DIR = os.path.join(PROJECT_ROOT, 'data', 'rules')
+
+DEFAULT_FIELDS = ('part_title', 'chapter_title', 'content')
+PART_FIELDS = ('part_title', 'part_subtitle')
+DOUBLE_SPACES_RE = re.compile(r'  +')
+
+# Conjuntos já compilados neste processo
+_RULE_SETS = {}
+
+
+class RuleSet:
+    """
+    Conjunto de regras compilado.
+
+    Attributes:
+        name (str): Nome do conjunto (nome do arquivo sem .json)
+        rules (dict): errado → correto, na ordem de aplicação
+        fields (tuple): Campos do livro aos quais o conjunto se aplica
+        collapse_spaces (bool): Se textos alterados têm espaços duplos
+            reduzidos e as pontas aparadas
+    """
+
+    def __init__(self, name, rules, fields=DEFAULT_FIELDS, language=None, description='',
+                 collapse_spaces=False):
+        self.name = name
+        self.rules = dict(rules)
+        self.fields = tuple(fields)
+        self.language = language
+        self.description = description
+        self.collapse_spaces = collapse_spaces
+        self.automaton = ReplacementAutomaton(self.rules)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        rules = {}
+        for group in data.get('groups', []):
+            rules.update(group.get('rules', {}))
+        name = os.path.splitext(os.path.basename(path))[0]
+        return cls(name, rules, data.get('fields', DEFAULT_FIELDS), data.get('language'),
+                   data.get('description', ''), data.get('collapse_spaces', False))
+
+    def apply(self, text):
+        """
+        Aplica as regras a um texto.
+
+        Returns:
+            tuple: (texto corrigido, padrões que alteraram o texto, na ordem das regras)
+        """
+        fixed, hits = self.automaton.apply(text)
+        if not hits:
+            return text, []
+        if self.collapse_spaces:
+            fixed = DOUBLE_SPACES_RE.sub(' ', fixed).strip()
+        return fixed, [self.automaton.patterns[index] for index in hits]
+
+
+def rule_set_path(name):
+    """Caminho do arquivo de regras de um conjunto"""
+    return os.path.join(RULES_DIR, f"{name}.json")
+
+
+def load_rule_set(name):
+    """Carrega e compila um conjunto de data/rules/ (uma vez por processo)"""
+    rule_set = _RULE_SETS.get(name)
+    if rule_set is None:
+        rule_set = RuleSet.from_file(rule_set_path(name))
+        _RULE_SETS[name] = rule_set
+    return rule_set
+
+
+class ChangeLog:
+    """
+    Log estruturado das alterações.
+
+    Cada entrada de changes descreve um campo alterado por um conjunto:
+        rule_set, field, location ({'part', 'chapter', 'paragraph'}),
+        rules ([[errado, correto], ...] na ordem aplicada), original, corrected
+    """
+
+    def __init__(self):
+        self.changes = []
+        self.items = 0
+
+    def record(self, rule_set, field, location, patterns, original, corrected):
+        self.changes.append({
+            'rule_set': rule_set.name,
+            'field': field,
+            'location': dict(location),
+            'rules': [[pattern, rule_set.rules[pattern]] for pattern in patterns],
+            'original': original,
+            'corrected': corrected,
+        })
+
+    def extend(self, other):
+        self.changes.extend(other.changes)
+        self.items += other.items
+
+    @property
+    def corrections(self):
+        """Total de regras que alteraram algum texto (uma por regra e campo)"""
+        return sum(len(change['rules']) for change in self.changes)
+
+    @property
+    def paragraphs_changed(self):
+        """Parágrafos com o texto alterado (cada um teve o word_count recalculado uma vez)"""
+        return len({tuple(change['location'].items()) for change in self.changes
+                    if change['field'] == 'content'})
+
+    def pattern_hits(self):
+        """Padrão → número de campos que ele alterou, na ordem em que apareceram"""
+        hits = {}
+        for change in self.changes:
+            for pattern, _ in change['rules']:
+                hits[pattern] = hits.get(pattern, 0) + 1
+        return hits
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'items': self.items, 'corrections': self.corrections, 'changes': self.changes},
+                      f, indent=2, ensure_ascii=False)
+
+
+class RuleEngine:
+    """
+    Aplica vários conjuntos de regras em uma única passada pelo livro.
+
+    Args:
+        rule_sets (iterable): RuleSet ou nomes de conjuntos em data/rules/,
+            aplicados nesta ordem a cada campo
+    """
+
+    def __init__(self, rule_sets):
+        self.rule_sets = [load_rule_set(rs) if isinstance(rs, str) else rs for rs in rule_sets]
+        fields = []
+        for rule_set in self.rule_sets:
+            fields.extend(field for field in rule_set.fields if field not in fields)
+        self.fields = set(fields)
+
+    def apply_field(self, item, field, location, log):
+        """Aplica os conjuntos a um campo de um item (se o campo existir)"""
+        if field not in self.fields or field not in item:
+            return
+        log.items += 1
+        text = item[field]
+        if not isinstance(text, str):
+            return
+        changed = False
+        for rule_set in self.rule_sets:
+            if field not in rule_set.fields:
+                continue
+            fixed, patterns = rule_set.apply(text)
+            if patterns:
+                log.record(rule_set, field, location, patterns, text, fixed)
+                text = fixed
+                changed = True
+        if changed:
+            if field == 'content':
+                set_content(item, text)
+            else:
+                item[field] = text
+
+    def apply_chapter(self, chapter, location=None, log=None):
+        """Título e parágrafos de um capítulo; devolve o ChangeLog"""
+        log = log if log is not None else ChangeLog()
+        location = dict(location or {})
+        self.apply_field(chapter, 'chapter_title', location, log)
+        for index, paragraph in enumerate(chapter.get('content', [])):
+            if isinstance(paragraph, (Paragraph, dict)):
+                self.apply_field(paragraph, 'content', {**location, 'paragraph': index}, log)
+        return log
+
+    def apply_part_fields(self, part, location=None, log=None):
+        """Título e subtítulo de uma parte; devolve o ChangeLog"""
+        log = log if log is not None else ChangeLog()
+        for field in PART_FIELDS:
+            self.apply_field(part, field, dict(location or {}), log)
+        return log
+
+    def apply_book(self, parts, log=None, first_part=0):
+        """
+        Percorre o livro uma vez aplicando todos os conjuntos.
+
+        Args:
+            parts (list): Partes do livro (alteradas no lugar)
+            log (ChangeLog, optional): Log a completar
+            first_part (int): Índice da primeira parte (leitura parte a parte)
+
+        Returns:
+            ChangeLog
+        """
+        log = log if log is not None else ChangeLog()
+        for part_index, part in enumerate(parts, first_part):
+            self.apply_part_fields(part, {'part': part_index}, log)
+            for chapter_index, chapter in enumerate(part.get('chapters', [])):
+                self.apply_chapter(chapter, {'part': part_index, 'chapter': chapter_index}, log)
+        return log
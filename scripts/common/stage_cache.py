@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Cache de etapas do pipeline endereçado por conteúdo.
+
+Cada etapa é identificada por uma chave SHA-256 calculada a partir de tudo
+o que ela consome: o hash do livro de entrada, os arquivos de dados
+(EPUB fonte, summary.csv, DOCX traduzido...) e o código-fonte dos scripts,
+que inclui as tabelas de correção. Os resultados são guardados como
+objetos nomeados pelo próprio hash; uma chave já vista devolve os objetos
+armazenados em vez de executar a etapa de novo.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+
+CACHE_FORMAT_VERSION = 2
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Marcador usado no lugar do hash de arquivos que não existem
+MISSING_FILE = 'missing'
+
+
+class StageCache:
+    """
+    Índice chave → objetos de saída, mais o armazenamento dos objetos.
+
+    Layout em disco:
+        <cache_dir>/entries/<chave>.json  etapa e hashes das saídas
+        <cache_dir>/objects/<sha256>      conteúdo de cada saída
+
+    Cada entrada e cada objeto é um arquivo próprio gravado atomicamente,
+    então vários processos podem usar o mesmo cache ao mesmo tempo.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, 'objects')
+        self.entries_dir = os.path.join(cache_dir, 'entries')
+        self.hits = 0
+        self.misses = 0
+        self._file_digests = {}
+
+    def _entry_path(self, key):
+        return os.path.join(self.entries_dir, f"{key}.json")
+
+    def file_digest(self, path):
+        """
+        SHA-256 do conteúdo de um arquivo (MISSING_FILE se não existir).
+        O resultado é memorizado enquanto tamanho e mtime não mudarem.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return MISSING_FILE
+        memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        digest = self._file_digests.get(memo_key)
+        if digest is None:
+            h = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                    h.update(chunk)
+            digest = h.hexdigest()
+            self._file_digests[memo_key] = digest
+        return digest
+
+    def stage_key(self, stage, inputs):
+        """
+        Chave de uma etapa.
+
+        Args:
+            stage (str): Nome da etapa
+            inputs (iterable): Hashes (ou outros identificadores) de tudo o que a etapa lê
+
+        Returns:
+            str: SHA-256 hexadecimal
+        """
+        h = hashlib.sha256(f"{CACHE_FORMAT_VERSION}\0{stage}".encode('utf-8'))
+        for value in inputs:
+            h.update(b'\0' + str(value).encode('utf-8'))
+        return h.hexdigest()
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest)
+
+    def lookup(self, key):
+        """
+        Saídas armazenadas para a chave (nome → hash) ou None se não houver
+        entrada ou se algum objeto tiver sido removido do disco.
+        """
+        try:
+            with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                outputs = json.load(f)['outputs']
+        except (OSError, ValueError, KeyError):
+            return None
+        if not all(os.path.exists(self.object_path(digest)) for digest in outputs.values()):
+            return None
+        return outputs
+
+    def record(self, key, stage, outputs):
+        """Associa as saídas (nome → hash de objeto já armazenado) à chave da etapa"""
+        os.makedirs(self.entries_dir, exist_ok=True)
+        path = self._entry_path(key)
+        temp_path = f"{path}.tmp-{os.getpid()}"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'stage': stage, 'outputs': outputs}, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    def put_bytes(self, data):
+        """Armazena bytes como objeto e devolve seu hash"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(self.objects_dir, exist_ok=True)
+            temp_path = f"{path}.tmp-{os.getpid()}"
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        return digest
+
+    def put_file(self, path):
+        """Armazena uma cópia de um arquivo como objeto e devolve seu hash"""
+        digest = self.file_digest(path)
+        object_path = self.object_path(digest)
+        if not os.path.exists(object_path):
+            os.makedirs(self.objects_dir, exist_ok=True)
+            temp_path = f"{object_path}.tmp-{os.getpid()}"
+            shutil.copyfile(path, temp_path)
+            os.replace(temp_path, object_path)
+        return digest
+
+    def restore(self, digest, path):
+        """
+        Garante que o arquivo de destino tenha o conteúdo do objeto.
+
+        Returns:
+            bool: True se o arquivo precisou ser (re)escrito
+        """
+        if self.file_digest(path) == digest:
+            return False
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp-{os.getpid()}"
+        shutil.copyfile(self.object_path(digest), temp_path)
+        os.replace(temp_path, path)
+        return True
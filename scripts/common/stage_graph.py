@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Grafo de dependências das etapas do pipeline.
+
+Cada etapa declara os artefatos que lê (inputs) e os que produz (outputs):
+caminhos de arquivo ou nomes lógicos como "book:ocr". As arestas são
+derivadas dessas declarações — uma etapa depende de quem produz algum de
+seus inputs; inputs sem produtor (scripts, dados) são fontes. O grafo
+informa quais etapas estão prontas e calcula o caminho crítico a partir
+dos tempos medidos.
+"""
+
+
+class Stage:
+    """
+    Nó do grafo.
+
+    Attributes:
+        name (str): Identificador da etapa
+        description (str): Texto exibido ao executar
+        func (callable): Função da etapa
+        inputs (tuple): Artefatos lidos
+        outputs (tuple): Artefatos produzidos
+        cached (bool): Se o resultado passa pelo cache de etapas
+    """
+
+    def __init__(self, name, description, func, inputs=(), outputs=(), cached=True):
+        self.name = name
+        self.description = description
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.cached = cached
+
+
+class StageGraph:
+    """Grafo acíclico de etapas, com arestas derivadas de inputs/outputs"""
+
+    def __init__(self, stages):
+        self.stages = {}
+        self.order = []
+        producers = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Etapa duplicada: {stage.name}")
+            self.stages[stage.name] = stage
+            self.order.append(stage.name)
+            for artifact in stage.outputs:
+                if artifact in producers:
+                    raise ValueError(f"Artefato '{artifact}' produzido por '{producers[artifact]}' e '{stage.name}'")
+                producers[artifact] = stage.name
+        self.producers = producers
+
+        self.predecessors = {name: set() for name in self.order}
+        self.successors = {name: set() for name in self.order}
+        for stage in stages:
+            for artifact in stage.inputs:
+                producer = producers.get(artifact)
+                if producer is not None and producer != stage.name:
+                    self.predecessors[stage.name].add(producer)
+                    self.successors[producer].add(stage.name)
+
+        self.order = self._topological_order()
+
+    def _topological_order(self):
+        """Ordem topológica estável (mantém a ordem de declaração entre etapas independentes)"""
+        remaining = {name: len(preds) for name, preds in self.predecessors.items()}
+        declared = {name: i for i, name in enumerate(self.order)}
+        ready = [name for name in self.order if remaining[name] == 0]
+        order = []
+        while ready:
+            ready.sort(key=declared.get)
+            name = ready.pop(0)
+            order.append(name)
+            for successor in self.successors[name]:
+                remaining[successor] -= 1
+                if remaining[successor] == 0:
+                    ready.append(successor)
+        if len(order) != len(self.stages):
+            cycle = sorted(name for name, count in remaining.items() if count)
+            raise ValueError(f"Ciclo entre as etapas: {', '.join(cycle)}")
+        return order
+
+    def ready(self, done, started):
+        """Etapas ainda não iniciadas cujas dependências terminaram, em ordem topológica"""
+        return [name for name in self.order
+                if name not in started and self.predecessors[name] <= done]
+
+    def blocked(self, failed, started):
+        """Etapas não iniciadas que dependem (direta ou indiretamente) de etapas com falha"""
+        blocked = set()
+        for name in self.order:
+            if name in started:
+                continue
+            if self.predecessors[name] & (failed | blocked):
+                blocked.add(name)
+        return blocked
+
+    def critical_path(self, durations):
+        """
+        Caminho mais longo do grafo segundo os tempos medidos.
+
+        Args:
+            durations (dict): Etapa → segundos (etapas ausentes contam como 0)
+
+        Returns:
+            tuple: (lista de etapas do caminho, soma dos tempos)
+        """
+        finish = {}
+        previous = {}
+        for name in self.order:
+            best = None
+            for pred in self.predecessors[name]:
+                if best is None or finish[pred] > finish[best]:
+                    best = pred
+            previous[name] = best
+            finish[name] = durations.get(name, 0.0) + (finish[best] if best else 0.0)
+        if not finish:
+            return [], 0.0
+        end = max(self.order, key=lambda name: finish[name])
+        path = []
+        node = end
+        while node is not None:
+            path.append(node)
+            node = previous[node]
+        return path[::-1], finish[end]
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Manutenção incremental do word_count dos parágrafos do livro.
+
+Cada item de conteúdo ({"type", "content", "word_count"}) guarda o número
+de palavras do próprio texto. Em vez de cada etapa recalcular o word_count
+de todos os parágrafos antes de gravar, o texto só é trocado por
+set_content, que compara o texto novo com o atual e recalcula o
+word_count apenas quando ele mudou. O Paragraph do modelo do livro
+(book_model.py) traz essa regra embutida: paragraph.content = texto também
+mantém o word_count em dia.
+
+validate_word_counts confere, em uma passada, se os word_count gravados
+batem com os textos (modo de validação).
+"""
+
+import sys
+
+from book_binary import load_book
+from book_model import Paragraph, count_words
+
+
+def set_content(item, text, word_count=None):
+    """
+    Troca o texto de um item de conteúdo, atualizando o word_count só se o texto mudou.
+
+    Args:
+        item (Paragraph or dict): Item de conteúdo
+        text (str): Texto novo
+        word_count (int, optional): Número de palavras já conhecido pelo chamador
+            (evita dividir o texto de novo, como na mesclagem de parágrafos)
+
+    Returns:
+        bool: True se o texto mudou
+    """
+    if isinstance(item, Paragraph):
+        return item.set_content(text, word_count)
+    if item.get('content') == text and 'word_count' in item:
+        return False
+    item['content'] = text
+    item['word_count'] = count_words(text) if word_count is None else word_count
+    return True
+
+
+def validate_word_counts(parts):
+    """
+    Confere o word_count de todos os itens de conteúdo em uma passada.
+
+    Returns:
+        list: Divergências, cada uma {'location': {'part', 'chapter', 'paragraph'},
+            'word_count': valor gravado (None se ausente), 'expected': valor correto}
+    """
+    mismatches = []
+    for part_index, part in enumerate(parts):
+        for chapter_index, chapter in enumerate(part.get('chapters', [])):
+            for index, item in enumerate(chapter.get('content', [])):
+                if not isinstance(item, (Paragraph, dict)) or 'content' not in item:
+                    continue
+                expected = count_words(item['content'] or '')
+                if item.get('word_count') != expected:
+                    mismatches.append({
+                        'location': {'part': part_index, 'chapter': chapter_index, 'paragraph': index},
+                        'word_count': item.get('word_count'),
+                        'expected': expected,
+                    })
+    return mismatches
+
+
+def main():
+    """Valida o word_count dos livros recebidos, JSON ou binários (padrão: output/livro_en.json)"""
+    paths = sys.argv[1:] or ['output/livro_en.json']
+    ok = True
+    for path in paths:
+        mismatches = validate_word_counts(load_book(path))
+        if mismatches:
+            ok = False
+            print(f"❌ {path}: {len(mismatches)} word_count divergentes")
+            for mismatch in mismatches[:10]:
+                print(f"   {mismatch['location']}: gravado {mismatch['word_count']}, "
+                      f"correto {mismatch['expected']}")
+        else:
+            print(f"✅ {path}: word_count consistente")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Backends de parsing para os arquivos de conteúdo (XHTML) do EPUB.
+
+Cada backend devolve o título candidato do arquivo e a sequência de
+elementos de bloco (p, div, h1, h2, h3) com o texto já extraído, na ordem
+do documento. O backend lxml percorre o arquivo com iterparse, sem montar
+uma árvore BeautifulSoup; o backend BeautifulSoup continua disponível como
+fallback para XHTML malformado (entidades HTML não declaradas, tags soltas).
+"""
+
+import io
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+except ImportError:  # lxml é opcional: sem ele usamos apenas BeautifulSoup
+    etree = None
+
+
+BLOCK_TAGS = ('p', 'div', 'h1', 'h2', 'h3')
+TITLE_TAGS = ('h1', 'h2', 'title')
+
+
+class ContentParser:
+    """Interface comum dos backends de parsing"""
+
+    name = None
+
+    def parse(self, content):
+        """
+        Extrai título e elementos de bloco de um arquivo de conteúdo.
+
+        Args:
+            content (str): Conteúdo XHTML do arquivo
+
+        Returns:
+            tuple: (título ou None, lista de pares (tag, texto) em ordem do documento)
+        """
+        raise NotImplementedError
+
+
+class SoupContentParser(ContentParser):
+    """Backend BeautifulSoup (html.parser): tolerante a XHTML malformado"""
+
+    name = 'bs4'
+
+    def parse(self, content):
+        soup = BeautifulSoup(content, 'html.parser')
+
+        title_elem = soup.find(list(TITLE_TAGS))
+        title = title_elem.get_text() if title_elem else None
+
+        elements = [(element.name, element.get_text()) for element in soup.find_all(list(BLOCK_TAGS))]
+        return title, elements
+
+
+class LxmlContentParser(ContentParser):
+    """
+    Backend lxml: percorre o XHTML com iterparse, liberando os elementos já
+    processados. Gera o mesmo texto que o get_text() do BeautifulSoup para
+    documentos bem formados.
+    """
+
+    name = 'lxml'
+
+    def parse(self, content):
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+
+        title = None
+        title_elem = None
+        elements = []
+        pending = []  # Índices de elementos de bloco abertos (aguardando o 'end')
+
+        for event, elem in etree.iterparse(io.BytesIO(content), events=('start', 'end')):
+            tag = etree.QName(elem).localname
+
+            if event == 'start':
+                if tag in BLOCK_TAGS:
+                    pending.append(len(elements))
+                    elements.append([tag, None])
+                if title_elem is None and tag in TITLE_TAGS:
+                    title_elem = elem
+                continue
+
+            if tag in BLOCK_TAGS:
+                elements[pending.pop()][1] = ''.join(elem.itertext())
+            if elem is title_elem:
+                title = ''.join(elem.itertext())
+
+            # Sem ancestral pendente, o texto deste elemento não será mais lido
+            title_pending = title_elem is not None and title is None
+            if not pending and not title_pending:
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+
+        return title, [tuple(element) for element in elements]
+
+
+class FallbackContentParser(ContentParser):
+    """Tenta o backend rápido e recorre ao BeautifulSoup se o XHTML for inválido"""
+
+    def __init__(self, primary, fallback):
+        self.primary = primary
+        self.fallback = fallback
+        self.name = f"{primary.name}+{fallback.name}"
+
+    def parse(self, content):
+        try:
+            return self.primary.parse(content)
+        except etree.XMLSyntaxError:
+            return self.fallback.parse(content)
+
+
+def get_content_parser(backend='auto'):
+    """
+    Cria o backend de parsing pelo nome.
+
+    Args:
+        backend (str): 'auto' (lxml com fallback BeautifulSoup), 'lxml' ou 'bs4'
+
+    Returns:
+        ContentParser: Backend escolhido
+    """
+    if backend == 'bs4' or (backend == 'auto' and etree is None):
+        return SoupContentParser()
+    if etree is None:
+        raise ValueError("Backend 'lxml' indisponível: instale o pacote lxml")
+    if backend == 'lxml':
+        return LxmlContentParser()
+    if backend == 'auto':
+        return FallbackContentParser(LxmlContentParser(), SoupContentParser())
+    raise ValueError(f"Backend de parsing desconhecido: {backend}")
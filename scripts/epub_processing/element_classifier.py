@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Classificação e normalização dos elementos extraídos do EPUB.
+
+Concentra os padrões usados pelo EpubToJsonProcessor para detectar títulos
+de capítulo (compilados uma única vez) e a normalização de espaços, que
+limpa o texto e conta as palavras na mesma passada.
+"""
+
+import re
+
+
+# "CHAPTER IV", "Chapter 12" (sem diferenciar maiúsculas/minúsculas)
+CHAPTER_TITLE_RE = re.compile(r'^CHAPTER\s+(?:[IVXLCDM]+|\d+)', re.IGNORECASE)
+
+# Cabeçalhos curtos também são tratados como títulos de capítulo
+HEADING_TAGS = frozenset(('h1', 'h2'))
+MAX_HEADING_TITLE_LENGTH = 100
+
+
+class ElementClassifier:
+    """Classificador de elementos e normalizador de texto do processador EPUB"""
+
+    def __init__(self):
+        self.chapter_title_re = CHAPTER_TITLE_RE
+
+    def is_chapter_title(self, element_name, text):
+        """
+        Indica se um elemento (já com o texto sem espaços nas pontas) é um título de capítulo.
+
+        Args:
+            element_name (str): Nome da tag (p, div, h1, h2, h3)
+            text (str): Texto do elemento
+
+        Returns:
+            bool: True se for título de capítulo
+        """
+        if element_name in HEADING_TAGS and len(text) < MAX_HEADING_TITLE_LENGTH:
+            return True
+        return self.chapter_title_re.match(text) is not None
+
+    def normalize(self, text):
+        """
+        Colapsa espaços em branco e conta palavras em uma única passada.
+        Equivale a re.sub(r'\\s+', ' ', text).strip() seguido de len(...split()).
+
+        Args:
+            text (str): Texto bruto
+
+        Returns:
+            tuple: (texto normalizado, número de palavras)
+        """
+        words = text.split()
+        return ' '.join(words), len(words)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Índice do spine de um EPUB: META-INF/container.xml → OPF → manifest/spine.
+
+O índice é resolvido uma única vez por arquivo EPUB e guardado em cache,
+de modo que a ingestão abra apenas os itens do spine, na ordem de leitura
+declarada pelo livro, sem depender de nomes de arquivo nem varrer o zip.
+"""
+
+import os
+import posixpath
+import xml.etree.ElementTree as ET
+from urllib.parse import unquote
+
+
+CONTAINER_PATH = 'META-INF/container.xml'
+XHTML_MEDIA_TYPES = ('application/xhtml+xml', 'text/html')
+
+# Cache de índices por (caminho, tamanho, mtime) do EPUB
+_SPINE_CACHE = {}
+_SPINE_CACHE_MAX = 256
+
+
+class SpineIndex:
+    """
+    Manifest e spine resolvidos de um EPUB.
+
+    Attributes:
+        opf_path (str): Caminho do OPF dentro do EPUB
+        manifest (dict): id → (membro do zip, media-type)
+        spine (list): Membros do zip na ordem de leitura
+    """
+
+    def __init__(self, opf_path, manifest, spine):
+        self.opf_path = opf_path
+        self.manifest = manifest
+        self.spine = spine
+
+    @classmethod
+    def from_reader(cls, read):
+        """
+        Resolve container.xml → OPF → manifest/spine.
+
+        Args:
+            read (callable): Função que recebe o nome de um membro e devolve seus bytes
+
+        Returns:
+            SpineIndex or None: Índice resolvido ou None se o EPUB não tem OPF válido
+        """
+        try:
+            container = ET.fromstring(read(CONTAINER_PATH))
+            rootfile = container.find('.//{*}rootfile')
+            opf_path = rootfile.get('full-path')
+            opf = ET.fromstring(read(opf_path))
+        except (KeyError, FileNotFoundError, AttributeError, TypeError, ET.ParseError):
+            return None
+
+        opf_dir = posixpath.dirname(opf_path)
+        manifest = {}
+        for item in opf.iterfind('.//{*}manifest/{*}item'):
+            item_id = item.get('id')
+            href = item.get('href')
+            if not item_id or not href:
+                continue
+            href = unquote(href.split('#', 1)[0])
+            member = posixpath.normpath(posixpath.join(opf_dir, href))
+            manifest[item_id] = (member, item.get('media-type', ''))
+
+        spine = []
+        for itemref in opf.iterfind('.//{*}spine/{*}itemref'):
+            entry = manifest.get(itemref.get('idref'))
+            if entry:
+                spine.append(entry[0])
+
+        return cls(opf_path, manifest, spine)
+
+    @classmethod
+    def for_zip(cls, epub):
+        """
+        Índice de um EPUB aberto, usando o cache quando o arquivo não mudou.
+
+        Args:
+            epub (zipfile.ZipFile): EPUB aberto
+
+        Returns:
+            SpineIndex or None: Índice resolvido ou None se o EPUB não tem OPF válido
+        """
+        key = None
+        if isinstance(epub.filename, str) and os.path.exists(epub.filename):
+            stat = os.stat(epub.filename)
+            key = (os.path.abspath(epub.filename), stat.st_size, stat.st_mtime_ns)
+            if key in _SPINE_CACHE:
+                return _SPINE_CACHE[key]
+
+        index = cls.from_reader(epub.read)
+
+        if key is not None:
+            if len(_SPINE_CACHE) >= _SPINE_CACHE_MAX:
+                _SPINE_CACHE.pop(next(iter(_SPINE_CACHE)))
+            _SPINE_CACHE[key] = index
+        return index
+
+    @classmethod
+    def for_directory(cls, extract_dir):
+        """Índice de um EPUB já extraído para um diretório"""
+        def _read(member):
+            with open(os.path.join(extract_dir, *member.split('/')), 'rb') as f:
+                return f.read()
+        return cls.from_reader(_read)
+
+    def content_members(self):
+        """Itens XHTML do spine, na ordem de leitura"""
+        media_types = {member: media_type for member, media_type in self.manifest.values()}
+        return [member for member in self.spine if media_types.get(member) in XHTML_MEDIA_TYPES]
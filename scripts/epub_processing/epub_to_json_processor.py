@@ -4,12 +4,24 @@ Processador EPUB para JSON com word_count automático.
 Classe unificada que sempre inclui contagem de palavras no JSON gerado.
 """
 
+import io
 import json
-import re
+import contextlib
 import os
+import posixpath
+import sys
 import zipfile
 import tempfile
-from bs4 import BeautifulSoup
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from content_parsers import get_content_parser
+from element_classifier import ElementClassifier
+from epub_spine import SpineIndex
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'common'))
+from book_stream import BookJsonWriter
+from book_model import Book, Chapter, Paragraph, Part
+from front_matter import tag_front_matter
 
 
 class EpubToJsonProcessor:
@@ -18,8 +30,17 @@ class EpubToJsonProcessor:
     Sempre inclui word_count automaticamente para manter compatibilidade.
     """
     
-    def __init__(self):
-        """Inicializa o processador"""
+    def __init__(self, parser_backend='auto'):
+        """
+        Inicializa o processador
+        
+        Args:
+            parser_backend (str): Backend de parsing do XHTML: 'auto' (lxml com
+                fallback BeautifulSoup), 'lxml' ou 'bs4'
+        """
+        self.parser_backend = parser_backend
+        self.content_parser = get_content_parser(parser_backend)
+        self.classifier = ElementClassifier()
         self.total_words = 0
         self.total_content_items = 0
         self.total_chapters = 0
@@ -38,13 +59,8 @@ class EpubToJsonProcessor:
         if not text or not isinstance(text, str):
             return 0
         
-        # Remove espaços extras e quebras de linha
-        cleaned_text = ' '.join(text.strip().split())
-        
-        # Conta palavras (divide por espaços)
-        if cleaned_text:
-            return len(cleaned_text.split())
-        return 0
+        # Divide por espaços em branco (espaços extras e quebras de linha são ignorados)
+        return len(text.split())
     
     def extract_epub(self, epub_path, extract_dir):
         """Extrai conteúdo do EPUB para diretório temporário"""
@@ -53,55 +69,177 @@ class EpubToJsonProcessor:
         return extract_dir
     
     def find_content_files(self, extract_dir):
-        """Encontra arquivos de conteúdo no EPUB extraído"""
+        """
+        Encontra arquivos de conteúdo no EPUB extraído.
+        Usa o spine do OPF; a busca por nome só é usada se o EPUB não tiver OPF.
+        """
+        spine_index = SpineIndex.for_directory(extract_dir)
+        if spine_index is not None and spine_index.content_members():
+            print(f"   📑 Spine do OPF: {spine_index.opf_path}")
+            content_files = []
+            for member in spine_index.content_members():
+                file_path = os.path.join(extract_dir, *member.split('/'))
+                if os.path.isfile(file_path):
+                    content_files.append(file_path)
+            return content_files
+        
+        print("   ⚠️ OPF/spine não encontrado, buscando arquivos de conteúdo pelo nome")
         content_files = []
         
         # Procura por arquivos XML/XHTML de conteúdo
         for root, dirs, files in os.walk(extract_dir):
             for file in files:
-                if file.endswith(('.xml', '.xhtml', '.html')):
-                    file_path = os.path.join(root, file)
-                    # Verifica se é um arquivo de conteúdo (não navegação)
-                    if 'content' in file.lower() or 'chapter' in file.lower():
-                        content_files.append(file_path)
+                # Verifica se é um arquivo de conteúdo (não navegação)
+                if self._is_content_name(file):
+                    content_files.append(os.path.join(root, file))
         
         # Ordena os arquivos por nome para manter ordem
         content_files.sort()
         return content_files
     
+    def _is_content_name(self, file_name):
+        """Heurística de nome usada para reconhecer arquivos de conteúdo"""
+        if not file_name.endswith(('.xml', '.xhtml', '.html')):
+            return False
+        return 'content' in file_name.lower() or 'chapter' in file_name.lower()
+    
+    def find_content_members(self, epub):
+        """
+        Encontra membros de conteúdo direto no ZipFile, sem extrair para disco.
+        Abre apenas os itens do spine (índice em cache por arquivo EPUB); a
+        busca por nome em namelist() só é usada se o EPUB não tiver OPF.
+        
+        Args:
+            epub (zipfile.ZipFile): EPUB aberto
+            
+        Returns:
+            list: Nomes dos membros de conteúdo em ordem de leitura
+        """
+        spine_index = SpineIndex.for_zip(epub)
+        if spine_index is not None and spine_index.content_members():
+            print(f"   📑 Spine do OPF: {spine_index.opf_path}")
+            names = set(epub.namelist())
+            return [member for member in spine_index.content_members() if member in names]
+        
+        print("   ⚠️ OPF/spine não encontrado, buscando arquivos de conteúdo pelo nome")
+        content_members = [
+            name for name in epub.namelist()
+            if self._is_content_name(posixpath.basename(name))
+        ]
+        content_members.sort()
+        return content_members
+    
+    def read_member(self, epub, member):
+        """Lê um membro do zip como texto (mesma normalização de quebras de linha do open())"""
+        with io.TextIOWrapper(epub.open(member), encoding='utf-8') as f:
+            return f.read()
+    
     def process_content_item(self, text_content):
         """
         Processa um item de conteúdo, limpando o texto e adicionando word_count.
+        O word_count é calculado aqui, uma única vez; as etapas seguintes só
+        o recalculam nos parágrafos cujo texto alterarem.
         
         Args:
             text_content (str): Texto bruto do elemento
             
         Returns:
-            dict or None: Item de conteúdo processado ou None se inválido
+            Paragraph or None: Item de conteúdo processado ou None se inválido
         """
-        # Limpa e valida texto
-        cleaned_text = re.sub(r'\s+', ' ', text_content).strip()
+        # Limpa o texto e conta palavras na mesma passada
+        cleaned_text, word_count = self.classifier.normalize(text_content)
         if not cleaned_text or len(cleaned_text) <= 10:  # Ignora textos muito curtos
             return None
         
-        # Conta palavras
-        word_count = self.count_words(cleaned_text)
         self.total_words += word_count
         self.total_content_items += 1
         
-        return {
-            "type": "p",
-            "content": cleaned_text,
-            "word_count": word_count
-        }
+        return Paragraph(type="p", content=cleaned_text, word_count=word_count)
+    
+    def parse_content_file(self, content, part_index):
+        """
+        Converte o XHTML de um arquivo de conteúdo em uma parte do livro.
+        
+        Args:
+            content (str): Conteúdo XHTML do arquivo
+            part_index (int): Posição do arquivo na ordem de leitura
+            
+        Returns:
+            Part: Parte com part_title e chapters
+        """
+        title_text, all_elements = self.content_parser.parse(content)
+        
+        # Determina título da parte
+        part_title = f"Part {part_index + 1}"
+        
+        # Tenta encontrar título no conteúdo
+        if title_text is not None:
+            potential_title = title_text.strip()
+            if potential_title and len(potential_title) < 200:
+                part_title = potential_title
+        
+        current_part = Part(part_title=part_title, chapters=[])
+        
+        # Processa elementos do arquivo
+        current_chapter = None
+        
+        for element_name, element_text in all_elements:
+            text_content = element_text.strip()
+            if not text_content:
+                continue
+            
+            # Detecta títulos de capítulo
+            if self.classifier.is_chapter_title(element_name, text_content):
+                current_chapter = Chapter(chapter_title=text_content, content=[])
+                current_part.chapters.append(current_chapter)
+                self.total_chapters += 1
+                continue
+            
+            # Adiciona conteúdo
+            if element_name == 'p' and text_content:
+                # Se não há capítulo atual, cria um
+                if not current_chapter:
+                    current_chapter = Chapter(chapter_title="Content", content=[])
+                    current_part.chapters.append(current_chapter)
+                    self.total_chapters += 1
+                
+                # Processa item de conteúdo
+                content_item = self.process_content_item(text_content)
+                if content_item:
+                    current_chapter.content.append(content_item)
+        
+        return current_part
     
-    def process_epub_to_json(self, epub_path, output_json_path=None):
+    def _content_sources_from_disk(self, epub_path, temp_dir):
+        """Extrai o EPUB para disco e gera (nome, leitor) para cada arquivo de conteúdo"""
+        extract_dir = self.extract_epub(epub_path, temp_dir)
+        print(f"   📂 EPUB extraído para: {extract_dir}")
+        
+        content_files = self.find_content_files(extract_dir)
+        
+        def _reader(file_path):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        
+        return [(file_path, lambda file_path=file_path: _reader(file_path)) for file_path in content_files]
+    
+    def _content_sources_from_zip(self, epub):
+        """Gera (nome, leitor) para cada membro de conteúdo lido direto do ZipFile"""
+        print(f"   📦 Lendo conteúdo direto do zip (sem extração)")
+        
+        content_members = self.find_content_members(epub)
+        return [(member, lambda member=member: self.read_member(epub, member)) for member in content_members]
+    
+    def process_epub_to_json(self, epub_path, output_json_path=None, in_memory=False, workers=1):
         """
         Converte arquivo EPUB para JSON estruturado com word_count automático.
         
         Args:
             epub_path (str): Caminho para o arquivo EPUB
             output_json_path (str, optional): Caminho do arquivo JSON de saída
+            in_memory (bool): Lê os membros direto do ZipFile em vez de extrair
+                para um diretório temporário
+            workers (int): Número de processos para o parsing dos arquivos (1 = serial)
             
         Returns:
             bool: True se sucesso, False se erro
@@ -117,127 +255,155 @@ class EpubToJsonProcessor:
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir)
         
-        # Reset de estatísticas
+        self._reset_statistics()
+        
+        try:
+            with self._content_sources(epub_path, in_memory) as sources:
+                if not self._has_sources(sources):
+                    return False
+                with BookJsonWriter(output_json_path) as writer:
+                    self._emit_book_structure(sources, writer.write_part, workers)
+            
+            print(f"   🔢 word_count calculado na extração de {self.total_content_items} itens")
+            
+            self._print_statistics(output_json_path)
+            return True
+            
+        except Exception as e:
+            print(f"   ❌ Erro durante processamento: {e}")
+            return False
+    
+    def extract_book(self, epub_path, workers=1):
+        """
+        Converte o EPUB para a estrutura do livro em memória (lista de partes),
+        lendo o conteúdo direto do zip e sem gravar JSON. Usado pelo pipeline
+        em processo do main.py.
+        
+        Args:
+            epub_path (str): Caminho para o arquivo EPUB
+            workers (int): Número de processos para o parsing dos arquivos (1 = serial)
+            
+        Returns:
+            Book or None: Estrutura do livro ou None se erro
+        """
+        print(f"📚 Processando EPUB: {epub_path}")
+        self._reset_statistics()
+        
+        try:
+            with self._content_sources(epub_path, in_memory=True) as sources:
+                if not self._has_sources(sources):
+                    return None
+                book_structure = Book()
+                self._emit_book_structure(sources, book_structure.append, workers)
+        except Exception as e:
+            print(f"   ❌ Erro durante processamento: {e}")
+            return None
+        
+        print(f"   🔢 word_count calculado na extração de {self.total_content_items} itens")
+        print(f"   📚 Partes: {self.total_parts}, capítulos: {self.total_chapters}, "
+              f"palavras: {self.total_words:,}")
+        return book_structure
+    
+    def _reset_statistics(self):
+        """Zera as estatísticas antes de processar um EPUB"""
         self.total_words = 0
         self.total_content_items = 0
         self.total_chapters = 0
         self.total_parts = 0
+    
+    @contextlib.contextmanager
+    def _content_sources(self, epub_path, in_memory):
+        """Abre o EPUB (zip ou extração temporária) e fornece os pares (nome, leitor)"""
+        if in_memory:
+            with zipfile.ZipFile(epub_path, 'r') as epub:
+                yield self._content_sources_from_zip(epub)
+        else:
+            # Cria diretório temporário
+            with tempfile.TemporaryDirectory() as temp_dir:
+                yield self._content_sources_from_disk(epub_path, temp_dir)
+    
+    def _has_sources(self, sources):
+        """Informa quantos arquivos de conteúdo foram encontrados"""
+        print(f"   📄 Arquivos de conteúdo encontrados: {len(sources)}")
+        
+        if not sources:
+            print("   ❌ Nenhum arquivo de conteúdo encontrado!")
+            return False
+        return True
+    
+    def _emit_book_structure(self, sources, emit_part, workers=1):
+        """
+        Processa cada arquivo de conteúdo e entrega cada parte assim que é
+        produzida (para o BookJsonWriter ou uma lista), sem acumular o livro.
         
-        # Cria diretório temporário
-        with tempfile.TemporaryDirectory() as temp_dir:
+        Args:
+            sources (list): Pares (nome, leitor) na ordem de leitura
+            emit_part (callable): Recebe cada parte com conteúdo
+            workers (int): Número de processos para o parsing (1 = serial)
+        """
+        if workers > 1:
+            print(f"   ⚙️  Parsing paralelo com {workers} processos")
+            parsed_parts = self._parse_sources_parallel(sources, workers)
+        else:
+            parsed_parts = self._parse_sources_serial(sources)
+        
+        for current_part in parsed_parts:
+            # Só adiciona a parte se tiver conteúdo
+            if not current_part.chapters:
+                continue
+            
+            # Seções pré-textuais ficam no primeiro capítulo do livro: marcadas aqui, uma vez
+            if self.total_parts == 0:
+                tagged = tag_front_matter(current_part.chapters[0])
+                if tagged:
+                    print(f"   🏷️  Pré-textuais marcados: "
+                          + ", ".join(f"{kind} ({count})" for kind, count in tagged.items()))
+            
+            emit_part(current_part)
+            self.total_parts += 1
+    
+    def _parse_sources_serial(self, sources):
+        """Converte cada arquivo de conteúdo no próprio processo, em ordem"""
+        for i, (name, read_content) in enumerate(sources):
+            print(f"   📖 Processando: {os.path.basename(name)}")
+            
             try:
-                # Extrai EPUB
-                extract_dir = self.extract_epub(epub_path, temp_dir)
-                print(f"   📂 EPUB extraído para: {extract_dir}")
-                
-                # Encontra arquivos de conteúdo
-                content_files = self.find_content_files(extract_dir)
-                print(f"   📄 Arquivos de conteúdo encontrados: {len(content_files)}")
-                
-                if not content_files:
-                    print("   ❌ Nenhum arquivo de conteúdo encontrado!")
-                    return False
-                
-                book_structure = []
-                
-                # Processa cada arquivo
-                for i, file_path in enumerate(content_files):
-                    print(f"   📖 Processando: {os.path.basename(file_path)}")
-                    
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                        
-                        soup = BeautifulSoup(content, 'html.parser')
-                        
-                        # Determina título da parte
-                        part_title = f"Part {i + 1}"
-                        
-                        # Tenta encontrar título no conteúdo
-                        title_elem = soup.find(['h1', 'h2', 'title'])
-                        if title_elem:
-                            potential_title = title_elem.get_text().strip()
-                            if potential_title and len(potential_title) < 200:
-                                part_title = potential_title
-                        
-                        current_part = {
-                            "part_title": part_title,
-                            "chapters": []
-                        }
-                        
-                        # Processa elementos do arquivo
-                        all_elements = soup.find_all(['p', 'div', 'h1', 'h2', 'h3'])
-                        current_chapter = None
-                        
-                        for element in all_elements:
-                            text_content = element.get_text().strip()
-                            if not text_content:
-                                continue
-                            
-                            # Detecta títulos de capítulo
-                            is_chapter_title = (
-                                re.match(r'^CHAPTER\s+[IVXLCDM]+', text_content, re.IGNORECASE) or
-                                re.match(r'^Chapter\s+\d+', text_content, re.IGNORECASE) or
-                                element.name in ['h1', 'h2'] and len(text_content) < 100
-                            )
-                            
-                            if is_chapter_title:
-                                current_chapter = {
-                                    "chapter_title": text_content,
-                                    "content": []
-                                }
-                                current_part["chapters"].append(current_chapter)
-                                self.total_chapters += 1
-                                continue
-                            
-                            # Adiciona conteúdo
-                            if element.name == 'p' and text_content:
-                                # Se não há capítulo atual, cria um
-                                if not current_chapter:
-                                    current_chapter = {
-                                        "chapter_title": "Content",
-                                        "content": []
-                                    }
-                                    current_part["chapters"].append(current_chapter)
-                                    self.total_chapters += 1
-                                
-                                # Processa item de conteúdo
-                                content_item = self.process_content_item(text_content)
-                                if content_item:
-                                    current_chapter["content"].append(content_item)
-                        
-                        # Só adiciona a parte se tiver conteúdo
-                        if current_part["chapters"]:
-                            book_structure.append(current_part)
-                            self.total_parts += 1
-                            
-                    except Exception as e:
-                        print(f"   ⚠️ Erro ao processar {file_path}: {e}")
-                        continue
-                
-                # Salva JSON com word_count incluído
-                # Final recomputation of word_count to guarantee consistency
-                def _recompute_counts(struct):
-                    items = 0
-                    for part in struct:
-                        for ch in part.get('chapters', []):
-                            for it in ch.get('content', []):
-                                if isinstance(it, dict) and 'content' in it:
-                                    it['word_count'] = self.count_words(it.get('content', ''))
-                                    items += 1
-                    return items
-                items_recomputed = _recompute_counts(book_structure)
-                os.makedirs(os.path.dirname(output_json_path), exist_ok=True)
-                with open(output_json_path, 'w', encoding='utf-8') as f:
-                    json.dump(book_structure, f, indent=2, ensure_ascii=False)
-                print(f"   🔢 word_count recalculado em {items_recomputed} itens")
+                current_part = self.parse_content_file(read_content(), i)
+            except Exception as e:
+                print(f"   ⚠️ Erro ao processar {name}: {e}")
+                continue
+            
+            yield current_part
+    
+    def _parse_sources_parallel(self, sources, workers):
+        """
+        Converte os arquivos de conteúdo em um ProcessPoolExecutor.
+        As partes são devolvidas na ordem do spine e as estatísticas de cada
+        worker são somadas aos contadores deste processador.
+        """
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = []
+            for i, (name, read_content) in enumerate(sources):
+                try:
+                    futures.append((name, executor.submit(_parse_content_worker, read_content(), i, self.parser_backend)))
+                except Exception as e:
+                    futures.append((name, e))
+            
+            for name, future in futures:
+                print(f"   📖 Processando: {os.path.basename(name)}")
                 
-                self._print_statistics(output_json_path)
-                return True
+                try:
+                    if isinstance(future, Exception):
+                        raise future
+                    current_part, stats = future.result()
+                except Exception as e:
+                    print(f"   ⚠️ Erro ao processar {name}: {e}")
+                    continue
                 
-            except Exception as e:
-                print(f"   ❌ Erro durante processamento: {e}")
-                return False
+                self.total_words += stats['total_words']
+                self.total_content_items += stats['total_content_items']
+                self.total_chapters += stats['total_chapters']
+                yield current_part
     
     def _print_statistics(self, output_json_path):
         """Imprime estatísticas do processamento"""
@@ -305,25 +471,219 @@ class EpubToJsonProcessor:
             print("\n❌ Erro na conversão!")
         
         return success
+    
+    def process_batch(self, input_dir, output_dir, workers=None, force=False):
+        """
+        Converte todos os EPUBs de um diretório (recursivamente), sem interação.
+        Cada livro é processado em um worker do pool, lendo direto do zip, e
+        ganha um manifesto '<livro>.manifest.json' com origem, tempos e
+        estatísticas. Livros cujo manifesto corresponde ao EPUB atual são pulados.
+        
+        Args:
+            input_dir (str): Diretório com os arquivos EPUB
+            output_dir (str): Diretório de saída (espelha a estrutura de input_dir)
+            workers (int, optional): Número de processos (padrão: número de CPUs)
+            force (bool): Reprocessa mesmo os livros já atualizados
+            
+        Returns:
+            dict: Resumo com contagens, tempo total e vazão
+        """
+        workers = workers or os.cpu_count() or 1
+        
+        print("📚 CONVERSOR EPUB → JSON EM LOTE")
+        print("=" * 55)
+        print(f"   📂 Entrada: {input_dir}")
+        print(f"   📂 Saída: {output_dir}")
+        print(f"   ⚙️  Workers: {workers}")
+        
+        epub_files = []
+        for root, dirs, files in os.walk(input_dir):
+            dirs.sort()
+            for file in sorted(files):
+                if file.lower().endswith('.epub'):
+                    epub_files.append(os.path.join(root, file))
+        
+        jobs = []
+        skipped = 0
+        for epub_path in epub_files:
+            relative = os.path.relpath(epub_path, input_dir)
+            output_path = os.path.join(output_dir, os.path.splitext(relative)[0] + '.json')
+            if not force and _is_book_up_to_date(epub_path, output_path):
+                skipped += 1
+                continue
+            jobs.append((epub_path, output_path))
+        
+        print(f"   📄 EPUBs encontrados: {len(epub_files)} ({skipped} já atualizados, {len(jobs)} a processar)")
+        
+        processed = 0
+        failed = 0
+        input_bytes = 0
+        start = time.perf_counter()
+        
+        if jobs:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(_process_book_worker, epub_path, output_path, self.parser_backend): epub_path
+                    for epub_path, output_path in jobs
+                }
+                for future in as_completed(futures):
+                    epub_path = futures[future]
+                    try:
+                        manifest = future.result()
+                    except Exception as e:
+                        failed += 1
+                        print(f"   ❌ {epub_path}: {e}")
+                        continue
+                    
+                    if manifest['status'] == 'ok':
+                        processed += 1
+                        input_bytes += manifest['source_size']
+                        print(f"   ✅ {epub_path} ({manifest['seconds']:.2f}s, "
+                              f"{manifest['statistics']['total_words']:,} palavras)")
+                    else:
+                        failed += 1
+                        print(f"   ❌ {epub_path}: {manifest.get('error', 'erro na conversão')}")
+        
+        elapsed = time.perf_counter() - start
+        summary = {
+            'found': len(epub_files),
+            'processed': processed,
+            'skipped': skipped,
+            'failed': failed,
+            'seconds': elapsed,
+            'books_per_second': processed / elapsed if elapsed > 0 else 0.0,
+            'mb_per_second': input_bytes / (1024 * 1024) / elapsed if elapsed > 0 else 0.0,
+        }
+        
+        print(f"\n📊 RESULTADO DO LOTE:")
+        print(f"   ✅ Processados: {processed}")
+        print(f"   ⏭️  Pulados (atualizados): {skipped}")
+        print(f"   ❌ Falhas: {failed}")
+        print(f"   ⏱️  Tempo total: {elapsed:.2f}s")
+        print(f"   🚀 Vazão: {summary['books_per_second']:.2f} livros/s, {summary['mb_per_second']:.2f} MB/s")
+        
+        return summary
+
+
+def _manifest_path(output_path):
+    """Caminho do manifesto de um livro convertido em lote"""
+    return os.path.splitext(output_path)[0] + '.manifest.json'
+
+
+def _is_book_up_to_date(epub_path, output_path):
+    """Verifica se o JSON e o manifesto de um livro correspondem ao EPUB atual"""
+    manifest_path = _manifest_path(output_path)
+    if not os.path.exists(output_path) or not os.path.exists(manifest_path):
+        return False
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+    stat = os.stat(epub_path)
+    return (manifest.get('status') == 'ok' and
+            manifest.get('source_size') == stat.st_size and
+            manifest.get('source_mtime_ns') == stat.st_mtime_ns)
+
+
+def _process_book_worker(epub_path, output_path, parser_backend='auto'):
+    """
+    Worker do modo em lote: converte um EPUB (lendo direto do zip), grava o
+    manifesto do livro e o devolve. A saída detalhada do processador é
+    descartada para não misturar o log dos vários workers.
+    """
+    stat = os.stat(epub_path)
+    processor = EpubToJsonProcessor(parser_backend)
+    log = io.StringIO()
+    
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(log):
+        success = processor.process_epub_to_json(epub_path, output_path, in_memory=True)
+    elapsed = time.perf_counter() - start
+    
+    manifest = {
+        'source': os.path.abspath(epub_path),
+        'source_size': stat.st_size,
+        'source_mtime_ns': stat.st_mtime_ns,
+        'output': os.path.abspath(output_path),
+        'parser_backend': parser_backend,
+        'status': 'ok' if success else 'error',
+        'seconds': elapsed,
+        'statistics': {
+            'total_parts': processor.total_parts,
+            'total_chapters': processor.total_chapters,
+            'total_content_items': processor.total_content_items,
+            'total_words': processor.total_words,
+        },
+    }
+    if not success:
+        errors = [line.split('❌', 1)[1].strip() for line in log.getvalue().splitlines() if '❌' in line]
+        manifest['error'] = errors[-1] if errors else 'erro na conversão'
+    
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(_manifest_path(output_path), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    
+    return manifest
+
+
+def _parse_content_worker(content, part_index, parser_backend='auto'):
+    """
+    Worker do pool de processos: converte um arquivo de conteúdo com um
+    processador próprio e devolve a parte junto com suas estatísticas.
+    """
+    processor = EpubToJsonProcessor(parser_backend)
+    current_part = processor.parse_content_file(content, part_index)
+    stats = {
+        'total_words': processor.total_words,
+        'total_content_items': processor.total_content_items,
+        'total_chapters': processor.total_chapters,
+    }
+    return current_part, stats
 
 
 def main():
     """Função principal para uso direto do script"""
-    import sys
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Converte EPUB para JSON estruturado com word_count")
+    parser.add_argument('epub_file', nargs='?', help="Arquivo EPUB (busca na pasta atual se omitido)")
+    parser.add_argument('output_path', nargs='?', help="Arquivo JSON de saída (padrão: output/livro_en.json)")
+    parser.add_argument('--in-memory', action='store_true',
+                        help="Lê o conteúdo direto do zip, sem extrair para disco")
+    parser.add_argument('--workers', type=int, default=None, metavar='N',
+                        help="Número de processos: arquivos de um livro (padrão: 1) ou livros no modo --batch (padrão: CPUs)")
+    parser.add_argument('--batch', action='store_true',
+                        help="Modo em lote: epub_file é um diretório de EPUBs e output_path o diretório de saída")
+    parser.add_argument('--force', action='store_true',
+                        help="No modo --batch, reprocessa também os livros já atualizados")
+    parser.add_argument('--parser', choices=['auto', 'lxml', 'bs4'], default='auto',
+                        help="Backend de parsing do XHTML (padrão: auto = lxml com fallback BeautifulSoup)")
+    args = parser.parse_args()
     
-    processor = EpubToJsonProcessor()
+    processor = EpubToJsonProcessor(args.parser)
+    
+    if args.batch:
+        if not args.epub_file or not args.output_path:
+            parser.error("--batch requer diretório de entrada e diretório de saída")
+        if not os.path.isdir(args.epub_file):
+            print(f"❌ Diretório de entrada não encontrado: {args.epub_file}")
+            sys.exit(1)
+        summary = processor.process_batch(args.epub_file, args.output_path, args.workers, args.force)
+        sys.exit(1 if summary['failed'] else 0)
     
     # Verifica se foi passado um arquivo EPUB como argumento
-    if len(sys.argv) > 1:
-        epub_file = sys.argv[1]
-        output_path = sys.argv[2] if len(sys.argv) > 2 else None
+    if args.epub_file:
+        epub_file = args.epub_file
+        output_path = args.output_path
         
         if not os.path.exists(epub_file):
             print(f"❌ Arquivo EPUB não encontrado: {epub_file}")
             sys.exit(1)
             
         print(f"📚 Processando arquivo especificado: {epub_file}")
-        success = processor.process_epub_to_json(epub_file, output_path)
+        success = processor.process_epub_to_json(epub_file, output_path,
+                                                 in_memory=args.in_memory, workers=args.workers or 1)
         
         if success:
             print("\n🎉 Conversão concluída com sucesso!")
@@ -4,16 +4,23 @@ Script para gerar arquivo EPUB atualizado a partir do JSON corrigido.
 Suporta tanto versão em inglês quanto português.
 """
 
-import json
+import io
 import os
+import sys
 import zipfile
 import shutil
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from datetime import datetime
 from xml.etree.ElementTree import Element, SubElement, tostring, ElementTree
 import xml.etree.ElementTree as ET
 from xml.dom import minidom
 import html
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'common'))
+from book_model import Book
+from front_matter import DEDICATORY_PRAYER, FRONT_MATTER_KINDS, PREFACE, front_matter_kinds, part_section_kind
+
 def prettify_xml(elem):
     """Formata XML de forma legível"""
     rough_string = tostring(elem, 'unicode')
@@ -38,7 +45,7 @@ def create_xhtml_content(chapter_data, chapter_num, part_num, part_data=None, la
 
     if(part_data):
         # Título da parte
-        part_title = part_data.get('part_title', '')
+        part_title = part_data.part_title or ''
 
         if lang == 'pt':
             title.text = f"{part_title} - Capítulo {chapter_num}"
@@ -63,8 +70,8 @@ def create_xhtml_content(chapter_data, chapter_num, part_num, part_data=None, la
     
     # Se é o primeiro capítulo de uma parte, exibir título e subtítulo da parte
     if chapter_num == 1 and part_data:
-        part_title = part_data.get('part_title', '')
-        part_subtitle = part_data.get('part_subtitle', '')
+        part_title = part_data.part_title or ''
+        part_subtitle = part_data.part_subtitle or ''
         
         if part_title:
             part_title_elem = SubElement(body, 'h1', {'class': 'part-title'})
@@ -75,11 +82,11 @@ def create_xhtml_content(chapter_data, chapter_num, part_num, part_data=None, la
             part_subtitle_elem.text = part_subtitle
     
     # Título do capítulo
-    if chapter_data.get('chapter_title'):
+    if chapter_data.chapter_title:
         h1 = SubElement(body, 'h1', {'class': 'chapter-title'})
         
         # Quebrar título no ponto para criar quebra de linha
-        chapter_title = chapter_data['chapter_title']
+        chapter_title = chapter_data.chapter_title
         if '.' in chapter_title:
             # Dividir no primeiro ponto
             parts = chapter_title.split('.', 1)
@@ -97,12 +104,12 @@ def create_xhtml_content(chapter_data, chapter_num, part_num, part_data=None, la
             h1.text = chapter_title
     
     # Conteúdo do capítulo
-    for content_item in chapter_data.get('content', []):
-        content_text = content_item.get('content', '').strip()
+    for content_item in chapter_data.content or []:
+        content_text = (content_item.content or '').strip()
         if not content_text:
             continue
             
-        content_type = content_item.get('type', 'p')
+        content_type = content_item.type or 'p'
         
         if content_type == 'h1':
             elem = SubElement(body, 'h1')
@@ -200,7 +207,7 @@ def create_opf_file(book_data, output_dir, lang='en', has_prayer_in_json=False,
     file_list = []
     
     for part_idx, part in enumerate(book_data):
-        for chapter_idx, chapter in enumerate(part.get('chapters', [])):
+        for chapter_idx, chapter in enumerate(part.chapters or []):
             file_id = f"chapter-{file_counter:03d}"
             file_name = f"chapter-{file_counter:03d}.xhtml"
             file_list.append((file_id, file_name))
@@ -282,20 +289,16 @@ def create_ncx_file(book_data, lang='en', has_prayer_in_json=False, has_preface_
     
     
     for part_idx, part in enumerate(book_data):
-        part_title = part.get('part_title')
-        part_subtitle = part.get('part_subtitle', '')
+        part_title = part.part_title
+        part_subtitle = part.part_subtitle or ''
         
-        # Verificar se é uma seção especial (DEDICATORY PRAYER/PREFACE) pelos títulos dos capítulos
-        is_special_section = False
-        if part.get('chapters'):
-            first_chapter_title = part['chapters'][0].get('chapter_title', '').upper()
-            special_titles = ['DEDICATORY PRAYER', 'ORAÇÃO DEDICATÓRIA', 'PREFACE', 'PREFÁCIO']
-            is_special_section = any(title in first_chapter_title for title in special_titles)
+        # Verificar se é uma seção especial (DEDICATORY PRAYER/PREFACE) pelo section_kind da parte
+        is_special_section = part_section_kind(part) in FRONT_MATTER_KINDS
         
         # Se é seção especial, trata os capítulos como itens independentes
         if is_special_section:
             # Capítulos independentes (sem agrupamento por parte)
-            for chapter_idx, chapter in enumerate(part.get('chapters', [])):
+            for chapter_idx, chapter in enumerate(part.chapters or []):
                 chapter_title = chapter.get('chapter_title', f'Chapter {chapter_idx + 1}')
                 
                 chapter_nav = SubElement(nav_map, 'navPoint',
@@ -327,12 +330,12 @@ def create_ncx_file(book_data, lang='en', has_prayer_in_json=False, has_preface_
             part_text.text = display_title
             
             # Primeiro capítulo da parte como conteúdo
-            if part.get('chapters'):
+            if part.chapters:
                 first_chapter_file = f"text/chapter-{chapter_file_counter:03d}.xhtml"
                 SubElement(part_nav, 'content', src=first_chapter_file)
             
             # Capítulos da parte
-            for chapter_idx, chapter in enumerate(part.get('chapters', [])):
+            for chapter_idx, chapter in enumerate(part.chapters or []):
                 chapter_title = chapter.get('chapter_title', f'Chapter {chapter_idx + 1}')
                 
                 chapter_nav = SubElement(part_nav, 'navPoint',
@@ -381,68 +384,27 @@ def create_container_xml():
     
     return prettify_xml(container)
 
-def generate_epub(json_file, output_epub, lang='en'):
+def generate_epub(json_file, output_epub, lang='en', book_data=None):
     """
     Gera arquivo EPUB a partir do JSON
+    (ou do livro já carregado em memória, quando book_data é informado)
     """
     print(f"📚 Gerando EPUB em {'português' if lang == 'pt' else 'inglês'}...")
     print(f"   📂 Fonte: {json_file}")
     print(f"   📂 Destino: {output_epub}")
     
     # Carrega dados do JSON
-    with open(json_file, 'r', encoding='utf-8') as f:
-        book_data = json.load(f)
-    
-    # Detecta se o JSON já contém oração dedicatória e prefácio
-    has_prayer_in_json = False
-    has_preface_in_json = False
-    
-    # Verifica se há oração dedicatória no conteúdo
-    for part_idx, part in enumerate(book_data):
-        # Verifica no título da parte
-        part_title = part.get('part_title', '').upper()
-        if ('ORAÇÃO' in part_title and 'DEDICATÓRIA' in part_title) or \
-           ('DEDICATORY' in part_title and 'PRAYER' in part_title):
-            has_prayer_in_json = True
-            print(f"   ✅ Oração dedicatória detectada no JSON (título da parte)")
-        
-        if ('PREFÁCIO' in part_title) or ('PREFACE' in part_title):
-            has_preface_in_json = True
-            print(f"   ✅ Prefácio detectado no JSON (título da parte)")
-            
-        for chap_idx, chapter in enumerate(part.get('chapters', [])):
-            # Verifica no título do capítulo
-            chapter_title = chapter.get('chapter_title', '').upper()
-            if ('ORAÇÃO' in chapter_title and 'DEDICATÓRIA' in chapter_title) or \
-               ('DEDICATORY' in chapter_title and 'PRAYER' in chapter_title):
-                has_prayer_in_json = True
-                print(f"   ✅ Oração dedicatória detectada no JSON (título do capítulo)")
-                
-            if ('PREFÁCIO' in chapter_title) or ('PREFACE' in chapter_title):
-                has_preface_in_json = True
-                print(f"   ✅ Prefácio detectado no JSON (título do capítulo)")
-                
-            # Verifica no conteúdo dos itens
-            for cont_idx, content_item in enumerate(chapter.get('content', [])):
-                content_text = content_item.get('content', '').upper()
-                
-                if ('ORAÇÃO' in content_text and 'DEDICATÓRIA' in content_text) or \
-                   ('DEDICATORY' in content_text and 'PRAYER' in content_text):
-                    has_prayer_in_json = True
-                    print(f"   ✅ Oração dedicatória detectada no JSON (conteúdo)")
-                    
-                if ('PREFÁCIO' in content_text) or ('PREFACE' in content_text):
-                    # Certifica que não é apenas menção do prefácio em outro contexto
-                    if len(content_text.strip()) < 200:  # Se for uma linha curta, provavelmente é um título
-                        has_preface_in_json = True
-                        print(f"   ✅ Prefácio detectado no JSON (conteúdo)")
-                        
-                if has_prayer_in_json and has_preface_in_json:
-                    break
-            if has_prayer_in_json and has_preface_in_json:
-                break
-        if has_prayer_in_json and has_preface_in_json:
-            break
+    if book_data is None:
+        book_data = Book.load(json_file)
+    
+    # Detecta se o JSON já contém oração dedicatória e prefácio (section_kind das partes)
+    front_matter = front_matter_kinds(book_data)
+    has_prayer_in_json = DEDICATORY_PRAYER in front_matter
+    has_preface_in_json = PREFACE in front_matter
+    if has_prayer_in_json:
+        print(f"   ✅ Oração dedicatória detectada no JSON")
+    if has_preface_in_json:
+        print(f"   ✅ Prefácio detectado no JSON")
     
     # Diretório temporário
     temp_dir = f"temp_epub_{lang}"
@@ -517,7 +479,7 @@ def generate_epub(json_file, output_epub, lang='en'):
         chapters_created = 0
         
         for part_idx, part in enumerate(book_data):
-            for chapter_idx, chapter in enumerate(part.get('chapters', [])):
+            for chapter_idx, chapter in enumerate(part.chapters or []):
                 file_name = f"chapter-{file_counter:03d}.xhtml"
                 file_path = os.path.join(temp_dir, 'OEBPS', 'text', file_name)
                 
@@ -579,6 +541,37 @@ def generate_epub(json_file, output_epub, lang='en'):
         
         return False
 
+def _generate_epub_worker(json_file, output_epub, lang):
+    """Gera um EPUB em um processo separado, capturando a saída impressa"""
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        success = generate_epub(json_file, output_epub, lang)
+    return success, buffer.getvalue()
+
+def generate_epubs(jobs):
+    """
+    Gera vários EPUBs em paralelo, um processo por idioma.
+    
+    Args:
+        jobs (list): Tuplas (json_file, output_epub, lang)
+        
+    Returns:
+        int: Número de EPUBs gerados com sucesso
+    """
+    if len(jobs) <= 1:
+        return sum(1 for job in jobs if generate_epub(*job))
+    
+    success_count = 0
+    with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as executor:
+        futures = [executor.submit(_generate_epub_worker, *job) for job in jobs]
+        # A saída é exibida na ordem dos jobs, sem intercalar os idiomas
+        for future in futures:
+            success, output = future.result()
+            print(output, end='')
+            if success:
+                success_count += 1
+    return success_count
+
 def main():
     """
     Função principal
@@ -620,15 +613,15 @@ def main():
     # Se executado com argumento --auto, gera automaticamente ambos os EPUBs disponíveis
     if len(sys.argv) > 1 and sys.argv[1] == '--auto':
         print(f"\n🔄 Gerando EPUBs automaticamente...")
-        success_count = 0
+        jobs = []
         
         if 'en' in available_files:
-            if generate_epub(available_files['en'], os.path.join(output_dir, 'Introduction to the Devout Life_EN.epub'), 'en'):
-                success_count += 1
+            jobs.append((available_files['en'], os.path.join(output_dir, 'Introduction to the Devout Life_EN.epub'), 'en'))
         
         if 'pt' in available_files:
-            if generate_epub(available_files['pt'], os.path.join(output_dir, 'Filoteia - Introdução à vida devota pt-BR.epub'), 'pt'):
-                success_count += 1
+            jobs.append((available_files['pt'], os.path.join(output_dir, 'Filoteia - Introdução à vida devota pt-BR.epub'), 'pt'))
+        
+        success_count = generate_epubs(jobs)
         
         print(f"\n🎉 {success_count} arquivo(s) EPUB gerado(s) com sucesso!")
         return
@@ -651,15 +644,15 @@ def main():
         generate_epub(available_files['pt'], output_file, 'pt')
         
     elif choice == '3':
-        success_count = 0
+        jobs = []
         
         if 'en' in available_files:
-            if generate_epub(available_files['en'], os.path.join(output_dir, 'Introduction_to_the_Devout_Life_EN.epub'), 'en'):
-                success_count += 1
+            jobs.append((available_files['en'], os.path.join(output_dir, 'Introduction_to_the_Devout_Life_EN.epub'), 'en'))
         
         if 'pt' in available_files:
-            if generate_epub(available_files['pt'], os.path.join(output_dir, 'Filoteia - Introdução à vida devota pt-BR.epub'), 'pt'):
-                success_count += 1
+            jobs.append((available_files['pt'], os.path.join(output_dir, 'Filoteia - Introdução à vida devota pt-BR.epub'), 'pt'))
+        
+        success_count = generate_epubs(jobs)
         
         print(f"\n🎉 {success_count} arquivo(s) EPUB gerado(s) com sucesso!")
         
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Correspondência entre os capítulos do summary.csv e os capítulos do JSON.
+
+O score de um par (título do CSV, capítulo do JSON) é o mesmo da versão
+anterior de reorganize_final: +1 para cada uma das 4 primeiras palavras do
+título (com mais de 3 letras) que aparece na abertura do capítulo (primeiros
+100 caracteres do primeiro parágrafo, normalizados) e +2 se os primeiros 20
+caracteres do título aparecem nela.
+
+Em vez de comparar cada título com todos os capítulos restantes:
+
+- OpeningIndex normaliza cada abertura uma vez e monta um índice invertido
+  token → capítulos. Como as palavras do título não têm espaços, "palavra
+  na abertura" equivale a "palavra contida em algum token da abertura", e
+  os capítulos candidatos de cada palavra saem do índice (memorizado por
+  palavra). Só os candidatos são pontuados.
+- A atribuição é global (algoritmo húngaro, linear_assignment): maximiza a
+  soma dos scores e, entre atribuições com a mesma soma, prefere a que
+  mantém a ordem do livro (menor deslocamento |i - j| total). Pares sem
+  nenhuma palavra em comum seguem a ordem, como o "próximo disponível" da
+  versão gulosa.
+- Cada correspondência traz a confiança: score / score máximo possível para
+  o título, e o segundo melhor candidato (ambíguo se empatar).
+"""
+
+import re
+
+
+TITLE_WORDS = 4          # Palavras do título consideradas
+MIN_WORD_LENGTH = 4      # Só palavras com mais de 3 caracteres pontuam
+PREFIX_LENGTH = 20       # Início do título que vale o bônus
+PREFIX_BONUS = 2
+OPENING_LENGTH = 100     # Caracteres do primeiro parágrafo usados como abertura
+
+_ZERO_WIDTH = ('\u200b', '\u200c', '\u200d', '\ufeff')            # zero-width + BOM
+_NARROW_SPACES = ('\u00a0', '\u202f', '\u2009', '\u200a')         # NBSP, estreitos e finos
+_PUNCTUATION = re.compile(r"[^\w\s]", flags=re.UNICODE)
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_label(text):
+    """Normaliza texto para comparação tolerante (minúsculas, sem pontuação extra)."""
+    if text is None:
+        return ""
+    t = text
+    for ch in _ZERO_WIDTH:
+        t = t.replace(ch, '')
+    for ch in _NARROW_SPACES:
+        t = t.replace(ch, ' ')
+    # Travessões e hífens viram espaço
+    t = t.replace('—', ' ').replace('–', ' ').replace('-', ' ')
+    t = t.lower()
+    t = _PUNCTUATION.sub(" ", t)
+    return _SPACES.sub(" ", t).strip()
+
+
+def chapter_opening(chapter):
+    """Abertura normalizada de um capítulo coletado ({'title', 'content', 'key'})"""
+    if not chapter['content']:
+        return None
+    return normalize_label((chapter['content'][0].content or '')[:OPENING_LENGTH].lower())
+
+
+def title_query(title):
+    """
+    Partes do título que pontuam.
+
+    Returns:
+        tuple: (palavras que valem 1 ponto, prefixo que vale o bônus)
+    """
+    normalized = normalize_label(title)
+    words = [word for word in normalized.split()[:TITLE_WORDS] if len(word) >= MIN_WORD_LENGTH]
+    return words, normalized[:PREFIX_LENGTH]
+
+
+class OpeningIndex:
+    """
+    Índice invertido das aberturas dos capítulos do JSON.
+
+    Capítulos sem conteúdo não entram no índice (nunca são candidatos).
+    """
+
+    def __init__(self, chapters):
+        self.openings = [chapter_opening(chapter) for chapter in chapters]
+        self._postings = {}
+        for j, opening in enumerate(self.openings):
+            if opening is None:
+                continue
+            for token in set(opening.split()):
+                self._postings.setdefault(token, set()).add(j)
+        self._containing = {}
+
+    def containing(self, piece):
+        """Capítulos cuja abertura contém piece (sem espaços) dentro de algum token"""
+        chapters = self._containing.get(piece)
+        if chapters is None:
+            chapters = set()
+            for token, postings in self._postings.items():
+                if piece in token:
+                    chapters |= postings
+            chapters = self._containing[piece] = frozenset(chapters)
+        return chapters
+
+    def scores(self, title):
+        """
+        Score de cada capítulo candidato para um título.
+
+        Returns:
+            tuple: ({índice do capítulo: score > 0}, score máximo possível)
+        """
+        words, prefix = title_query(title)
+        scores = {}
+        for word in words:
+            for j in self.containing(word):
+                scores[j] = scores.get(j, 0) + 1
+        # Candidatos ao bônus: aberturas com o maior trecho sem espaços do prefixo
+        piece = max(prefix.split(), key=len, default='')
+        candidates = (self.containing(piece) if piece
+                      else (j for j, opening in enumerate(self.openings) if opening is not None))
+        for j in candidates:
+            if prefix in self.openings[j]:
+                scores[j] = scores.get(j, 0) + PREFIX_BONUS
+        return scores, len(words) + PREFIX_BONUS
+
+
+def linear_assignment(cost):
+    """
+    Atribuição de custo mínimo (algoritmo húngaro com potenciais, O(n²m)).
+
+    Args:
+        cost (list): Matriz n × m (lista de listas), com n <= m
+
+    Returns:
+        list: Para cada linha, a coluna atribuída
+    """
+    n = len(cost)
+    m = len(cost[0]) if n else 0
+    if n > m:
+        raise ValueError("linear_assignment espera no máximo tantas linhas quanto colunas")
+    inf = float('inf')
+    u = [0] * (n + 1)
+    v = [0] * (m + 1)
+    row_of = [0] * (m + 1)      # linha (1..n) atribuída a cada coluna; 0 = livre
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        row_of[0] = i
+        j0 = 0
+        min_to = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = row_of[j0]
+            row = cost[i0 - 1]
+            delta = inf
+            j1 = 0
+            u_i0 = u[i0]
+            for j in range(1, m + 1):
+                if not used[j]:
+                    current = row[j - 1] - u_i0 - v[j]
+                    if current < min_to[j]:
+                        min_to[j] = current
+                        way[j] = j0
+                    if min_to[j] < delta:
+                        delta = min_to[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[row_of[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_to[j] -= delta
+            j0 = j1
+            if row_of[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            row_of[j0] = row_of[j1]
+            j0 = j1
+    assignment = [None] * n
+    for j in range(1, m + 1):
+        if row_of[j]:
+            assignment[row_of[j] - 1] = j - 1
+    return assignment
+
+
+def match_chapters(titles, chapters):
+    """
+    Atribui a cada título do CSV um capítulo do JSON, globalmente.
+
+    Args:
+        titles (list): Títulos dos capítulos do CSV, em ordem
+        chapters (list): Capítulos coletados do JSON ({'title', 'content', 'key'}), em ordem
+
+    Returns:
+        list: Um item por título: {'chapter': índice no JSON ou None,
+            'score', 'max_score', 'confidence' (0 a 1), 'runner_up': score do
+            segundo melhor candidato, 'ambiguous': bool}
+    """
+    index = OpeningIndex(chapters)
+    available = [j for j, opening in enumerate(index.openings) if opening is not None]
+    table = [index.scores(title) for title in titles]
+    results = [{'chapter': None, 'score': 0, 'max_score': max_score, 'confidence': 0.0,
+                'runner_up': 0, 'ambiguous': False} for _, max_score in table]
+    if not available or not titles:
+        return results
+
+    # Score domina; o deslocamento em relação à ordem do livro só desempata
+    scale = len(titles) * len(available) + 1
+    rows_are_titles = len(titles) <= len(available)
+    cost = [[-scores.get(j, 0) * scale + abs(i - position) for position, j in enumerate(available)]
+            for i, (scores, _) in enumerate(table)]
+    if rows_are_titles:
+        pairs = enumerate(linear_assignment(cost))
+    else:
+        transposed = [list(column) for column in zip(*cost)]
+        pairs = ((i, position) for position, i in enumerate(linear_assignment(transposed)))
+
+    for i, position in pairs:
+        scores, max_score = table[i]
+        j = available[position]
+        score = scores.get(j, 0)
+        runner_up = max((s for k, s in scores.items() if k != j), default=0)
+        results[i].update({
+            'chapter': j,
+            'score': score,
+            'confidence': score / max_score if max_score else 0.0,
+            'runner_up': runner_up,
+            'ambiguous': score > 0 and runner_up >= score,
+        })
+    return results
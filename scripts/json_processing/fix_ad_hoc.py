@@ -3,72 +3,65 @@
 Correções ad hoc específicas para problemas pontuais no JSON
 """
 
-import json
 import os
+import sys
 import shutil
 
-def apply_ad_hoc_fixes(json_data):
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'common'))
+from book_model import Part
+from book_stream import BookJsonWriter, iter_book_parts
+from rule_engine import ChangeLog, RuleEngine
+
+# Regras em data/rules/ad_hoc_en.json (adicione novas correções lá)
+AD_HOC_RULES = 'ad_hoc_en'
+
+FIELD_LABELS = {'part_title': 'Parte', 'chapter_title': 'Capítulo', 'content': 'Texto'}
+
+def apply_ad_hoc_fixes(json_data, change_log=None, first_part=0):
     """
     Aplica correções ad hoc específicas ao JSON
-    """
-    fixes_applied = 0
-    total_items = 0
     
-    # Lista de correções específicas
-    corrections = {
-        "We must purify ourselves from our natural imper": "We must purify ourselves from our natural imperfections.",
-        "Introduction to the Devout Life.": "",  # Remove duplicate book title from PREFACE
-        "The choice we ought to make as to the practice":"The choice we ought to make as to the practice of the Virtues.",
-        # Adicione mais correções aqui conforme necessário
-        "theChurch": "the Church",
-        "theGospel": "the Gospel", 
-        "beforeGod": "before God",
-        "toGod": "to God",
-        "JesusChrist": "Jesus Christ",
-        # "texto_problemático": "texto_corrigido",
-    }
+    Args:
+        json_data (list): Partes do livro (Book ou lista de Part, alteradas no lugar)
+        change_log (ChangeLog, optional): Log estruturado a completar
+        first_part (int): Índice da primeira parte (leitura parte a parte)
     
-    print("🔧 Aplicando correções ad hoc...")
+    Returns:
+        tuple: (correções aplicadas, itens processados)
+    """
+    log = RuleEngine([AD_HOC_RULES]).apply_book(json_data, first_part=first_part)
     
-    for part in json_data:
-        # Corrigir títulos de partes
-        if 'part_title' in part:
-            total_items += 1
-            original = part['part_title']
-            for wrong, correct in corrections.items():
-                if wrong in original:
-                    part['part_title'] = original.replace(wrong, correct)
-                    fixes_applied += 1
-                    print(f"   ✏️  Parte: '{wrong}' → '{correct}'")
-        
-        # Corrigir capítulos
-        for chapter in part.get('chapters', []):
-            if 'chapter_title' in chapter:
-                total_items += 1
-                original = chapter['chapter_title']
-                for wrong, correct in corrections.items():
-                    if wrong in original:
-                        chapter['chapter_title'] = original.replace(wrong, correct)
-                        fixes_applied += 1
-                        print(f"   ✏️  Capítulo: '{wrong}' → '{correct}'")
-            
-            # Corrigir conteúdo
-            for paragraph in chapter.get('content', []):
-                if 'content' in paragraph:
-                    total_items += 1
-                    original = paragraph['content']
-                    for wrong, correct in corrections.items():
-                        if wrong in original:
-                            paragraph['content'] = original.replace(wrong, correct)
-                            # Recalcular word_count
-                            paragraph['word_count'] = len(paragraph['content'].split())
-                            fixes_applied += 1
-                            print(f"   ✏️  Texto: '{wrong[:50]}...' → '{correct[:50]}...'")
+    for change in log.changes:
+        label = FIELD_LABELS[change['field']]
+        for wrong, correct in change['rules']:
+            if change['field'] == 'content':
+                print(f"   ✏️  {label}: '{wrong[:50]}...' → '{correct[:50]}...'")
+            else:
+                print(f"   ✏️  {label}: '{wrong}' → '{correct}'")
     
-    return fixes_applied, total_items
+    if change_log is not None:
+        change_log.extend(log)
+    return log.corrections, log.items
+
+def fix_book(json_data):
+    """
+    Aplica as correções ad hoc ao livro em memória (usado pelo pipeline em processo)
+    """
+    print("🔧 Aplicando correções ad hoc...")
+    # O motor de regras já atualiza o word_count dos parágrafos alterados
+    fixes_applied, total_items = apply_ad_hoc_fixes(json_data)
+    print(f"   Itens processados: {total_items}, correções aplicadas: {fixes_applied}")
+    return json_data
 
 def main():
     """Função principal"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Correções ad hoc do JSON em inglês")
+    parser.add_argument('--change-log', metavar='ARQUIVO',
+                        help="Grava o log estruturado das alterações neste arquivo JSON")
+    args = parser.parse_args()
+    
     print("🔧 CORREÇÕES AD HOC")
     print("Aplica correções específicas para problemas pontuais")
     print("=" * 60)
@@ -87,44 +80,49 @@ def main():
     shutil.copy2(input_file, backup_file)
     print(f"💾 Backup: {backup_file}")
     
-    # Carregar JSON
+    # Ler, corrigir e gravar parte por parte (streaming, sem carregar o livro inteiro)
     print(f"📖 Carregando: {os.path.basename(input_file)}")
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    fixes_applied = 0
+    total_items = 0
+    change_log = ChangeLog()
     
-    # Aplicar correções
-    fixes_applied, total_items = apply_ad_hoc_fixes(data)
+    print("🔧 Aplicando correções ad hoc...")
+    writer = BookJsonWriter(input_file)
+    writer.open()
+    try:
+        for part_index, part in enumerate(map(Part.from_json, iter_book_parts(input_file))):
+            # Aplicar correções (o word_count só muda nos parágrafos alterados)
+            part_fixes, part_items = apply_ad_hoc_fixes([part], change_log, first_part=part_index)
+            fixes_applied += part_fixes
+            total_items += part_items
+            
+            writer.write_part(part)
+    except Exception:
+        writer.abort()
+        raise
     
     if fixes_applied > 0:
-        # Recompute word_count for every content item as the final step before saving
-        def _recompute_counts(struct):
-            items = 0
-            for part in struct:
-                for ch in part.get('chapters', []):
-                    for it in ch.get('content', []):
-                        if isinstance(it, dict) and 'content' in it:
-                            it['word_count'] = len((it.get('content') or '').split())
-                            items += 1
-            return items
-        
-        recomputed_items = _recompute_counts(data)
-        
         # Salvar
-        with open(input_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        writer.close()
         
         print(f"\n📊 RESULTADO:")
         print(f"   Itens processados: {total_items}")
         print(f"   Correções aplicadas: {fixes_applied}")
-        print(f"   🔢 word_count recalculado em {recomputed_items} itens")
+        print(f"   🔢 word_count atualizado em {change_log.paragraphs_changed} parágrafos alterados")
         print(f"   Arquivo: {input_file}")
         print(f"✅ Correções ad hoc aplicadas com sucesso!")
         
     else:
+        # Nada mudou: mantém o arquivo original intacto
+        writer.abort()
         print(f"\n📊 RESULTADO:")
         print(f"   Itens processados: {total_items}")
         print(f"   ✅ Nenhuma correção necessária")
     
+    if args.change_log:
+        change_log.save(args.change_log)
+        print(f"📝 Log de alterações: {args.change_log}")
+    
     return True
 
 if __name__ == "__main__":
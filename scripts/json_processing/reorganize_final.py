@@ -5,27 +5,21 @@ Estratégia: coletar TODOS os capítulos únicos por conteúdo (não por número
 e mapear sequencialmente conforme o CSV
 """
 
-import json
 import csv
-import re
-import hashlib
+import json
+import os
+import sys
 
-def _recompute_all_word_counts(structure):
-    """Recompute word_count for every content item just before saving."""
-    total = 0
-    for section in structure or []:
-        for ch in section.get('chapters', []) or []:
-            for item in ch.get('content', []) or []:
-                if isinstance(item, dict) and 'content' in item:
-                    text = item.get('content') or ''
-                    item['word_count'] = len(str(text).split())
-                    total += 1
-    return total
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'common'))
+from book_model import Book, Chapter, Part
+from chapter_matching import match_chapters
+from front_matter import BODY, DEDICATORY_PRAYER, PREFACE, TITLE_PAGE, classify_paragraphs, split_front_matter
+from near_duplicates import DEFAULT_THRESHOLD, NearDuplicateIndex, chapter_text
 
-def load_csv_chapters():
+def load_csv_chapters(csv_path='data/summary.csv'):
     """Carrega capítulos do CSV em ordem sequencial"""
     chapters = []
-    with open('data/summary.csv', 'r', encoding='utf-8') as f:
+    with open(csv_path, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
             chapters.append({
@@ -36,40 +30,23 @@ def load_csv_chapters():
     return chapters
 
 def extract_special_sections(data):
-    """Extrai title page, dedicatory prayer e preface da primeira parte"""
-    first_part = data[0]
-    content = first_part['chapters'][0]['content']
-    
-    title_page = []
-    prayer = []
-    preface = []
-    
-    section = 'title'
-    for para in content:
-        text = para.get('content', '')
-        
-        if 'DEDICATORY PRAYER' in text:
-            section = 'prayer_start'
-        elif section == 'prayer_start' and 'O SWEET JESUS' in text:
-            section = 'prayer'
-            prayer.append(para)
-        elif section == 'prayer' and 'St. Francis de Sales' in text:
-            prayer.append(para)
-            section = 'preface_wait'
-        elif section == 'preface_wait' and 'Dear reader' in text:
-            section = 'preface'
-            preface.append(para)
-        elif section == 'title' and 'This is a digital copy' in text:
-            title_page.append(para)
-        elif section == 'prayer':
-            prayer.append(para)
-        elif section == 'preface':
-            preface.append(para)
+    """
+    Extrai title page, dedicatory prayer e preface da primeira parte, pelos
+    parágrafos marcados com section_kind na ingestão (front_matter.py).
+    JSON sem marcação é classificado agora, pelas mesmas regras.
+    """
+    first_chapter = data[0].chapters[0]
+    sections = split_front_matter(first_chapter)
+    if not any(sections.values()):
+        paragraphs = first_chapter.content or []
+        for para, kind in zip(paragraphs, classify_paragraphs(p.content for p in paragraphs)):
+            if kind is not None:
+                sections[kind].append(para)
     
     return {
-        'title_page': title_page,
-        'prayer': prayer,
-        'preface': preface
+        'title_page': sections[TITLE_PAGE],
+        'prayer': sections[DEDICATORY_PRAYER],
+        'preface': sections[PREFACE]
     }
 
 def collect_all_chapters(data):
@@ -77,156 +54,126 @@ def collect_all_chapters(data):
     chapters = []
     
     for part in data:
-        for chapter in part['chapters']:
-            if chapter['chapter_title'] != 'Content':
+        for chapter in part.chapters:
+            if chapter.chapter_title != 'Content':
                 # Pular capítulos vazios - eles causam problemas de alinhamento
-                if not chapter['content'] or len(chapter['content']) == 0:
-                    print(f"⚠️  Pulando capítulo vazio: {chapter['chapter_title']}")
+                if not chapter.content or len(chapter.content) == 0:
+                    print(f"⚠️  Pulando capítulo vazio: {chapter.chapter_title}")
                     continue
                     
-                # Criar hash do conteúdo para identificar duplicatas reais
-                content_str = ""
-                if chapter['content']:
-                    content_str = str(chapter['content'][:2])  # Primeiros 2 parágrafos
-                
-                chapter_hash = hashlib.md5(content_str.encode()).hexdigest()
+                # Chave das duplicatas exatas: tipo e texto dos 2 primeiros parágrafos
+                chapter_key = tuple((paragraph.type, paragraph.content) for paragraph in chapter.content[:2])
                 
                 chapters.append({
-                    'title': chapter['chapter_title'],
-                    'content': chapter['content'],
-                    'hash': chapter_hash
+                    'title': chapter.chapter_title,
+                    'content': chapter.content,
+                    'key': chapter_key
                 })
     
     return chapters
 
-def deduplicate_by_content(chapters):
-    """Remove duplicatas baseado no hash do conteúdo"""
-    seen_hashes = set()
-    unique = []
+def deduplicate_by_content(chapters, similarity=DEFAULT_THRESHOLD, report=None):
+    """
+    Remove duplicatas: exatas (mesmos 2 primeiros parágrafos) e quase
+    duplicatas pelo texto inteiro (MinHash + LSH, ver near_duplicates.py),
+    mantendo a primeira ocorrência de cada grupo.
+
+    Args:
+        chapters (list): Capítulos coletados, em ordem
+        similarity (float): Similaridade de Jaccard mínima das quase duplicatas
+        report (list, optional): Recebe um item por grupo de quase duplicatas removido
+    """
+    seen_keys = set()
+    exact_unique = []
     
     for ch in chapters:
-        if ch['hash'] not in seen_hashes:
-            seen_hashes.add(ch['hash'])
-            unique.append(ch)
-    
-    return unique
+        if ch['key'] not in seen_keys:
+            seen_keys.add(ch['key'])
+            exact_unique.append(ch)
+    
+    index = NearDuplicateIndex(similarity)
+    for position, ch in enumerate(exact_unique):
+        index.add(position, chapter_text(ch))
+    
+    removed = set()
+    for cluster in index.clusters():
+        kept, *dropped = cluster['members']
+        removed.update(dropped)
+        print(f"   🧬 Quase duplicatas de '{(exact_unique[kept]['title'] or '')[:40]}': "
+              f"{len(dropped)} removida(s) (similaridade {', '.join(f'{s:.2f}' for s in cluster['similarity'][1:])})")
+        if report is not None:
+            report.append({'kept': exact_unique[kept]['title'],
+                           'removed': [exact_unique[position]['title'] for position in dropped],
+                           'similarity': cluster['similarity'][1:]})
+    
+    return [ch for position, ch in enumerate(exact_unique) if position not in removed]
 
-def _normalize_label(text: str) -> str:
-    """Normaliza texto para comparação tolerante (minúsculas, sem pontuação extra)."""
-    if text is None:
-        return ""
-    # Remover caracteres invisíveis e normalizar espaços Unicode → espaço normal
-    # Zero-width & NBSP family
-    ZW_CHARS = [
-        '\u200b', '\u200c', '\u200d', '\ufeff',  # zero-width + BOM
-    ]
-    NBSP_CHARS = [
-        '\u00a0', '\u202f', '\u2009', '\u200a'  # non-breaking / narrow / thin spaces
-    ]
-    t = text
-    for ch in ZW_CHARS:
-        t = t.replace(ch, '')
-    for ch in NBSP_CHARS:
-        t = t.replace(ch, ' ')
-    # Normalizar travessões e hífens para espaço
-    t = t.replace('—', ' ').replace('–', ' ').replace('-', ' ')
-    # Lowercase
-    t = t.lower()
-    # Remover pontuação comum mantendo letras/números e espaços
-    t = re.sub(r"[^\w\s]", " ", t, flags=re.UNICODE)
-    # Colapsar espaços
-    t = re.sub(r"\s+", " ", t).strip()
-    return t
+def match_content_to_chapters(json_chapters, csv_chapters, report=None):
+    """
+    Faz a correspondência global entre os títulos do CSV e o conteúdo do JSON
+    (índice invertido das aberturas + atribuição ótima, ver chapter_matching.py).
 
-def match_content_to_chapters(json_chapters, csv_chapters):
-    """Tenta fazer correspondência inteligente entre conteúdo JSON e títulos CSV"""
-    matched_chapters = []
-    
+    Args:
+        json_chapters (list): Capítulos coletados do JSON, em ordem
+        csv_chapters (list): Capítulos do CSV, em ordem
+        report (list, optional): Recebe um item por capítulo do CSV com score e confiança
+
+    Returns:
+        list: Capítulo do JSON atribuído a cada capítulo do CSV (None se não houver)
+    """
     print("🔍 Tentando correspondência inteligente de conteúdo...")
-    
-    for i, csv_ch in enumerate(csv_chapters):
-        best_match = None
-        best_score = 0
-        # Para cada capítulo do CSV, procurar o melhor match no JSON
-        for j, json_ch in enumerate(json_chapters):
-            if not json_ch['content']:
-                continue
-                
-            # Pegar as primeiras palavras do conteúdo para análise
-            first_content = ""
-            if json_ch['content'] and len(json_ch['content']) > 0:
-                first_content = json_ch['content'][0].get('content', '')[:100].lower()
-            # Normalizar conteúdo para tolerar pontuação/espaços
-            first_content_norm = _normalize_label(first_content)
-            
-            # Calcular score de correspondência baseado no título do CSV
+    results = match_chapters([csv_ch['title'] for csv_ch in csv_chapters], json_chapters)
 
-            csv_title_norm = _normalize_label(csv_ch['title'])
-            csv_title_words = csv_title_norm.split()[:4]  # Primeiras 3-4 palavras após normalização
-            score = 0
-            
-            for word in csv_title_words:
-                if len(word) > 3 and word in first_content_norm:  # Palavras com mais de 3 caracteres
-                    score += 1
-            
-            # Bonus se o título está no início do conteúdo
-            if csv_title_norm[:20] in first_content_norm:
-                score += 2
-                
-            if score > best_score:
-                best_score = score
-                best_match = json_ch
-        
-        if best_match:
-            matched_chapters.append(best_match)
-            # Remover da lista para evitar reutilização
-            json_chapters = [ch for ch in json_chapters if ch != best_match]
-            print(f"   ✅ {csv_ch['title'][:40]}... → Match encontrado (score: {best_score})")
-        elif json_chapters:
-            # Se não encontrou match, usar o próximo disponível
-            matched_chapters.append(json_chapters[0])
-            json_chapters = json_chapters[1:]
-            print(f"   ⚠️  {csv_ch['title'][:40]}... → Usando próximo disponível (sem match)")
+    matched_chapters = []
+    for csv_ch, result in zip(csv_chapters, results):
+        label = f"{csv_ch['title'][:40]}..."
+        if result['chapter'] is None:
+            matched_chapters.append(None)
+            print(f"   ❌ {label} → Sem conteúdo disponível")
+        elif result['score'] == 0:
+            matched_chapters.append(json_chapters[result['chapter']])
+            print(f"   ⚠️  {label} → Atribuído pela ordem do livro (sem match)")
         else:
-            print(f"   ❌ {csv_ch['title'][:40]}... → Sem conteúdo disponível")
-    
+            matched_chapters.append(json_chapters[result['chapter']])
+            ambiguous = " ⚠️  ambíguo" if result['ambiguous'] else ""
+            print(f"   ✅ {label} → Match encontrado (score: {result['score']}/{result['max_score']}, "
+                  f"confiança: {result['confidence']:.0%}){ambiguous}")
+        if report is not None:
+            report.append({'part': csv_ch['part'], 'chapter': csv_ch['chapter'], 'title': csv_ch['title'],
+                           'json_chapter': result['chapter'], 'score': result['score'],
+                           'max_score': result['max_score'], 'confidence': round(result['confidence'], 3),
+                           'runner_up': result['runner_up'], 'ambiguous': result['ambiguous']})
+
+    confidences = [result['confidence'] for result in results if result['chapter'] is not None]
+    if confidences:
+        print(f"   📈 Confiança média: {sum(confidences) / len(confidences):.0%} — "
+              f"{sum(1 for result in results if result['ambiguous'])} ambíguos, "
+              f"{sum(1 for result in results if result['chapter'] is not None and result['score'] == 0)} sem match")
     return matched_chapters
 
-def create_organized_structure(csv_chapters, json_chapters, special_sections):
+def create_organized_structure(csv_chapters, json_chapters, special_sections, match_report=None):
     """Cria a estrutura final organizada"""
     
     # Começar com seções especiais
-    structure = []
+    structure = Book()
     
     # 1. Title Page
     if special_sections['title_page']:
-        structure.append({
-            'part_title': 'TITLE PAGE',
-            'chapters': [{
-                'chapter_title': 'TITLE PAGE',
-                'content': special_sections['title_page']
-            }]
-        })
+        structure.append(Part(part_title='TITLE PAGE', section_kind=TITLE_PAGE, chapters=[
+            Chapter(chapter_title='TITLE PAGE', content=special_sections['title_page'])
+        ]))
     
     # 2. Dedicatory Prayer  
     if special_sections['prayer']:
-        structure.append({
-            'part_title': 'DEDICATORY PRAYER',
-            'chapters': [{
-                'chapter_title': 'DEDICATORY PRAYER',
-                'content': special_sections['prayer']
-            }]
-        })
+        structure.append(Part(part_title='DEDICATORY PRAYER', section_kind=DEDICATORY_PRAYER, chapters=[
+            Chapter(chapter_title='DEDICATORY PRAYER', content=special_sections['prayer'])
+        ]))
     
     # 3. Preface
     if special_sections['preface']:
-        structure.append({
-            'part_title': 'PREFACE',
-            'chapters': [{
-                'chapter_title': 'PREFACE',
-                'content': special_sections['preface']
-            }]
-        })
+        structure.append(Part(part_title='PREFACE', section_kind=PREFACE, chapters=[
+            Chapter(chapter_title='PREFACE', content=special_sections['preface'])
+        ]))
     
     # 4. Organizar capítulos por partes com correspondência inteligente
     part_titles = {
@@ -240,43 +187,35 @@ def create_organized_structure(csv_chapters, json_chapters, special_sections):
     parts = {'I': [], 'II': [], 'III': [], 'IV': [], 'V': []}
     
     # Fazer correspondência inteligente entre conteúdo e capítulos
-    matched_chapters = match_content_to_chapters(json_chapters.copy(), csv_chapters)
+    matched_chapters = match_content_to_chapters(json_chapters, csv_chapters, match_report)
     
     # Mapear capítulos matched aos capítulos do CSV
-    for i, csv_ch in enumerate(csv_chapters):
-        if i < len(matched_chapters):
-            json_ch = matched_chapters[i]
-            
-            new_chapter = {
-                'chapter_title': f"CHAPTER {csv_ch['chapter']}. {csv_ch['title']}",
-                'content': json_ch['content']
-            }
+    for csv_ch, json_ch in zip(csv_chapters, matched_chapters):
+        if json_ch is not None:
+            new_chapter = Chapter(chapter_title=f"CHAPTER {csv_ch['chapter']}. {csv_ch['title']}",
+                                  content=json_ch['content'])
             
             parts[csv_ch['part']].append(new_chapter)
     
     # Adicionar partes que têm capítulos
     for part_key in ['I', 'II', 'III', 'IV', 'V']:
         if parts[part_key]:
-            structure.append({
-                'part_title': part_titles[part_key],
-                'chapters': parts[part_key]
-            })
+            structure.append(Part(part_title=part_titles[part_key], section_kind=BODY,
+                                  chapters=parts[part_key]))
     
     return structure, parts
 
-def main():
-    print("🔄 Reorganização final do JSON...")
-    
-    # Backup
-    import shutil
-    shutil.copy2('output/livro_en.json', 'output/livro_en_original.json')
-    
-    # Carregar dados
-    print("📖 Carregando dados...")
-    csv_chapters = load_csv_chapters()
-    
-    with open('output/livro_en.json', 'r', encoding='utf-8') as f:
-        json_data = json.load(f)
+def reorganize_book(json_data, csv_chapters=None, match_report=None, similarity=DEFAULT_THRESHOLD,
+                    duplicates_report=None):
+    """
+    Reorganiza o livro em memória conforme o summary.csv e devolve a nova
+    estrutura (usado pelo main() e pelo pipeline em processo).
+    match_report (lista), se passado, recebe a confiança de cada capítulo;
+    duplicates_report, os grupos de quase duplicatas removidos (com
+    similaridade de Jaccard mínima similarity).
+    """
+    if csv_chapters is None:
+        csv_chapters = load_csv_chapters()
     
     # Extrair seções especiais
     print("✂️  Extraindo seções especiais...")
@@ -289,16 +228,17 @@ def main():
     
     # Remover duplicatas
     print("🧹 Removendo duplicatas...")
-    unique_chapters = deduplicate_by_content(all_chapters)
+    unique_chapters = deduplicate_by_content(all_chapters, similarity, duplicates_report)
     print(f"   Capítulos únicos: {len(unique_chapters)}")
     
     # Criar estrutura organizada
     print("🏗️  Organizando estrutura...")
-    final_structure, parts_stats = create_organized_structure(csv_chapters, unique_chapters, special_sections)
+    final_structure, parts_stats = create_organized_structure(csv_chapters, unique_chapters, special_sections,
+                                                               match_report)
     
     # Remover TITLE PAGE da estrutura final antes de salvar
     print("�️  Removendo TITLE PAGE...")
-    final_structure = [section for section in final_structure if section.get('part_title') != 'TITLE PAGE']
+    final_structure = Book(section for section in final_structure if section.section_kind != TITLE_PAGE)
     print(f"   TITLE PAGE removida. Seções restantes: {len(final_structure)}")
     
     # Limpar duplicação de chapter label no primeiro parágrafo
@@ -309,19 +249,54 @@ def main():
     for part in ['I', 'II', 'III', 'IV', 'V']:
         print(f"   Parte {part}: {len(parts_stats[part])} capítulos")
     
+    # Os parágrafos são só reagrupados, sem alterar o texto: o word_count vem pronto
+    return final_structure
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Reorganização do JSON conforme o summary.csv")
+    parser.add_argument('--match-report', metavar='ARQUIVO',
+                        help="Grava em JSON o score e a confiança da correspondência de cada capítulo")
+    parser.add_argument('--similarity', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Similaridade mínima das quase duplicatas removidas (padrão: {DEFAULT_THRESHOLD})")
+    parser.add_argument('--duplicates-report', metavar='ARQUIVO',
+                        help="Grava em JSON os grupos de quase duplicatas removidos")
+    args = parser.parse_args()
+
+    print("🔄 Reorganização final do JSON...")
+    
+    # Backup
+    import shutil
+    shutil.copy2('output/livro_en.json', 'output/livro_en_original.json')
+    
+    # Carregar dados
+    print("📖 Carregando dados...")
+    csv_chapters = load_csv_chapters()
+    
+    json_data = Book.load('output/livro_en.json')
+    
+    match_report = [] if args.match_report else None
+    duplicates_report = [] if args.duplicates_report else None
+    final_structure = reorganize_book(json_data, csv_chapters, match_report, args.similarity, duplicates_report)
+    
     # Salvar
     print("💾 Salvando...")
-    # Recompute word counts as the final step before saving
-    recomputed = _recompute_all_word_counts(final_structure)
-    print(f"   🔢 word_count recalculado em {recomputed} itens")
-    with open('output/livro_en.json', 'w', encoding='utf-8') as f:
-        json.dump(final_structure, f, indent=2, ensure_ascii=False)
+    final_structure.save('output/livro_en.json')
+    if match_report is not None:
+        with open(args.match_report, 'w', encoding='utf-8') as f:
+            json.dump(match_report, f, indent=2, ensure_ascii=False)
+        print(f"📝 Confiança por capítulo: {args.match_report}")
+    if duplicates_report is not None:
+        with open(args.duplicates_report, 'w', encoding='utf-8') as f:
+            json.dump(duplicates_report, f, indent=2, ensure_ascii=False)
+        print(f"📝 Quase duplicatas: {args.duplicates_report}")
     
     print("✅ Concluído!")
     print(f"   Total de seções: {len(final_structure)}")
     for i, section in enumerate(final_structure):
-        title = section['part_title'][:50] + "..." if len(section['part_title']) > 50 else section['part_title']
-        print(f"   {i+1}. {title} ({len(section['chapters'])} capítulos)")
+        title = section.part_title[:50] + "..." if len(section.part_title) > 50 else section.part_title
+        print(f"   {i+1}. {title} ({len(section.chapters)} capítulos)")
 
 if __name__ == "__main__":
     main()
@@ -6,9 +6,12 @@ Divide part_title em part_title e part_subtitle usando o primeiro '-' como separ
 Aplica transformações específicas para numeração e capitalização.
 """
 
-import json
 import os
 import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'common'))
+from book_model import Book, Part
 
 def split_part_titles(json_file_path):
     """
@@ -22,57 +25,18 @@ def split_part_titles(json_file_path):
     backup_path = json_file_path.replace('.json', '_backup_split_titles.json')
     
     try:
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = Book.load(json_file_path)
         
         # Fazer backup
-        with open(backup_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        data.save(backup_path)
         print(f"💾 Backup: {backup_path}")
         
         print(f"📖 Carregando: {os.path.basename(json_file_path)}")
         
-        modificacoes = 0
-        
-        # Processar cada parte
-        for i, part in enumerate(data):
-            original_part_title = part.get('part_title', '')
-            
-            # Pular DEDICATORY PRAYER e PREFACE (não têm hífen)
-            if '-' not in original_part_title:
-                continue
-            
-            # Dividir no primeiro hífen
-            parts = original_part_title.split('-', 1)
-            if len(parts) != 2:
-                continue
-                
-            raw_part_title = parts[0].strip()
-            raw_part_subtitle = parts[1].strip()
-            
-            # Transformar part_title
-            part_title = raw_part_title
-            part_title = part_title.replace("THE FIRST", "I")
-            part_title = part_title.replace("THE SECOND", "II")
-            part_title = part_title.replace("THE THIRD", "III")
-            part_title = part_title.replace("THE FOURTH", "IV")
-            part_title = part_title.replace("THE FIFTH", "V")
-            
-            # Transformar part_subtitle
-            part_subtitle = capitalize_subtitle(raw_part_subtitle)
-            
-            # Atualizar o objeto com ordem correta
-            data[i] = reorder_part_object(part, part_title, part_subtitle)
-            
-            print(f"   ✏️  '{original_part_title}' →")
-            print(f"       part_title: '{part_title}'")
-            print(f"       part_subtitle: '{part_subtitle}'")
-            
-            modificacoes += 1
+        modificacoes = split_book_part_titles(data)
         
         # Salvar resultado
-        with open(json_file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        data.save(json_file_path)
         
         print(f"\n📊 RESULTADO:")
         print(f"   Modificações aplicadas: {modificacoes}")
@@ -85,26 +49,71 @@ def split_part_titles(json_file_path):
         print(f"❌ Erro: {str(e)}")
         return False
 
+def split_book_part_titles(data):
+    """
+    Divide part_title em part_title e part_subtitle no livro em memória.
+    Devolve o número de partes modificadas.
+    """
+    modificacoes = 0
+    
+    # Processar cada parte
+    for i, part in enumerate(data):
+        original_part_title = part.part_title or ''
+        
+        # Pular DEDICATORY PRAYER e PREFACE (não têm hífen)
+        if '-' not in original_part_title:
+            continue
+        
+        # Dividir no primeiro hífen
+        parts = original_part_title.split('-', 1)
+        if len(parts) != 2:
+            continue
+            
+        raw_part_title = parts[0].strip()
+        raw_part_subtitle = parts[1].strip()
+        
+        # Transformar part_title
+        part_title = raw_part_title
+        part_title = part_title.replace("THE FIRST", "I")
+        part_title = part_title.replace("THE SECOND", "II")
+        part_title = part_title.replace("THE THIRD", "III")
+        part_title = part_title.replace("THE FOURTH", "IV")
+        part_title = part_title.replace("THE FIFTH", "V")
+        
+        # Transformar part_subtitle
+        part_subtitle = capitalize_subtitle(raw_part_subtitle)
+        
+        # Atualizar o objeto com ordem correta
+        data[i] = reorder_part_object(part, part_title, part_subtitle)
+        
+        print(f"   ✏️  '{original_part_title}' →")
+        print(f"       part_title: '{part_title}'")
+        print(f"       part_subtitle: '{part_subtitle}'")
+        
+        modificacoes += 1
+    
+    return modificacoes
+
 def reorder_part_object(part, new_part_title=None, new_part_subtitle=None):
     """
     Reorganiza um objeto part com a ordem: part_title, part_subtitle, chapters
     """
-    ordered_part = {}
+    ordered_part = Part()
     
     # Definir part_title (usar novo valor se fornecido)
     if new_part_title is not None:
-        ordered_part['part_title'] = new_part_title
+        ordered_part.part_title = new_part_title
     else:
-        ordered_part['part_title'] = part.get('part_title', '')
+        ordered_part.part_title = part.part_title or ''
     
     # Definir part_subtitle (usar novo valor se fornecido)
     if new_part_subtitle is not None:
-        ordered_part['part_subtitle'] = new_part_subtitle
+        ordered_part.part_subtitle = new_part_subtitle
     elif 'part_subtitle' in part:
-        ordered_part['part_subtitle'] = part['part_subtitle']
+        ordered_part.part_subtitle = part.part_subtitle
     
     # Definir chapters
-    ordered_part['chapters'] = part.get('chapters', [])
+    ordered_part.chapters = part.chapters if part.chapters is not None else []
     
     # Preservar outras chaves se existirem
     for key, value in part.items():
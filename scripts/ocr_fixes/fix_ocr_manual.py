@@ -1,6 +1,11 @@
-import json
-import re
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'common'))
+from book_model import Book, Paragraph, Part
+from rule_engine import ChangeLog, RuleEngine, load_rule_set
+from word_counts import set_content
+from word_segmenter import WordFrequencyIndex, WordSegmenter
 
 # === Funções utilitárias para limpeza de duplicação de título de capítulo ===
 def _normalize_label(text: str) -> str:
@@ -31,8 +36,8 @@ def clean_repeated_chapter_title(structure):
     trimmed = 0
     title_re = _re.compile(r"^\s*CHAPTER\s+([IVXLCDM]+)\.\s*(.+)$", _re.IGNORECASE)
     for section in structure:
-        for ch in section.get('chapters', []):
-            title = ch.get('chapter_title', '') or ''
+        for ch in section.chapters or []:
+            title = ch.chapter_title or ''
             m = title_re.match(title)
             if not m:
                 continue
@@ -40,16 +45,16 @@ def clean_repeated_chapter_title(structure):
             if not label:
                 continue
             norm_label = _normalize_label(label)
-            content_list = ch.get('content', []) or []
+            content_list = ch.content or []
             p_index = None
             for idx, item in enumerate(content_list):
-                if isinstance(item, dict) and item.get('type') == 'p' and item.get('content'):
+                if isinstance(item, Paragraph) and item.type == 'p' and item.content:
                     p_index = idx
                     break
             if p_index is None:
                 continue
             para = content_list[p_index]
-            para_text = para.get('content', '') or ''
+            para_text = para.content or ''
             if not para_text.strip():
                 continue
             norm_para = _normalize_label(para_text)
@@ -65,9 +70,7 @@ def clean_repeated_chapter_title(structure):
                     content_list.pop(p_index)
                     removed += 1
                 else:
-                    para['content'] = rest
-                    if 'word_count' in para:
-                        para['word_count'] = len(rest.split())
+                    set_content(para, rest)
                     trimmed += 1
                 continue
             if norm_para.startswith(norm_label + " ") or norm_para.startswith(norm_label + ":"):
@@ -83,12 +86,24 @@ def clean_repeated_chapter_title(structure):
                     content_list.pop(p_index)
                     removed += 1
                 else:
-                    para['content'] = rest
-                    if 'word_count' in para:
-                        para['word_count'] = len(rest.split())
+                    set_content(para, rest)
                     trimmed += 1
     return removed, trimmed
 
+# Palavras que indicam continuação quando em maiúscula
+CONTINUATION_WORDS = {
+    'And', 'But', 'For', 'Or', 'Nor', 'So', 'Yet', 'However', 'Therefore',
+    'Thus', 'Hence', 'Moreover', 'Furthermore', 'Nevertheless', 'Nonetheless',
+    'Another', 'Others', 'These', 'Those', 'Such', 'Many', 'Some', 'All',
+    'Both', 'Either', 'Neither', 'Each', 'Every', 'Any', 'No', 'None'
+}
+
+# Palavras que, no fim de um parágrafo, indicam quebra no meio da frase
+MID_SENTENCE_ENDINGS = {
+    'though', 'although', 'while', 'when', 'where', 'which', 'that', 'who', 'whom', 'whose',
+    'if', 'unless', 'until', 'since', 'because', 'as', 'before', 'after'
+}
+
 def is_paragraph_continuation(text1, text2):
     """
     Detecta se o segundo parágrafo é uma continuação do primeiro.
@@ -101,55 +116,57 @@ def is_paragraph_continuation(text1, text2):
     if not text1 or not text2:
         return False
     
-    text1 = text1.strip()
+    words1 = text1.split()
+    if not words1:
+        return False
+    
+    return _continues_after(len(words1), words1[-1][-1], words1[-1].lower(), text2)
+
+def _continues_after(word_count1, last_char1, last_word1, text2):
+    """
+    Critérios de is_paragraph_continuation a partir do que importa do primeiro
+    parágrafo: número de palavras, último caractere e última palavra (minúscula).
+    Permite testar uma sequência já mesclada sem montar o texto concatenado.
+    """
+    if not text2:
+        return False
+    
     text2 = text2.strip()
     
     # Verifica se o primeiro parágrafo é muito curto (provável título)
     # Mas permite exceções se há indicadores claros de continuação
-    words1 = text1.split()
-    if len(words1) < 4:  # Muito curto mesmo
+    if word_count1 < 4:  # Muito curto mesmo
         return False
-    elif len(words1) < 8:  # Curto, mas verifica indicadores de continuação
+    elif word_count1 < 8:  # Curto, mas verifica indicadores de continuação
         # Se começa com minúscula ou termina com palavra mid-sentence, pode ser continuação
         if text2 and text2[0].islower():
             pass  # Continua verificação
-        elif words1 and words1[-1].lower() in ['though', 'although', 'while', 'when', 'where', 'which', 'that', 'who', 'whom', 'whose', 'if', 'unless', 'until', 'since', 'because', 'as', 'before', 'after']:
+        elif last_word1 in MID_SENTENCE_ENDINGS:
             pass  # Continua verificação
         else:
             return False  # Muito curto sem indicadores de continuação
     
     # Verifica se o primeiro parágrafo termina sem pontuação final
-    if text1[-1] in '.!?:':
+    if last_char1 in '.!?:':
         return False
     
     # Verifica se o segundo parágrafo começa com minúscula (indicação de continuação)
     if text2[0].islower():
         return True
     
-    # Palavras que indicam continuação quando em maiúscula
-    continuation_words = {
-        'And', 'But', 'For', 'Or', 'Nor', 'So', 'Yet', 'However', 'Therefore',
-        'Thus', 'Hence', 'Moreover', 'Furthermore', 'Nevertheless', 'Nonetheless',
-        'Another', 'Others', 'These', 'Those', 'Such', 'Many', 'Some', 'All',
-        'Both', 'Either', 'Neither', 'Each', 'Every', 'Any', 'No', 'None'
-    }
-    
     first_word = text2.split()[0] if text2.split() else ""
     
     # Se começa com palavra de continuação, provavelmente é continuação
-    if first_word in continuation_words:
+    if first_word in CONTINUATION_WORDS:
         return True
     
     # Verifica se termina com vírgula, ponto e vírgula, ou outros indicadores de continuação
-    if text1[-1] in ',;-':
+    if last_char1 in ',;-':
         return True
     
     # Verifica padrões específicos de quebra mid-sentence
     # Como no exemplo: "though he" seguido de "immediately afterwards"
-    mid_sentence_endings = ['though', 'although', 'while', 'when', 'where', 'which', 'that', 'who', 'whom', 'whose', 'if', 'unless', 'until', 'since', 'because', 'as', 'before', 'after']
-    last_word = text1.split()[-1].lower() if text1.split() else ""
-    
-    if last_word in mid_sentence_endings:
+    if last_word1 in MID_SENTENCE_ENDINGS:
         return True
     
     return False
@@ -158,6 +175,13 @@ def merge_broken_paragraphs(chapters):
     """
     Mescla parágrafos que foram quebrados incorretamente pelo OCR.
     Retorna número de mesclagens realizadas.
+    
+    Uma única passada por capítulo: cada sequência de parágrafos que continuam
+    o anterior é acumulada em uma lista de textos e unida uma vez só, com o
+    word_count calculado uma vez por parágrafo mesclado. O critério de
+    is_paragraph_continuation só ganha condições atendidas quando o primeiro
+    parágrafo cresce, então o resultado é o mesmo da mesclagem de trás para
+    frente com content.pop() usada antes.
     """
     merges_count = 0
     
@@ -165,271 +189,314 @@ def merge_broken_paragraphs(chapters):
         if 'content' not in chapter:
             continue
             
-        content = chapter['content']
+        content = chapter.content
         if len(content) < 2:
             continue
         
-        # Processar de trás para frente para não afetar índices
-        i = len(content) - 1
-        while i > 0:
-            # Ajustar i caso a lista tenha encolhido (por remoção anterior)
-            if i >= len(content):
-                i = len(content) - 1
-                if i <= 0:
-                    break
-            if i - 1 < 0:
-                break
-                
-            current = content[i]
-            previous = content[i-1]
-            
+        merged_content = []
+        head = None          # Parágrafo que recebe a sequência atual
+        pieces = []          # Textos da sequência (unidos no fechamento)
+        word_count = 0
+        last_char = last_word = ''
+        chapter_merges = 0
+        
+        for item in content:
             # Apenas processar parágrafos de texto
-            if (current.get('type') == 'p' and previous.get('type') == 'p' and 
-                'content' in current and 'content' in previous):
-                
-                prev_text = previous['content']
-                curr_text = current['content']
-                
-                if is_paragraph_continuation(prev_text, curr_text):
-                    # Mesclar os parágrafos
-                    merged_text = prev_text + " " + curr_text
-                    previous['content'] = merged_text
-                    previous['word_count'] = len(merged_text.split())
-                    
-                    # Remover o parágrafo atual
-                    content.pop(i)
-                    merges_count += 1
-                    
-                    # Continue verificando a mesma posição i (agora apontando para o próximo elemento)
-                    # Se removemos o último elemento, o ajuste de i no topo do laço cuidará do limite
-                    continue
+            is_text = item.type == 'p' and 'content' in item
+            text = item.content if is_text else None
             
-            i -= 1
+            if head is not None and is_text and _continues_after(word_count, last_char, last_word, text):
+                words = text.split()
+                pieces.append(text)
+                word_count += len(words)
+                last_char, last_word = words[-1][-1], words[-1].lower()
+                chapter_merges += 1
+                continue
+            
+            if head is not None and len(pieces) > 1:
+                set_content(head, " ".join(pieces), word_count)
+            merged_content.append(item)
+            
+            head = None
+            if is_text and text:
+                words = text.split()
+                if words:
+                    head = item
+                    pieces = [text]
+                    word_count = len(words)
+                    last_char, last_word = words[-1][-1], words[-1].lower()
+        
+        if head is not None and len(pieces) > 1:
+            set_content(head, " ".join(pieces), word_count)
+        
+        if chapter_merges:
+            content[:] = merged_content
+            merges_count += chapter_merges
     
     return merges_count
 
-def fix_ocr_manual_only(text):
+# APENAS correções manuais específicas e verificadas, em data/rules/ocr_en.json
+# (aplicadas na ordem do arquivo)
+OCR_RULES = load_rule_set('ocr_en')
+MANUAL_FIXES = OCR_RULES.rules
+
+# Palavras válidas que a separação automática não deve quebrar
+# (decompõem-se em palavras que também aparecem lado a lado no livro)
+PROTECTED_WORDS = {
+    'everyday',   # "amidst her everyday affairs"
+    'vainglory',
+}
+
+# Motor de regras compilado uma única vez: todas as correções em uma passada por texto
+OCR_ENGINE = RuleEngine([OCR_RULES])
+
+def fix_ocr_manual_only(text, pattern_hits=None):
     """
     Corrige APENAS problemas de OCR através de correções manuais específicas.
-    NÃO aplica nenhuma regex automática que possa quebrar palavras válidas.
-    """
-    # APENAS correções manuais específicas e verificadas
-    manual_fixes = {
-        # Problemas reais de concatenação religiosa
-        'beforeGod': 'before God',
-        'toGod': 'to God', 
-        'ofGod': 'of God',
-        'withGod': 'with God',
-        'fromGod': 'from God',
-        'forGod': 'for God',
-        'inGod': 'in God',
-        'ourLord': 'our Lord',
-        'ourSaviour': 'our Saviour',
-        'ourSavior': 'our Savior',
-        'JesusChrist': 'Jesus Christ',
-        'HolyGhost': 'Holy Ghost',
-        'HolySpirit': 'Holy Spirit',
-        'BlessedVirgin': 'Blessed Virgin',
-        'DivineMajesty': 'Divine Majesty',
-        'DivineGoodness': 'Divine Goodness',
-        
-        # Problemas de vida espiritual
-        'eternallife': 'eternal life',
-        'spirituallife': 'spiritual life', 
-        'devoutlife': 'devout life',
-        
-        # Problemas comuns de OCR
-        'morethan': 'more than',
-        'lessthan': 'less than',
-        'ratherthan': 'rather than',
-        'otherthan': 'other than',
-        'everday': 'every day',
-        'somethimes': 'sometimes',
-        'sometmes': 'sometimes',
-        
-        # Igreja e textos sagrados
-        'theChurch': 'the Church',
-        'theGospel': 'the Gospel',
-        'theBible': 'the Bible',
-        'theScripture': 'the Scripture',
-        'theScriptures': 'the Scriptures',
-        'theSacrament': 'the Sacrament',
-        'theSacraments': 'the Sacraments',
-        
-        # Preposições grudadas
-        'prayerto': 'prayer to',
-        'devotedto': 'devoted to',
-        'unitedto': 'united to',
-        'attachedto': 'attached to',
-        'subjectedto': 'subjected to',
-        'dedicatedto': 'dedicated to',
-        
-        # Palavras latinas
-        'PaterNoster': 'Pater Noster',
-        'AveMaria': 'Ave Maria',
-        'TeDeumLaudamus': 'Te Deum Laudamus',
-        'VeniCreator': 'Veni Creator',
-        
-        # Problemas de pontuação
-        '.—': '. —',
-        ',—': ', —',
-        ';—': '; —',
-        ':—': ': —',
-        
-        # Capítulos - APENAS quando são realmente grudados
-        'ChapterI': 'Chapter I',
-        'ChapterII': 'Chapter II', 
-        'ChapterIII': 'Chapter III',
-        'ChapterIV': 'Chapter IV',
-        'ChapterV': 'Chapter V',
-        'ChapterVI': 'Chapter VI',
-        'ChapterVII': 'Chapter VII',
-        'ChapterVIII': 'Chapter VIII',
-        'ChapterIX': 'Chapter IX',
-        'ChapterX': 'Chapter X',
+    NÃO aplica nenhuma regex automática que possa quebrar palavras válidas; a
+    separação de palavras grudadas é feita depois, no livro inteiro, por
+    segment_book_words.
+    
+    Args:
+        text (str): Texto a corrigir
+        pattern_hits (dict, optional): Acumula, por padrão, quantos textos ele corrigiu
         
-        # Problemas específicos encontrados no texto
-        'andCredoin': 'and Credo in',
-        'MeeknesstowardsOurselves': 'Meekness towards Ourselves',
-        'plantsoftheChurch': 'plants of the Church',
-        'loveofthe': 'love of the',
-        'loveof': 'love of',
-        'fearof': 'fear of',
-        'desireof': 'desire of',
-        'hopeof': 'hope of',
-        'faithin': 'faith in',
-        'trustin': 'trust in',
-        'believein': 'believe in',
-        'confidencein': 'confidence in',
-    }
+    Returns:
+        tuple: (texto corrigido, número de padrões aplicados)
+    """
+    # Aplicar APENAS as correções manuais (uma passada, mesma semântica de str.replace em ordem)
+    # NENHUMA regex automática! Textos alterados só têm os espaços duplos limpos
+    fixed_text, patterns = OCR_RULES.apply(text)
+    if pattern_hits is not None:
+        for pattern in patterns:
+            pattern_hits[pattern] = pattern_hits.get(pattern, 0) + 1
     
-    # Aplicar APENAS as correções manuais
-    fixed_text = text
-    changes = 0
+    return fixed_text.strip(), len(patterns)
+
+# Exemplos de correção exibidos no log (o contador é global, na ordem do livro)
+MAX_EXAMPLES = 8
+
+def fix_chapter_manual_only(chapter):
+    """
+    Mescla parágrafos quebrados, remove o título repetido e aplica as correções
+    manuais a um capítulo. Os capítulos são independentes entre si, então a
+    mesma função atende o modo serial e os workers do modo em shards.
     
-    for wrong, correct in manual_fixes.items():
-        if wrong in fixed_text:
-            # Usar replace simples, não regex
-            before = fixed_text
-            fixed_text = fixed_text.replace(wrong, correct)
-            if before != fixed_text:
-                changes += 1
+    Returns:
+        dict: chapter (o capítulo corrigido), merges_count, removed, trimmed,
+            change_log (ChangeLog das correções manuais, com location relativa
+            ao capítulo) e examples ((limite do contador, linha do log) na
+            ordem do capítulo)
+    """
+    merges_count = merge_broken_paragraphs([chapter])
+    removed, trimmed = clean_repeated_chapter_title([Part(chapters=[chapter])])
     
-    # NENHUMA regex automática! Apenas limpar espaços duplos
-    fixed_text = re.sub(r'  +', ' ', fixed_text)
+    log = OCR_ENGINE.apply_chapter(chapter)
+    examples = []
+    for change in log.changes[:MAX_EXAMPLES]:
+        if change['field'] == 'chapter_title':
+            examples.append((5, f"✏️  Cap: '{change['original']}' → '{change['corrected']}'"))
+        else:
+            examples.append((8, f"✏️  Texto: '{change['original'][:50]}...' → '{change['corrected'][:50]}...'"))
     
-    return fixed_text.strip(), changes
+    return {
+        'chapter': chapter,
+        'merges_count': merges_count,
+        'removed': removed,
+        'trimmed': trimmed,
+        'change_log': log,
+        'examples': examples,
+    }
 
-def fix_json_manual_only(input_file, output_file=None):
+def _fix_chapters_parallel(chapters, workers):
     """
-    Aplica correções APENAS manuais ao JSON e mescla parágrafos quebrados
+    Distribui os capítulos em um ProcessPoolExecutor.
+    Os resultados voltam na ordem dos capítulos.
     """
-    if output_file is None:
-        output_file = input_file
+    from concurrent.futures import ProcessPoolExecutor
     
-    # Backup
-    if output_file == input_file:
-        backup_file = input_file.replace('.json', '_backup_manual.json')
-        if os.path.exists(input_file):
-            import shutil
-            shutil.copy2(input_file, backup_file)
-            print(f"💾 Backup: {backup_file}")
+    chunksize = max(1, len(chapters) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(fix_chapter_manual_only, chapters, chunksize=chunksize))
+
+def fix_book_manual_only(data, workers=1):
+    """
+    Mescla parágrafos quebrados, aplica as correções manuais de OCR e separa
+    as palavras grudadas (segment_book_words, com as frequências do próprio
+    livro) no livro em memória (usado por fix_json_manual_only e pelo
+    pipeline em processo).
     
-    # Carregar JSON
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    Args:
+        data (Book): Partes do livro (alteradas no lugar)
+        workers (int): Processos para os capítulos (1 = serial). Os capítulos
+            corrigidos são remontados na ordem original e as estatísticas e o
+            log de exemplos são os mesmos do modo serial.
     
-    # ETAPA 1: Mesclar parágrafos quebrados ANTES das correções de OCR
+    Returns:
+        dict: Estatísticas (merges_count, total_items, total_corrections,
+            pattern_hits — textos corrigidos por padrão; a soma é total_corrections,
+            segmented_words — palavras grudadas separadas, change_log — ChangeLog
+            das correções manuais)
+    """
+    chapters = [chapter for part in data for chapter in part.chapters or []]
+    
+    # ETAPAS 1, 1.5 e 2 por capítulo: mesclagem, título repetido e correções manuais
+    if workers > 1 and len(chapters) > 1:
+        print(f"⚙️  Correção em shards: {len(chapters)} capítulos em {workers} processos")
+        results = _fix_chapters_parallel(chapters, workers)
+        # Remontar o livro com os capítulos devolvidos pelos workers, na ordem original
+        result_iter = iter(results)
+        for part in data:
+            if part.chapters:
+                part.chapters = [next(result_iter)['chapter'] for _ in part.chapters]
+    else:
+        results = [fix_chapter_manual_only(chapter) for chapter in chapters]
+    
+    merges_count = sum(result['merges_count'] for result in results)
     print("🔗 Mesclando parágrafos quebrados...")
-    all_chapters = []
-    for part in data:
-        all_chapters.extend(part.get('chapters', []))
-    merges_count = merge_broken_paragraphs(all_chapters)
     if merges_count > 0:
         print(f"   ✅ {merges_count} parágrafos mesclados")
     else:
         print("   ℹ️ Nenhum parágrafo quebrado detectado")
-
-    # ETAPA 1.5: Remover duplicação de título de capítulo após mesclagem
-    removed, trimmed = clean_repeated_chapter_title(data)
+    
+    removed = sum(result['removed'] for result in results)
+    trimmed = sum(result['trimmed'] for result in results)
     print(f"🧼 clean_repeated_chapter_title: Removidos: {removed}, Ajustados: {trimmed}")
     
-    # ETAPA 2: Correções manuais de OCR
+    # Títulos de partes e agregação na ordem do livro
     print("🔧 Aplicando correções manuais de OCR...")
-    total_corrections = 0
-    total_items = 0
     examples_shown = 0
+    change_log = ChangeLog()
     
-    # Processar dados
-    for part in data:
+    result_iter = iter(results)
+    for part_index, part in enumerate(data):
         # Títulos de partes
-        if 'part_title' in part:
-            total_items += 1
-            original = part['part_title']
-            corrected, changes = fix_ocr_manual_only(original)
-            if changes > 0:
-                part['part_title'] = corrected
-                total_corrections += changes
-                if examples_shown < 3:
-                    print(f"✏️  Parte: '{original}' → '{corrected}'")
-                    examples_shown += 1
+        part_log = OCR_ENGINE.apply_part_fields(part, {'part': part_index})
+        for change in part_log.changes:
+            if examples_shown < 3:
+                print(f"✏️  Parte: '{change['original']}' → '{change['corrected']}'")
+                examples_shown += 1
+        change_log.extend(part_log)
         
         # Capítulos
-        for chapter in part.get('chapters', []):
+        for chapter_index, _ in enumerate(part.chapters or []):
+            result = next(result_iter)
+            for change in result['change_log'].changes:
+                change['location'] = {'part': part_index, 'chapter': chapter_index, **change['location']}
+            change_log.extend(result['change_log'])
+            for limit, line in result['examples']:
+                if examples_shown < limit:
+                    print(line)
+                    examples_shown += 1
+    
+    pattern_hits = change_log.pattern_hits()
+    if pattern_hits:
+        top = sorted(pattern_hits.items(), key=lambda item: -item[1])[:5]
+        print(f"📌 Padrões mais aplicados: {', '.join(f'{p} ({n})' for p, n in top)}")
+    
+    # ETAPA 3: Separar palavras grudadas com o índice de frequências do próprio livro
+    print("✂️  Separando palavras grudadas...")
+    segmented_words = segment_book_words(data)
+    if segmented_words:
+        examples = ', '.join(f"{token} → {text}" for token, text in segmented_words[:5])
+        print(f"   ✅ {len(segmented_words)} palavras separadas ({examples})")
+    else:
+        print("   ℹ️ Nenhuma palavra grudada detectada")
+    
+    return {
+        'merges_count': merges_count,
+        'total_items': change_log.items,
+        'total_corrections': change_log.corrections,
+        'pattern_hits': pattern_hits,
+        'segmented_words': len(segmented_words),
+        'change_log': change_log,
+    }
+
+def segment_book_words(data):
+    """
+    Separa palavras grudadas pelo OCR em títulos e parágrafos do livro.
+    As correções de MANUAL_FIXES têm prioridade e PROTECTED_WORDS nunca são separadas.
+    
+    Returns:
+        list: (token, substituição) de cada separação aplicada
+    """
+    fields = []
+    for part in data:
+        if 'part_title' in part:
+            fields.append((part, 'part_title'))
+        for chapter in part.chapters or []:
             if 'chapter_title' in chapter:
-                total_items += 1
-                original = chapter['chapter_title']
-                corrected, changes = fix_ocr_manual_only(original)
-                if changes > 0:
-                    chapter['chapter_title'] = corrected
-                    total_corrections += changes
-                    if examples_shown < 5:
-                        print(f"✏️  Cap: '{original}' → '{corrected}'")
-                        examples_shown += 1
-            
-            # Conteúdo
-            for paragraph in chapter.get('content', []):
+                fields.append((chapter, 'chapter_title'))
+            for paragraph in chapter.content or []:
                 if 'content' in paragraph:
-                    total_items += 1
-                    original = paragraph['content']
-                    corrected, changes = fix_ocr_manual_only(original)
-                    if changes > 0:
-                        paragraph['content'] = corrected
-                        paragraph['word_count'] = len(corrected.split())
-                        total_corrections += changes
-                        if examples_shown < 8:
-                            print(f"✏️  Texto: '{original[:50]}...' → '{corrected[:50]}...'")
-                            examples_shown += 1
+                    fields.append((paragraph, 'content'))
+    
+    index = WordFrequencyIndex.from_texts(item[key] or '' for item, key in fields)
+    segmenter = WordSegmenter(index, overrides=MANUAL_FIXES, protected=PROTECTED_WORDS)
+    
+    segmented = []
+    for item, key in fields:
+        text, changes = segmenter.segment_text(item[key] or '')
+        if changes:
+            if key == 'content':
+                set_content(item, text)
+            else:
+                item[key] = text
+            segmented.extend(changes)
+    return segmented
+
+def fix_json_manual_only(input_file, output_file=None, workers=1, change_log_file=None):
+    """
+    Aplica correções APENAS manuais ao JSON e mescla parágrafos quebrados
+    (workers > 1 distribui os capítulos em um pool de processos; change_log_file
+    recebe o log estruturado das correções manuais)
+    """
+    if output_file is None:
+        output_file = input_file
+    
+    # Backup
+    if output_file == input_file:
+        backup_file = input_file.replace('.json', '_backup_manual.json')
+        if os.path.exists(input_file):
+            import shutil
+            shutil.copy2(input_file, backup_file)
+            print(f"💾 Backup: {backup_file}")
+    
+    # Carregar JSON
+    data = Book.load(input_file)
+    
+    stats = fix_book_manual_only(data, workers)
     
     # Salvar
-    # Recompute word_count for every content item as the last step before saving
-    def _recompute_counts(struct):
-        items = 0
-        for part in struct:
-            for ch in part.get('chapters', []):
-                for it in ch.get('content', []):
-                    if isinstance(it, dict) and 'content' in it:
-                        it['word_count'] = len((it.get('content') or '').split())
-                        items += 1
-        return items
-    recomputed_items = _recompute_counts(data)
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    data.save(output_file)
     
     print(f"\n📊 RESULTADO MANUAL:")
-    print(f"   Parágrafos mesclados: {merges_count}")
-    print(f"   Itens processados: {total_items}")
-    print(f"   Correções OCR aplicadas: {total_corrections}")
-    print(f"   🔢 word_count recalculado em {recomputed_items} itens")
+    print(f"   Parágrafos mesclados: {stats['merges_count']}")
+    print(f"   Itens processados: {stats['total_items']}")
+    print(f"   Correções OCR aplicadas: {stats['total_corrections']}")
+    print(f"   Palavras separadas: {stats['segmented_words']}")
     print(f"   Arquivo: {output_file}")
+    if change_log_file:
+        stats['change_log'].save(change_log_file)
+        print(f"   📝 Log de alterações: {change_log_file}")
     
-    return total_corrections + merges_count
+    return stats['total_corrections'] + stats['merges_count'] + stats['segmented_words']
 
 def main():
     """Função principal - Correções manuais e mesclagem de parágrafos"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Correções manuais de OCR e mesclagem de parágrafos")
+    parser.add_argument('--workers', type=int, default=1, metavar='N',
+                        help="Processos para corrigir os capítulos em paralelo (padrão: 1)")
+    parser.add_argument('--change-log', metavar='ARQUIVO',
+                        help="Grava o log estruturado das correções manuais neste arquivo JSON")
+    args = parser.parse_args()
+    
     print("✋ CORRETOR MANUAL DE OCR")
-    print("Aplica SOMENTE correções manuais específicas")
+    print("Aplica as correções manuais específicas (nenhuma regex automática)")
     print("Mescla parágrafos quebrados incorretamente pelo OCR")
+    print("Separa palavras grudadas ('thatare' → 'that are') com as frequências do próprio livro")
     print("Não quebra palavras válidas como 'Description' ou 'Devotion'")
     print("=" * 70)
     
@@ -443,7 +510,7 @@ def main():
         print(f"\n📖 Arquivo: {os.path.basename(file_path)}")
         print("ℹ️  Nota: O arquivo PT-BR é gerado pelo Google Translate e não precisa de correção OCR")
         
-        corrections = fix_json_manual_only(file_path)
+        corrections = fix_json_manual_only(file_path, workers=args.workers, change_log_file=args.change_log)
         
         if corrections > 0:
             print(f"✅ {corrections} correções totais aplicadas")
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Índice de vizinhança por deleções (estilo SymSpell) para sugerir correções
+de erros de OCR ("somethimes" → "sometimes").
+
+Cada palavra do dicionário é registrada sob todas as formas obtidas
+apagando até max_distance caracteres. Para um token desconhecido, basta
+gerar as deleções dele e consultar cada uma: as palavras encontradas são
+as candidatas, confirmadas pela distância de edição real. O número de
+consultas depende só do tamanho do token, não do tamanho do dicionário.
+
+O índice é gravado em um arquivo binário e aberto com mmap: nada é
+desserializado na abertura, e as consultas leem direto das páginas do
+arquivo. Uma assinatura das palavras indexadas permite reaproveitar o
+arquivo enquanto o dicionário não mudar.
+
+Layout (little-endian):
+    cabeçalho (HEADER)
+    word_offsets  u32 × (n_words + 1)   início de cada palavra em words
+    word_counts   u32 × n_words         frequência de cada palavra
+    words         UTF-8 concatenado
+    slots         SLOT × n_slots        tabela hash com sondagem linear
+    keys          UTF-8 concatenado     chaves (deleções) dos slots
+    postings      u32 × n_postings      ids das palavras de cada chave
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import zlib
+
+
+MAGIC = b'OCRSPELL'
+FORMAT_VERSION = 1
+DEFAULT_MAX_DISTANCE = 2
+MAX_TOKEN_LENGTH = 24    # Tokens maiores não são consultados
+
+# magic, versão, distância máxima, assinatura, n_words, n_slots, n_postings,
+# offsets de word_offsets, word_counts, words, slots, keys, postings
+HEADER = struct.Struct('<8sII32sIII6Q')
+# offset da chave, tamanho da chave, offset das postings, número de postings (0 = vazio)
+SLOT = struct.Struct('<IIII')
+
+
+def deletes(word, max_distance):
+    """Todas as formas de word com até max_distance caracteres apagados (inclui word)"""
+    result = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        result |= frontier
+    return result
+
+
+def edit_distance(a, b, limit):
+    """
+    Distância de Damerau-Levenshtein (transposições adjacentes) entre a e b,
+    ou limit + 1 se for maior que limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = current[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1] if previous[-1] <= limit else limit + 1
+
+
+def signature(words, max_distance):
+    """SHA-256 (bytes) das palavras indexadas, suas frequências e da distância máxima"""
+    h = hashlib.sha256(f"{FORMAT_VERSION}\0{max_distance}".encode('utf-8'))
+    for word in sorted(words):
+        h.update(f"\0{word}\t{words[word]}".encode('utf-8'))
+    return h.digest()
+
+
+def _slot_of(key_bytes, n_slots):
+    return zlib.crc32(key_bytes) & (n_slots - 1)
+
+
+def _u32_array(values):
+    return struct.pack(f'<{len(values)}I', *values)
+
+
+class SpellingIndex:
+    """
+    Índice de deleções aberto sobre um arquivo mapeado em memória.
+
+    Use SpellingIndex.build para gravar um índice novo, SpellingIndex.open
+    para abrir um existente, ou SpellingIndex.load_or_build para reaproveitar
+    o arquivo quando a assinatura bater.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            fields = HEADER.unpack_from(self._mmap, 0)
+        except struct.error:
+            self.close()
+            raise ValueError(f"Índice inválido: {path}")
+        (magic, version, self.max_distance, self.signature,
+         self.n_words, self.n_slots, self.n_postings,
+         self._word_offsets, self._word_counts, self._words,
+         self._slots, self._keys, self._postings) = fields
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Índice inválido: {path}")
+
+    @classmethod
+    def open(cls, path):
+        return cls(path)
+
+    @classmethod
+    def build(cls, words, path, max_distance=DEFAULT_MAX_DISTANCE):
+        """
+        Grava o índice de um dicionário e o abre.
+
+        Args:
+            words (dict): palavra → frequência
+            path (str): Arquivo de destino
+            max_distance (int): Distância de edição máxima das sugestões
+        """
+        # Ordem estável: palavras mais frequentes primeiro
+        ordered = sorted(words, key=lambda w: (-words[w], w))
+        postings_by_key = {}
+        for word_id, word in enumerate(ordered):
+            for key in deletes(word, max_distance):
+                postings_by_key.setdefault(key, []).append(word_id)
+
+        word_blob = bytearray()
+        word_offsets = [0]
+        for word in ordered:
+            word_blob += word.encode('utf-8')
+            word_offsets.append(len(word_blob))
+
+        n_slots = 1
+        while n_slots < 2 * len(postings_by_key):
+            n_slots *= 2
+        slots = [None] * n_slots
+        key_blob = bytearray()
+        postings = []
+        for key in sorted(postings_by_key):
+            key_bytes = key.encode('utf-8')
+            slot = _slot_of(key_bytes, n_slots)
+            while slots[slot] is not None:
+                slot = (slot + 1) & (n_slots - 1)
+            ids = postings_by_key[key]
+            slots[slot] = (len(key_blob), len(key_bytes), len(postings), len(ids))
+            key_blob += key_bytes
+            postings.extend(ids)
+
+        sections = [
+            _u32_array(word_offsets),
+            _u32_array([words[word] for word in ordered]),
+            bytes(word_blob),
+            b''.join(SLOT.pack(*(slot or (0, 0, 0, 0))) for slot in slots),
+            bytes(key_blob),
+            _u32_array(postings),
+        ]
+        offsets = []
+        position = HEADER.size
+        for section in sections:
+            offsets.append(position)
+            position += len(section)
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, max_distance, signature(words, max_distance),
+                             len(ordered), n_slots, len(postings), *offsets)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp-{os.getpid()}"
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            for section in sections:
+                f.write(section)
+        os.replace(temp_path, path)
+        return cls(path)
+
+    @classmethod
+    def load_or_build(cls, path, words, max_distance=DEFAULT_MAX_DISTANCE):
+        """
+        Abre o índice gravado se ele corresponder ao dicionário; senão, reconstrói.
+
+        Returns:
+            tuple: (SpellingIndex, True se o índice foi reconstruído)
+        """
+        if os.path.exists(path):
+            try:
+                index = cls(path)
+            except ValueError:
+                index = None
+            if index is not None:
+                if index.signature == signature(words, max_distance):
+                    return index, False
+                index.close()
+        return cls.build(words, path, max_distance), True
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.n_words
+
+    def word(self, word_id):
+        start, end = struct.unpack_from('<II', self._mmap, self._word_offsets + 4 * word_id)
+        return self._mmap[self._words + start:self._words + end].decode('utf-8')
+
+    def count(self, word_id):
+        return struct.unpack_from('<I', self._mmap, self._word_counts + 4 * word_id)[0]
+
+    def _postings_of(self, key):
+        key_bytes = key.encode('utf-8')
+        mask = self.n_slots - 1
+        slot = _slot_of(key_bytes, self.n_slots)
+        while True:
+            key_offset, key_length, offset, count = SLOT.unpack_from(self._mmap, self._slots + SLOT.size * slot)
+            if not count:
+                return ()
+            if key_length == len(key_bytes):
+                start = self._keys + key_offset
+                if self._mmap[start:start + key_length] == key_bytes:
+                    return struct.unpack_from(f'<{count}I', self._mmap, self._postings + 4 * offset)
+            slot = (slot + 1) & mask
+
+    def lookup(self, token, max_candidates=5):
+        """
+        Palavras do dicionário a até max_distance edições do token.
+
+        Returns:
+            list: (palavra, distância, frequência), ordenadas por distância e
+                frequência decrescente
+        """
+        token = token.lower()
+        if len(token) > MAX_TOKEN_LENGTH:
+            return []
+        seen = set()
+        candidates = []
+        for key in deletes(token, self.max_distance):
+            for word_id in self._postings_of(key):
+                if word_id in seen:
+                    continue
+                seen.add(word_id)
+                word = self.word(word_id)
+                if word == token:
+                    continue
+                distance = edit_distance(token, word, self.max_distance)
+                if distance <= self.max_distance:
+                    candidates.append((word, distance, self.count(word_id)))
+        candidates.sort(key=lambda c: (c[1], -c[2], c[0]))
+        return candidates[:max_candidates]
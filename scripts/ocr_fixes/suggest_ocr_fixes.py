@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Sugestões de correção de OCR para revisão manual.
+
+Procura no livro tokens desconhecidos (raros e fora do léxico) e, para cada
+um, as palavras conhecidas mais próximas segundo o índice de deleções de
+spelling_index.py. O relatório é ordenado pelas sugestões mais confiáveis.
+
+Com um léxico (data/lexicon_en.txt), as sugestões também são impressas no
+formato das regras de MANUAL_FIXES, para que as corretas sejam copiadas para
+data/rules/ocr_en.json. As regras são substituições de substring sensíveis a
+maiúsculas, então cada chave usa a grafia encontrada no livro e só entra no
+trecho se nunca aparecer dentro de outra palavra. Sem léxico, muitos tokens
+raros são palavras válidas (undertaken → undertake), e o trecho não é gerado.
+"""
+
+import json
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'common'))
+from book_model import Book
+from spelling_index import SpellingIndex, DEFAULT_MAX_DISTANCE
+from word_segmenter import WordFrequencyIndex
+from fix_ocr_manual import MANUAL_FIXES, PROTECTED_WORDS
+
+
+MIN_DICTIONARY_COUNT = 5   # Palavras do livro com essa frequência entram no dicionário
+MAX_UNKNOWN_COUNT = 2      # Tokens com até essa frequência (e fora do dicionário) são suspeitos
+MIN_WORD_LENGTH = 4        # Tokens e palavras mais curtos são ignorados
+REPORT_LIMIT = 30          # Sugestões impressas no terminal
+
+# Terminações que formam variantes legítimas (plural, verbo, advérbio), não erros de OCR
+INFLECTION_SUFFIXES = ('s', 'es', 'd', 'ed', 'ing', 'ly', 'er', 'st', 'est', 'th', 'eth')
+INFLECTION_SWAPS = {('y', 'e'), ('e', 'y'), ('ies', 'y'), ('y', 'ies')}
+
+
+def book_texts(data):
+    """Títulos e parágrafos do livro"""
+    for part in data:
+        if part.get('part_title'):
+            yield part['part_title']
+        for chapter in part.chapters or []:
+            if chapter.get('chapter_title'):
+                yield chapter['chapter_title']
+            for paragraph in chapter.content or []:
+                if paragraph.get('content'):
+                    yield paragraph['content']
+
+
+def load_lexicon(path):
+    """Léxico limpo opcional: uma palavra por linha (linhas com # são comentários)"""
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, 'r', encoding='utf-8') as f:
+        return {line.strip().lower() for line in f if line.strip() and not line.startswith('#')}
+
+
+def build_dictionary(frequencies, lexicon):
+    """Palavras frequentes do livro mais as do léxico (palavra → frequência no livro)"""
+    dictionary = {word: count for word, count in frequencies.words.items()
+                  if count >= MIN_DICTIONARY_COUNT and len(word) >= MIN_WORD_LENGTH}
+    for word in lexicon:
+        if len(word) >= MIN_WORD_LENGTH:
+            dictionary.setdefault(word, frequencies.words.get(word, 0))
+    return dictionary
+
+
+def is_inflection(token, word):
+    """Indica se token e word são só flexões um do outro (ex.: 'devotions'/'devotion')"""
+    shorter, longer = sorted((token, word), key=len)
+    if longer.startswith(shorter) and longer[len(shorter):] in INFLECTION_SUFFIXES:
+        return True
+    for end_a, end_b in INFLECTION_SWAPS:
+        if (token.endswith(end_a) and word.endswith(end_b)
+                and token[:-len(end_a)] == word[:-len(end_b)]):
+            return True
+    return False
+
+
+def suggest_fixes(data, index_path, lexicon_path=None, max_distance=DEFAULT_MAX_DISTANCE):
+    """
+    Gera as sugestões para um livro em memória.
+
+    Returns:
+        tuple: (lista de sugestões, True se o índice foi reconstruído)
+    """
+    frequencies = WordFrequencyIndex.from_texts(book_texts(data), keep_forms=True)
+    lexicon = load_lexicon(lexicon_path)
+    dictionary = build_dictionary(frequencies, lexicon)
+    known_fixes = {token.lower() for token in MANUAL_FIXES}
+
+    suggestions = []
+    index, rebuilt = SpellingIndex.load_or_build(index_path, dictionary, max_distance)
+    with index:
+        for token, count in frequencies.words.items():
+            if (count > MAX_UNKNOWN_COUNT or len(token) < MIN_WORD_LENGTH
+                    or token in dictionary or token in lexicon
+                    or token in known_fixes or token in PROTECTED_WORDS):
+                continue
+            candidates = [c for c in index.lookup(token) if not is_inflection(token, c[0])]
+            if candidates:
+                suggestions.append({
+                    'token': token,
+                    'occurrences': count,
+                    'forms': frequencies.forms[token],
+                    'candidates': [{'word': word, 'distance': distance, 'count': word_count}
+                                   for word, distance, word_count in candidates],
+                })
+
+    # Mais confiáveis primeiro: menor distância relativa ao tamanho do token
+    # (um erro em palavra longa é mais claro que em palavra curta), depois a
+    # candidata mais frequente
+    suggestions.sort(key=lambda s: (s['candidates'][0]['distance'] / len(s['token']),
+                                    -s['candidates'][0]['count'], s['token']))
+    return suggestions, rebuilt
+
+
+def match_case(form, word):
+    """word com as maiúsculas de form ('Lumility', 'humility' → 'Humility')"""
+    if form.isupper() and len(form) > 1:
+        return word.upper()
+    if form[:1].isupper():
+        return word[:1].upper() + word[1:]
+    return word
+
+
+def suggested_rules(suggestions, texts):
+    """
+    Regras (grafia do livro → correção) seguras como substituição de substring:
+    a chave só aparece no livro como palavra inteira.
+
+    Args:
+        suggestions (list): Sugestões de suggest_fixes
+        texts (list): Textos do livro (book_texts)
+
+    Returns:
+        list: Pares (errado, correto), na ordem das sugestões
+    """
+    book = '\n'.join(texts)
+    rules = []
+    for suggestion in suggestions:
+        word = suggestion['candidates'][0]['word']
+        for form in suggestion['forms']:
+            whole_words = len(re.findall(rf'(?<![^\W\d_]){re.escape(form)}(?![^\W\d_])', book))
+            if whole_words and whole_words == book.count(form):
+                rules.append((form, match_case(form, word)))
+    return rules
+
+
+def main():
+    """Gera output/ocr_suggestions.json a partir de output/livro_en.json"""
+    print("🔎 SUGESTÕES DE CORREÇÃO DE OCR")
+    print("=" * 70)
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(os.path.dirname(script_dir))
+    input_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join(project_root, 'output', 'livro_en.json')
+    lexicon_file = sys.argv[2] if len(sys.argv) > 2 else os.path.join(project_root, 'data', 'lexicon_en.txt')
+    index_file = os.path.join(project_root, 'output', '.ocr_spelling_index.bin')
+    report_file = os.path.join(project_root, 'output', 'ocr_suggestions.json')
+
+    if not os.path.exists(input_file):
+        print(f"❌ Não encontrado: {input_file}")
+        return
+
+    data = Book.load(input_file)
+
+    suggestions, rebuilt = suggest_fixes(data, index_file, lexicon_file)
+    print(f"📇 Índice de deleções: {'reconstruído' if rebuilt else 'reaproveitado'} ({index_file})")
+    has_lexicon = os.path.exists(lexicon_file)
+    if not has_lexicon:
+        print(f"ℹ️  Sem léxico em {lexicon_file}; usando só as palavras frequentes do livro")
+
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(suggestions, f, indent=2, ensure_ascii=False)
+
+    top = suggestions[:REPORT_LIMIT]
+    print(f"\n📋 {len(suggestions)} tokens suspeitos. Sugestões mais confiáveis:")
+    for suggestion in top:
+        best = suggestion['candidates'][0]
+        print(f"   {', '.join(suggestion['forms'])} → {best['word']} "
+              f"(distância {best['distance']}, '{best['word']}' ×{best['count']})")
+    rules = suggested_rules(top, list(book_texts(data))) if has_lexicon else []
+    if rules:
+        # Trecho JSON válido, pronto para colar em "rules" de data/rules/ocr_en.json
+        print("\n📝 Formato data/rules/ocr_en.json:")
+        members = [f"{json.dumps(wrong, ensure_ascii=False)}: {json.dumps(right, ensure_ascii=False)}"
+                   for wrong, right in rules]
+        print(',\n'.join(f"    {member}" for member in members))
+    elif not has_lexicon:
+        print("\n⚠️  Sem léxico, boa parte destes tokens são palavras válidas: nenhuma regra é sugerida para colar.")
+        print(f"   Crie {lexicon_file} (uma palavra por linha) para gerar o trecho de data/rules/ocr_en.json")
+    print(f"\n💾 Relatório completo: {report_file}")
+    print("✋ Revise as sugestões e copie as corretas para data/rules/ocr_en.json")
+
+
+if __name__ == "__main__":
+    main()
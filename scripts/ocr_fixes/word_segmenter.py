@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Separação automática de palavras grudadas pelo OCR ("thatare", "notonly").
+
+O índice de frequências é construído a partir do próprio livro: contagem de
+cada palavra e de cada par de palavras vizinhas. Um token desconhecido
+(raro no livro) é separado por programação dinâmica sobre uma trie das
+palavras conhecidas, escolhendo a segmentação mais provável (menor soma de
+-log da frequência). O resultado de cada token é memorizado.
+
+A separação só é aceita quando cada par de partes vizinhas também aparece
+separado no livro. Isso descarta palavras válidas que por acaso se decompõem
+em palavras conhecidas ("herein", "incapable", "forgiving"), que não têm
+esse respaldo.
+"""
+
+import math
+import re
+
+
+WORD_RE = re.compile(r"[^\W\d_]+")
+
+MIN_TOKEN_LENGTH = 5     # Tokens mais curtos nunca são separados
+MIN_WORD_COUNT = 2       # Tokens com menos ocorrências são desconhecidos
+MIN_PART_COUNT = 3       # Cada parte precisa ser uma palavra frequente
+MIN_BIGRAM_COUNT = 2     # Cada par de partes precisa aparecer separado no livro
+MAX_WORD_LENGTH = 20     # Limite de profundidade da trie
+SINGLE_LETTER_WORDS = {'a', 'i'}
+# Tokens colados a estes caracteres fazem parte de uma palavra composta ou
+# contraída ("suchand-such", "o'clock") e não são separados isoladamente
+JOINERS = "-'\u2019"
+
+# Chave da trie que guarda o custo da palavra terminada no nó
+_WORD_END = ''
+
+
+class WordFrequencyIndex:
+    """
+    Frequência das palavras (minúsculas) e dos pares de palavras vizinhas.
+    Com keep_forms, guarda também a grafia original de cada palavra
+    (forms: palavra → {grafia: frequência}).
+    """
+
+    def __init__(self, keep_forms=False):
+        self.words = {}
+        self.bigrams = {}
+        self.forms = {} if keep_forms else None
+        self.total = 0
+
+    def add_text(self, text):
+        words, bigrams, forms = self.words, self.bigrams, self.forms
+        previous = None
+        for match in WORD_RE.finditer(text):
+            original = match.group()
+            word = original.lower()
+            words[word] = words.get(word, 0) + 1
+            if forms is not None:
+                spellings = forms.setdefault(word, {})
+                spellings[original] = spellings.get(original, 0) + 1
+            self.total += 1
+            if previous is not None:
+                pair = (previous, word)
+                bigrams[pair] = bigrams.get(pair, 0) + 1
+            previous = word
+
+    @classmethod
+    def from_texts(cls, texts, keep_forms=False):
+        index = cls(keep_forms)
+        for text in texts:
+            index.add_text(text)
+        return index
+
+
+class WordSegmenter:
+    """
+    Separa tokens desconhecidos em palavras conhecidas do índice.
+
+    Args:
+        index (WordFrequencyIndex): Frequências do livro
+        overrides (dict, optional): Correções escritas à mão (token → texto);
+            têm prioridade sobre a segmentação automática
+        protected (iterable, optional): Palavras válidas que nunca são separadas
+    """
+
+    def __init__(self, index, overrides=None, protected=()):
+        self.index = index
+        self.overrides = {token: text for token, text in (overrides or {}).items()
+                          if WORD_RE.fullmatch(token)}
+        self.protected = {word.lower() for word in protected}
+        self._trie = {}
+        self._memo = {}
+        self._build_trie()
+
+    def _build_trie(self):
+        total = max(self.index.total, 1)
+        for word, count in self.index.words.items():
+            if count < MIN_PART_COUNT or len(word) > MAX_WORD_LENGTH:
+                continue
+            if len(word) == 1 and word not in SINGLE_LETTER_WORDS:
+                continue
+            node = self._trie
+            for ch in word:
+                node = node.setdefault(ch, {})
+            node[_WORD_END] = -math.log(count / total)
+
+    def split(self, word):
+        """
+        Melhor segmentação de uma palavra minúscula.
+
+        Returns:
+            tuple: Tamanhos das partes, ou None se a palavra não deve ser separada
+        """
+        if word in self._memo:
+            return self._memo[word]
+
+        result = None
+        n = len(word)
+        if (n >= MIN_TOKEN_LENGTH and word not in self.protected
+                and self.index.words.get(word, 0) < MIN_WORD_COUNT):
+            # best[j] = (custo, início da última parte) da melhor segmentação de word[:j]
+            best = [None] * (n + 1)
+            best[0] = (0.0, 0)
+            for i in range(n):
+                if best[i] is None:
+                    continue
+                cost = best[i][0]
+                node = self._trie
+                for j in range(i, n):
+                    node = node.get(word[j])
+                    if node is None:
+                        break
+                    word_cost = node.get(_WORD_END)
+                    if word_cost is not None and j + 1 - i < n:
+                        candidate = cost + word_cost
+                        if best[j + 1] is None or candidate < best[j + 1][0]:
+                            best[j + 1] = (candidate, i)
+            if best[n] is not None:
+                parts = []
+                end = n
+                while end:
+                    start = best[end][1]
+                    parts.append(word[start:end])
+                    end = start
+                parts.reverse()
+                bigrams = self.index.bigrams
+                if all(bigrams.get(pair, 0) >= MIN_BIGRAM_COUNT for pair in zip(parts, parts[1:])):
+                    result = tuple(len(part) for part in parts)
+
+        self._memo[word] = result
+        return result
+
+    def segment(self, token):
+        """
+        Texto que substitui o token (mantendo as maiúsculas originais) ou None.
+        """
+        override = self.overrides.get(token)
+        if override is not None:
+            return override if override != token else None
+        word = token.lower()
+        if len(word) != len(token):
+            return None
+        lengths = self.split(word)
+        if lengths is None:
+            return None
+        parts = []
+        position = 0
+        for length in lengths:
+            parts.append(token[position:position + length])
+            position += length
+        return ' '.join(parts)
+
+    def segment_text(self, text):
+        """
+        Separa os tokens desconhecidos de um texto. Tokens ligados a outro
+        por hífen ou apóstrofo ficam como estão.
+
+        Returns:
+            tuple: (texto corrigido, lista de (token, substituição))
+        """
+        changes = []
+        pieces = []
+        position = 0
+        for match in WORD_RE.finditer(text):
+            start, end = match.span()
+            if (start and text[start - 1] in JOINERS) or (end < len(text) and text[end] in JOINERS):
+                continue
+            replacement = self.segment(match.group())
+            if replacement is None:
+                continue
+            pieces.append(text[position:start])
+            pieces.append(replacement)
+            position = end
+            changes.append((match.group(), replacement))
+        if not changes:
+            return text, changes
+        pieces.append(text[position:])
+        return ''.join(pieces), changes
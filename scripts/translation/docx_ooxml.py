@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+Escrita e leitura diretas do DOCX de tradução (OOXML), sem python-docx.
+
+O DOCX de tradução é sempre o mesmo documento: um título, uma nota técnica,
+uma quebra de página e, para cada segmento, três parágrafos (marcador
+###IDxxxx###, texto justificado e linha em branco). Com python-docx, cada
+parágrafo passa pelo modelo de objetos do lxml e o documento inteiro fica na
+memória até o save(). Aqui, as partes fixas do pacote vêm de um modelo
+mínimo e o word/document.xml é escrito em fluxo direto no zip, segmento a
+segmento.
+
+O resultado é estável byte a byte: as entradas do zip têm data fixa e
+nenhuma parte traz data de criação, então o mesmo livro gera sempre o mesmo
+arquivo. O documento abre no Word, no LibreOffice e no Google Translate, e
+também é lido pelo python-docx.
+
+Livros grandes demais para um único documento (o Google Translate aceita
+arquivos de até 10MB) são divididos por write_translation_docx em partes
+com intervalos contínuos de IDs, sob um orçamento de bytes ou de
+segmentos, com um manifesto que lista as partes.
+
+Na volta, o DOCX traduzido é lido com iterparse sobre o word/document.xml
+dentro do zip. Cada parágrafo do corpo é convertido em texto assim que
+termina e descartado em seguida, então a memória não cresce com o
+documento. O texto segue as mesmas regras do paragraph.text do python-docx.
+
+Uso:
+    with TranslationDocxWriter('livro.docx', 'Introduction to the Devout Life', nota) as writer:
+        writer.write_segment('###ID0001###', 'Texto...')
+
+    for marker, text in iter_docx_segments('livro_traduzido.docx'):
+        ...
+"""
+
+import json
+import os
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+FLUSH_SIZE = 256 * 1024
+
+# Limite de tamanho de arquivo do Google Translate para documentos
+GOOGLE_TRANSLATE_LIMIT = 10 * 1024 * 1024
+# Cabeçalho local, entrada do diretório central e descritor de dados de cada arquivo do zip
+ZIP_ENTRY_OVERHEAD = 30 + 46 + 16
+ZIP_END_OVERHEAD = 22
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+CONTENT_TYPES = (
+    XML_DECLARATION
+    + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+    '<Override PartName="/docProps/core.xml" '
+    'ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>'
+    '</Types>'
+)
+
+PACKAGE_RELS = (
+    XML_DECLARATION
+    + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties" '
+    'Target="docProps/core.xml"/>'
+    '</Relationships>'
+)
+
+DOCUMENT_RELS = (
+    XML_DECLARATION
+    + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+# Estilos Normal e Title, com as medidas do modelo padrão do python-docx
+STYLES = (
+    XML_DECLARATION
+    + f'<w:styles xmlns:w="{W_NS}">'
+    '<w:docDefaults><w:rPrDefault><w:rPr>'
+    '<w:rFonts w:asciiTheme="minorHAnsi" w:eastAsiaTheme="minorEastAsia" w:hAnsiTheme="minorHAnsi" '
+    'w:cstheme="minorBidi"/><w:sz w:val="24"/><w:szCs w:val="24"/>'
+    '<w:lang w:val="en-US" w:eastAsia="en-US" w:bidi="ar-SA"/>'
+    '</w:rPr></w:rPrDefault><w:pPrDefault/></w:docDefaults>'
+    '<w:style w:type="paragraph" w:default="1" w:styleId="Normal">'
+    '<w:name w:val="Normal"/><w:qFormat/></w:style>'
+    '<w:style w:type="paragraph" w:styleId="Title">'
+    '<w:name w:val="Title"/><w:basedOn w:val="Normal"/><w:next w:val="Normal"/><w:qFormat/>'
+    '<w:pPr><w:pBdr><w:bottom w:val="single" w:sz="8" w:space="4" w:color="4F81BD"/></w:pBdr>'
+    '<w:spacing w:after="300" w:line="240" w:lineRule="auto"/><w:contextualSpacing/></w:pPr>'
+    '<w:rPr><w:color w:val="17365D"/><w:spacing w:val="5"/><w:kern w:val="28"/>'
+    '<w:sz w:val="52"/><w:szCs w:val="52"/></w:rPr></w:style>'
+    '</w:styles>'
+)
+
+CORE_PROPERTIES = (
+    XML_DECLARATION
+    + '<cp:coreProperties '
+    'xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+    'xmlns:dc="http://purl.org/dc/elements/1.1/">'
+    '<dc:title>{title}</dc:title><dc:language>{language}</dc:language>'
+    '</cp:coreProperties>'
+)
+
+DOCUMENT_START = XML_DECLARATION + f'<w:document xmlns:w="{W_NS}"><w:body>'
+
+# Página Letter com as margens do modelo padrão do python-docx
+DOCUMENT_END = (
+    '<w:sectPr><w:pgSz w:w="12240" w:h="15840"/>'
+    '<w:pgMar w:top="1440" w:right="1800" w:bottom="1440" w:left="1800" '
+    'w:header="720" w:footer="720" w:gutter="0"/>'
+    '<w:cols w:space="720"/><w:docGrid w:linePitch="360"/></w:sectPr>'
+    '</w:body></w:document>'
+)
+
+PAGE_BREAK = '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+BLANK_PARAGRAPH = '<w:p/>'
+
+# Caracteres que o XML 1.0 não aceita (o python-docx recusa o texto inteiro)
+_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+# Tabulações e quebras de linha viram <w:tab/> e <w:br/>, como no python-docx
+_RUN_SPECIAL = re.compile('([\t\n\r])')
+
+
+def run_xml(text):
+    """<w:r> com o texto, como o python-docx o gravaria em add_paragraph(texto)"""
+    pieces = []
+    for piece in _RUN_SPECIAL.split(_INVALID_XML_CHARS.sub('', text)):
+        if piece == '\t':
+            pieces.append('<w:tab/>')
+        elif piece in ('\n', '\r'):
+            pieces.append('<w:br/>')
+        elif piece:
+            space = ' xml:space="preserve"' if piece != piece.strip() else ''
+            pieces.append(f'<w:t{space}>{escape(piece)}</w:t>')
+    return f'<w:r>{"".join(pieces)}</w:r>'
+
+
+def paragraph_xml(text, alignment=None, style=None):
+    """
+    <w:p> com um único run.
+
+    Args:
+        text (str): Texto do parágrafo ('' gera um parágrafo vazio)
+        alignment (str, optional): Valor de w:jc ('center', 'both'...)
+        style (str, optional): Id do estilo do parágrafo ('Title')
+    """
+    properties = ''
+    if style:
+        properties += f'<w:pStyle w:val="{style}"/>'
+    if alignment:
+        properties += f'<w:jc w:val="{alignment}"/>'
+    if properties:
+        properties = f'<w:pPr>{properties}</w:pPr>'
+    if not text:
+        return f'<w:p>{properties}</w:p>' if properties else BLANK_PARAGRAPH
+    return f'<w:p>{properties}{run_xml(text)}</w:p>'
+
+
+def segment_xml(marker, text):
+    """XML de um segmento: marcador, texto justificado e linha em branco"""
+    return f'{paragraph_xml(marker)}{paragraph_xml(text, "both")}{BLANK_PARAGRAPH}'
+
+
+def marker_id(marker):
+    """Número de um marcador ###ID0001### (1)"""
+    return int(marker.strip('#')[2:])
+
+
+def deflate_bound(size):
+    """Maior tamanho possível de size bytes comprimidos com deflate (compressBound do zlib)"""
+    return size + (size >> 12) + (size >> 14) + (size >> 25) + 13
+
+
+def _zip_info(name):
+    # Data fixa e sistema de origem fixo: o zip não depende de quando nem onde foi gerado
+    info = zipfile.ZipInfo(name, date_time=ZIP_DATE_TIME)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.create_system = 0
+    info.external_attr = 0
+    return info
+
+
+class TranslationDocxWriter:
+    """
+    Escritor em fluxo do DOCX de tradução.
+
+    O arquivo é gravado em um temporário no mesmo diretório e só substitui
+    o destino no fechamento; se ocorrer uma exceção dentro do bloco with, o
+    destino não é alterado.
+
+    Args:
+        path (str): Arquivo .docx de saída
+        title (str): Título (primeiro parágrafo, estilo Title, e dc:title)
+        note (str, optional): Nota técnica centralizada abaixo do título
+        language (str): Idioma do documento (dc:language)
+    """
+
+    def __init__(self, path, title, note=None, language='en'):
+        self.path = path
+        self.title = title
+        self.note = note
+        self.language = language
+        self.segments_written = 0
+        self.document_bytes = 0
+        self._fixed_bytes = 0
+        self._zip = None
+        self._document = None
+        self._temp_path = None
+        self._buffer = []
+        self._buffered = 0
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def open(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._temp_path = f"{self.path}.tmp-{os.getpid()}"
+        self._zip = zipfile.ZipFile(self._temp_path, 'w')
+        static_parts = [
+            ('[Content_Types].xml', CONTENT_TYPES),
+            ('_rels/.rels', PACKAGE_RELS),
+            ('docProps/core.xml', CORE_PROPERTIES.format(title=escape(self.title), language=escape(self.language))),
+            ('word/_rels/document.xml.rels', DOCUMENT_RELS),
+            ('word/styles.xml', STYLES),
+        ]
+        self._fixed_bytes = ZIP_END_OVERHEAD + ZIP_ENTRY_OVERHEAD + len('word/document.xml')
+        for name, content in static_parts:
+            data = content.encode('utf-8')
+            self._zip.writestr(_zip_info(name), data)
+            self._fixed_bytes += ZIP_ENTRY_OVERHEAD + len(name) + deflate_bound(len(data))
+        self._document = self._zip.open(_zip_info('word/document.xml'), 'w')
+        self._write(DOCUMENT_START)
+        self._write(paragraph_xml(self.title, 'center', 'Title'))
+        if self.note:
+            self._write(paragraph_xml(self.note, 'center'))
+        self._write(PAGE_BREAK)
+
+    def write_segment(self, marker, text):
+        """Grava um segmento: marcador, texto justificado e linha em branco"""
+        self.write_segment_xml(segment_xml(marker, text).encode('utf-8'))
+
+    def write_segment_xml(self, data):
+        """Grava um segmento já convertido (segment_xml codificado em UTF-8)"""
+        self._write(data)
+        self.segments_written += 1
+
+    def size_bound(self, extra_bytes=0):
+        """
+        Limite superior do tamanho final do .docx se mais extra_bytes de XML
+        forem gravados. Conta o XML como se a compressão não reduzisse nada,
+        então o arquivo real fica bem abaixo do limite.
+        """
+        return self._fixed_bytes + deflate_bound(self.document_bytes + extra_bytes + len(DOCUMENT_END))
+
+    def _write(self, data):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self._buffer.append(data)
+        self._buffered += len(data)
+        self.document_bytes += len(data)
+        if self._buffered >= FLUSH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self._document.write(b''.join(self._buffer))
+            self._buffer = []
+            self._buffered = 0
+
+    def close(self):
+        """Fecha o documento e o zip e substitui o arquivo de destino"""
+        if self._zip is None:
+            return
+        self._write(DOCUMENT_END)
+        self._flush()
+        self._document.close()
+        self._zip.close()
+        self._document = self._zip = None
+        os.replace(self._temp_path, self.path)
+
+    def abort(self):
+        """Descarta o que foi escrito, mantendo o arquivo de destino intacto"""
+        if self._zip is None:
+            return
+        try:
+            self._document.close()
+            self._zip.close()
+        finally:
+            self._document = self._zip = None
+            os.remove(self._temp_path)
+
+
+_SHARD_NAME = re.compile(r'_part\d+(?=[_.])', re.IGNORECASE)
+
+
+def shard_path(path, index):
+    """Arquivo da parte index (1, 2...) de um documento dividido: livro_part01.docx"""
+    base, extension = os.path.splitext(path)
+    return f"{base}_part{index:02d}{extension}"
+
+
+def is_shard_file(path):
+    """Se o nome do arquivo é o de uma parte (livro_part01.docx, livro_part01_traduzido.docx)"""
+    return _SHARD_NAME.search(os.path.basename(path)) is not None
+
+
+def manifest_path(path):
+    """Manifesto de um documento dividido: livro.manifest.json"""
+    return f"{os.path.splitext(path)[0]}.manifest.json"
+
+
+def load_manifest(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def remove_stale_shards(path, previous, keep=()):
+    """
+    Remove as partes de uma divisão anterior de path (manifesto previous)
+    que não estão em keep e, se nada for mantido, o manifesto.
+    """
+    if previous is None:
+        return
+    directory = os.path.dirname(manifest_path(path))
+    for shard in previous['shards']:
+        if shard['file'] in keep:
+            continue
+        shard_file = os.path.join(directory, shard['file'])
+        if os.path.exists(shard_file):
+            os.remove(shard_file)
+    if not keep and os.path.exists(manifest_path(path)):
+        os.remove(manifest_path(path))
+
+
+def write_translation_docx(path, segments, title, note=None, language='en', max_bytes=None, max_segments=None):
+    """
+    Grava o DOCX de tradução a partir de pares (marcador, texto), dividido
+    em partes se passar do orçamento de bytes ou de segmentos.
+
+    Cada parte recebe um intervalo contínuo de IDs. O tamanho é limitado por
+    size_bound, que não conta com a compressão, então max_bytes nunca é
+    ultrapassado, a não ser por um segmento que sozinho já não cabe (ele vai
+    para uma parte própria). Os nomes só são decididos ao fechar cada parte:
+    se tudo couber em um documento, ele é gravado no próprio path, sem
+    manifesto; senão, as partes vão para path_part01.docx, path_part02.docx...
+    e o manifesto para path.manifest.json.
+
+    Só uma gravação com orçamento (max_bytes ou max_segments) mexe nos
+    arquivos de uma divisão anterior, e só depois de gravar a nova: as partes
+    que não foram regravadas e o path avulso de uma geração anterior são
+    removidos. Sem orçamento, as partes e o manifesto existentes ficam como
+    estão, já que podem estar sendo lidos (as partes traduzidas do pipeline).
+
+    Args:
+        path (str): Arquivo .docx de saída
+        segments (iterable): Pares (marcador ###IDxxxx###, texto), em ordem
+        max_bytes (int, optional): Tamanho máximo de cada arquivo
+        max_segments (int, optional): Número máximo de segmentos por arquivo
+
+    Returns:
+        dict: Manifesto: document, max_bytes, max_segments, segments (total) e
+            shards, com file, first_id, last_id, segments e bytes de cada parte
+    """
+    sharding = bool(max_bytes or max_segments)
+    previous = load_manifest(manifest_path(path)) if sharding and os.path.exists(manifest_path(path)) else None
+    shards = []
+    writer = None
+
+    def start_shard():
+        shard = TranslationDocxWriter(shard_path(path, len(shards) + 1), title, note, language)
+        shard.open()
+        shards.append({'file': None, 'first_id': None, 'last_id': None, 'segments': 0, 'bytes': 0})
+        return shard
+
+    def finish_shard(final_path):
+        writer.path = final_path
+        writer.close()
+        shards[-1].update(file=os.path.basename(final_path), bytes=os.path.getsize(final_path))
+
+    try:
+        for marker, text in segments:
+            data = segment_xml(marker, text).encode('utf-8')
+            if writer is not None and writer.segments_written and (
+                    (max_segments and writer.segments_written >= max_segments)
+                    or (max_bytes and writer.size_bound(len(data)) > max_bytes)):
+                finish_shard(writer.path)
+                writer = None
+            if writer is None:
+                writer = start_shard()
+            writer.write_segment_xml(data)
+            shard = shards[-1]
+            if shard['first_id'] is None:
+                shard['first_id'] = marker_id(marker)
+            shard['last_id'] = marker_id(marker)
+            shard['segments'] += 1
+        if writer is None:
+            writer = start_shard()
+        finish_shard(path if len(shards) == 1 else writer.path)
+        writer = None
+    finally:
+        if writer is not None:
+            writer.abort()
+
+    manifest = {
+        'document': os.path.basename(path),
+        'max_bytes': max_bytes,
+        'max_segments': max_segments,
+        'segments': sum(shard['segments'] for shard in shards),
+        'shards': shards,
+    }
+    if len(shards) > 1:
+        with open(manifest_path(path), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        if os.path.exists(path):
+            os.remove(path)
+    if sharding:
+        remove_stale_shards(path, previous, keep={shard['file'] for shard in shards} if len(shards) > 1 else ())
+    return manifest
+
+
+# Leitura
+
+_W = f'{{{W_NS}}}'
+_BODY, _P, _R, _HYPERLINK = f'{_W}body', f'{_W}p', f'{_W}r', f'{_W}hyperlink'
+_BREAK_TYPE = f'{_W}type'
+# Texto equivalente de cada elemento de um run (w:br depende do tipo de quebra)
+_RUN_TEXT = {f'{_W}tab': '\t', f'{_W}ptab': '\t', f'{_W}cr': '\n', f'{_W}noBreakHyphen': '-'}
+_T, _BR = f'{_W}t', f'{_W}br'
+
+PACKAGE_RELS_PATH = '_rels/.rels'
+OFFICE_DOCUMENT_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+DEFAULT_DOCUMENT_PATH = 'word/document.xml'
+
+
+def main_document_path(archive):
+    """Caminho da parte principal do documento, pela relação officeDocument do pacote"""
+    try:
+        rels = ET.fromstring(archive.read(PACKAGE_RELS_PATH))
+    except KeyError:
+        return DEFAULT_DOCUMENT_PATH
+    for rel in rels:
+        if rel.get('Type') == OFFICE_DOCUMENT_REL:
+            return posixpath.normpath(rel.get('Target', DEFAULT_DOCUMENT_PATH).lstrip('/'))
+    return DEFAULT_DOCUMENT_PATH
+
+
+def paragraph_text(paragraph):
+    """Texto de um <w:p>, como o paragraph.text do python-docx (runs e hyperlinks)"""
+    pieces = []
+    for child in paragraph:
+        if child.tag == _R:
+            runs = (child,)
+        elif child.tag == _HYPERLINK:
+            runs = [run for run in child if run.tag == _R]
+        else:
+            continue
+        for run in runs:
+            for item in run:
+                if item.tag == _T:
+                    pieces.append(item.text or '')
+                elif item.tag == _BR:
+                    pieces.append('\n' if item.get(_BREAK_TYPE, 'textWrapping') == 'textWrapping' else '')
+                else:
+                    pieces.append(_RUN_TEXT.get(item.tag, ''))
+    return ''.join(pieces)
+
+
+def iter_docx_paragraphs(path):
+    """
+    Texto de cada parágrafo do corpo do documento, em ordem (os mesmos de
+    Document(path).paragraphs), com memória constante.
+    """
+    with zipfile.ZipFile(path) as archive, archive.open(main_document_path(archive)) as stream:
+        depth = 0
+        body = None
+        for event, elem in ET.iterparse(stream, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                if depth == 2 and elem.tag == _BODY:
+                    body = elem
+                continue
+            # Filhos diretos do corpo: w:p vira texto; tabelas e sectPr são ignorados
+            if depth == 3 and body is not None:
+                if elem.tag == _P:
+                    yield paragraph_text(elem)
+                body.clear()
+            depth -= 1
+
+
+def pair_markers(texts):
+    """
+    Pares (marcador, texto) a partir dos textos dos parágrafos: o primeiro
+    parágrafo com texto depois de um ###IDxxxx### é o texto desse segmento.
+    Linhas em branco e comentários (<!-- ... -->) são ignorados.
+    """
+    current_id = None
+    for text in texts:
+        text = text.strip()
+        if text.startswith('###ID') and text.endswith('###'):
+            current_id = text
+        elif current_id and text and not text.startswith('<!--'):
+            yield current_id, text
+            current_id = None
+
+
+def iter_docx_segments(path):
+    """Pares (marcador, texto) de um DOCX de tradução, lidos em fluxo"""
+    return pair_markers(iter_docx_paragraphs(path))
@@ -8,7 +8,8 @@ import os
 import sys
 
 # Importar a função do script limpo
-from tradutor_docx_clean import reconstruct_from_clean_docx
+from tradutor_docx_clean import (find_translated_shards, find_translated_single, load_translation_manifest,
+                                  reconstruct_from_clean_docx)
 
 def main():
     """
@@ -31,10 +32,20 @@ def main():
         print(f"❌ Arquivo original não encontrado: {original_json}")
         return
     
-    # Procurar arquivo traduzido no diretório output
-    docx_files = [f for f in os.listdir(output_dir) if f.endswith('.docx') and 'traduzido' in f.lower()]
+    # DOCX dividido em partes: usar todas as partes traduzidas
+    clean_docx = os.path.join(output_dir, 'livro_en_CLEAN_for_translation.docx')
+    shard_files = find_translated_shards(output_dir, clean_docx)
+    manifest = load_translation_manifest(clean_docx) if shard_files else None
     
-    if not docx_files:
+    # Procurar arquivo traduzido no diretório output (partes soltas não valem pelo documento inteiro)
+    single_docx = find_translated_single(output_dir)
+    
+    if shard_files:
+        translated_docx = shard_files
+        print(f"📂 Partes traduzidas encontradas: {len(shard_files)}")
+        for shard_file in shard_files:
+            print(f"   • {os.path.basename(shard_file)}")
+    elif not single_docx:
         # Procurar arquivo específico
         expected_file = os.path.join(output_dir, 'livro_en_CLEAN_for_translation.docx')
         if os.path.exists(expected_file):
@@ -70,11 +81,11 @@ def main():
             return
     else:
         # Usar o primeiro arquivo encontrado
-        translated_docx = os.path.join(output_dir, docx_files[0])
+        translated_docx = single_docx
         print(f"📂 Arquivo traduzido encontrado: {translated_docx}")
     
     # Verificar se arquivo traduzido existe
-    if not os.path.exists(translated_docx):
+    if not shard_files and not os.path.exists(translated_docx):
         print(f"❌ Arquivo traduzido não encontrado: {translated_docx}")
         return
     
@@ -88,7 +99,7 @@ def main():
     
     # Executar reconstrução
     try:
-        reconstruct_from_clean_docx(translated_docx, output_json, original_json)
+        reconstruct_from_clean_docx(translated_docx, output_json, original_json, manifest=manifest)
         
         print(f"\n🎉 TRADUÇÃO CONCLUÍDA COM SUCESSO!")
         print(f"   📂 Arquivo gerado: {output_json}")
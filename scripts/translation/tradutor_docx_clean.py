@@ -5,14 +5,28 @@ Remove metadados como "Chapter 1", "Part 1" etc. que contaminam a tradução.
 Inclui também a Oração Dedicatória e o Prefácio.
 """
 
-import json
 import os
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from docx import Document
 from docx.shared import Inches
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-from typing import Dict, List, Any
+from typing import List
 import xml.etree.ElementTree as ET
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'common'))
+from book_model import Book
+from rule_engine import RuleEngine
+from docx_ooxml import (GOOGLE_TRANSLATE_LIMIT, is_shard_file, iter_docx_segments, load_manifest, manifest_path, marker_id,
+                        pair_markers, write_translation_docx)
+
+DOCX_TITLE = 'Introduction to the Devout Life'
+DOCX_NOTE = '<!-- TECHNICAL INFO: Keep ###IDXXXX### markers for reconstruction -->'
+
+# Escritores do DOCX de tradução: OOXML em fluxo (padrão) ou python-docx
+DOCX_ENGINES = ('ooxml', 'python-docx')
+
 def extract_text_from_xhtml(xhtml_file: str) -> List[str]:
     """
     Extrai texto de um arquivo XHTML, preservando parágrafos.
@@ -65,6 +79,17 @@ def extract_text_from_xhtml(xhtml_file: str) -> List[str]:
         print(f"   ⚠️ Erro ao processar {xhtml_file}: {e}")
         return []
 
+def translation_marker(id_number: int) -> str:
+    """Marcador de um segmento no DOCX de tradução (###ID0001###)"""
+    return f"###ID{id_number:04d}###"
+
+def add_segment_to_docx(doc: Document, marker: str, text: str):
+    """Adiciona um segmento ao documento python-docx: marcador, texto justificado e linha em branco"""
+    doc.add_paragraph(marker)
+    para = doc.add_paragraph(text)
+    para.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
+    doc.add_paragraph()  # Linha em branco
+
 def add_xhtml_content_to_docx(doc: Document, xhtml_file: str, content_type: str, id_counter: int) -> int:
     """
     Adiciona conteúdo de um arquivo XHTML ao documento DOCX.
@@ -84,127 +109,144 @@ def add_xhtml_content_to_docx(doc: Document, xhtml_file: str, content_type: str,
     if paragraphs:
         print(f"   📄 Incluindo {content_type}...")
         for paragraph in paragraphs:
-            marker = f"###ID{id_counter:04d}###"
+            add_segment_to_docx(doc, translation_marker(id_counter), paragraph)
             id_counter += 1
-            
-            doc.add_paragraph(marker)
-            para = doc.add_paragraph(paragraph)
-            para.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
-            doc.add_paragraph()  # Linha em branco
     
     return id_counter
 
-def create_clean_docx_for_translation(input_file: str, output_file: str):
+def front_matter_xhtml_files():
+    """Arquivos XHTML da Oração Dedicatória e do Prefácio em inglês, com o nome para o log"""
+    script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Volta 2 níveis
+    epub_processing_dir = os.path.join(script_dir, 'epub_processing')
+    return [
+        (os.path.join(epub_processing_dir, 'dedicatory_prayer_en.xhtml'), "Oração Dedicatória"),
+        (os.path.join(epub_processing_dir, 'preface_en.xhtml'), "Prefácio"),
+    ]
+
+def iter_translation_segments(book_data: Book):
     """
-    Cria arquivo .docx LIMPO com APENAS conteúdo textual para tradução.
-    Remove todos os metadados que podem contaminar a tradução automática.
-    Inclui Oração Dedicatória e Prefácio seguindo o princípio DRY.
+    Segmentos do DOCX de tradução, na ordem dos IDs: Oração Dedicatória e
+    Prefácio (XHTML), depois título e subtítulo de cada parte, título de cada
+    capítulo e cada parágrafo com texto. Os metadados ("Chapter 1", "Part 1")
+    não entram.
     
-    Args:
-        input_file (str): Arquivo JSON em inglês
-        output_file (str): Arquivo .docx de saída
+    Yields:
+        tuple: (marcador ###IDxxxx###, texto)
     """
-    print(f"🧹 Criando arquivo .docx LIMPO para tradução...")
-    print(f"   ℹ️  Incluindo Oração Dedicatória e Prefácio")
-    print(f"   ℹ️  Removendo metadados como 'Chapter 1', 'Part 1' etc.")
-    print(f"   📂 Origem: {input_file}")
-    print(f"   📂 Destino: {output_file}")
+    id_counter = 1
     
-    # Carrega o arquivo JSON
-    with open(input_file, 'r', encoding='utf-8') as f:
-        book_data = json.load(f)
+    for xhtml_file, content_type in front_matter_xhtml_files():
+        paragraphs = extract_text_from_xhtml(xhtml_file)
+        if paragraphs:
+            print(f"   📄 Incluindo {content_type}...")
+        for paragraph in paragraphs:
+            yield translation_marker(id_counter), paragraph
+            id_counter += 1
     
-    # Cria documento Word minimalista
+    for part_idx, part in enumerate(book_data):
+        print(f"   📖 Processando Parte {part_idx + 1}...")
+        
+        # APENAS o texto do título e do subtítulo da parte (SEM "PART 1")
+        for text in (part.part_title or '', part.part_subtitle or ''):
+            if text:
+                yield translation_marker(id_counter), text
+                id_counter += 1
+        
+        for chapter in part.chapters or []:
+            # APENAS o texto do título, sem "Chapter X"
+            chapter_title = chapter.chapter_title or ''
+            if chapter_title:
+                yield translation_marker(id_counter), chapter_title
+                id_counter += 1
+            
+            # APENAS o conteúdo textual puro
+            for content_item in chapter.content or []:
+                if content_item.type in ['p', 'h1', 'h2', 'h3']:
+                    content_text = content_item.content or ''
+                    if content_text.strip():
+                        yield translation_marker(id_counter), content_text
+                        id_counter += 1
+
+def write_docx_python_docx(segments, output_file: str) -> int:
+    """
+    Grava o DOCX de tradução com python-docx (modelo de objetos em memória).
+    
+    Returns:
+        int: Número de segmentos gravados
+    """
     doc = Document()
     
     # APENAS um título simples (que pode ser traduzido)
-    title = doc.add_heading('Introduction to the Devout Life', 0)
+    title = doc.add_heading(DOCX_TITLE, 0)
     title.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
     
     # Informações técnicas em comentário (não serão traduzidas)
-    doc.add_paragraph('<!-- TECHNICAL INFO: Keep ###IDXXXX### markers for reconstruction -->').alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+    doc.add_paragraph(DOCX_NOTE).alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
     doc.add_page_break()
     
-    # Contador para IDs únicos
-    id_counter = 1
-    total_texts = 0
+    total = 0
+    for marker, text in segments:
+        add_segment_to_docx(doc, marker, text)
+        total += 1
     
-    # Determinar caminhos dos arquivos XHTML (princípio DRY)
-    script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Volta 2 níveis
-    epub_processing_dir = os.path.join(script_dir, 'epub_processing')
+    doc.save(output_file)
+    return total
+
+def write_docx_ooxml(segments, output_file: str, max_bytes: int = None, max_segments: int = None) -> dict:
+    """
+    Grava o DOCX de tradução em fluxo, direto no zip (docx_ooxml.py), dividido
+    em partes se passar de max_bytes ou max_segments.
     
-    # Incluir Oração Dedicatória (reutilizando função)
-    dedicatory_prayer_file = os.path.join(epub_processing_dir, 'dedicatory_prayer_en.xhtml')
-    old_counter = id_counter
-    id_counter = add_xhtml_content_to_docx(doc, dedicatory_prayer_file, "Oração Dedicatória", id_counter)
-    total_texts += (id_counter - old_counter)
+    Returns:
+        dict: Manifesto com as partes gravadas (uma só, se não houve divisão)
+    """
+    return write_translation_docx(output_file, segments, DOCX_TITLE, DOCX_NOTE,
+                                  max_bytes=max_bytes, max_segments=max_segments)
+
+def create_clean_docx_for_translation(input_file: str, output_file: str, book_data: Book = None,
+                                      engine: str = 'ooxml', max_bytes: int = None, max_segments: int = None):
+    """
+    Cria arquivo .docx LIMPO com APENAS conteúdo textual para tradução.
+    Remove todos os metadados que podem contaminar a tradução automática.
+    Inclui Oração Dedicatória e Prefácio seguindo o princípio DRY.
     
-    # Incluir Prefácio (reutilizando função)
-    preface_file = os.path.join(epub_processing_dir, 'preface_en.xhtml')
-    old_counter = id_counter
-    id_counter = add_xhtml_content_to_docx(doc, preface_file, "Prefácio", id_counter)
-    total_texts += (id_counter - old_counter)
+    Args:
+        input_file (str): Arquivo JSON em inglês
+        output_file (str): Arquivo .docx de saída
+        book_data (Book, optional): Livro já carregado em memória; se informado,
+            input_file não é lido (pipeline em processo)
+        engine (str): 'ooxml' (escrita em fluxo direto no zip, padrão) ou 'python-docx'
+        max_bytes (int, optional): Divide o documento em partes de até max_bytes
+            (ex.: GOOGLE_TRANSLATE_LIMIT), com manifesto (só com 'ooxml')
+        max_segments (int, optional): Divide o documento em partes de até
+            max_segments textos (só com 'ooxml')
+    """
+    if engine not in DOCX_ENGINES:
+        raise ValueError(f"Escritor de DOCX desconhecido: {engine} (use {', '.join(DOCX_ENGINES)})")
+    if engine != 'ooxml' and (max_bytes or max_segments):
+        raise ValueError("A divisão em partes só é suportada pelo escritor 'ooxml'")
     
-    # Processa cada parte do livro
-    for part_idx, part in enumerate(book_data):
-        print(f"   📖 Processando Parte {part_idx + 1}...")
-        
-        # APENAS o conteúdo do título da parte (SEM "PART 1")
-        part_title = part.get('part_title', '')
-        if part_title:
-            marker = f"###ID{id_counter:04d}###"
-            id_counter += 1
-            total_texts += 1
-            
-            # APENAS o texto, sem marcadores de "PART X"
-            doc.add_paragraph(marker)
-            para = doc.add_paragraph(part_title)
-            para.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
-            doc.add_paragraph()  # Linha em branco
-        
-        # Adicionar part_subtitle se existir
-        part_subtitle = part.get('part_subtitle', '')
-        if part_subtitle:
-            marker = f"###ID{id_counter:04d}###"
-            id_counter += 1
-            total_texts += 1
-            
-            doc.add_paragraph(marker)
-            para = doc.add_paragraph(part_subtitle)
-            para.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
-            doc.add_paragraph()  # Linha em branco
-        
-        # Processa capítulos
-        for chapter_idx, chapter in enumerate(part.get('chapters', [])):
-            chapter_title = chapter.get('chapter_title', '')
-            if chapter_title:
-                marker = f"###ID{id_counter:04d}###"
-                id_counter += 1
-                total_texts += 1
-                
-                # APENAS o texto do título, sem "Chapter X"
-                doc.add_paragraph(marker)
-                para = doc.add_paragraph(chapter_title)
-                para.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
-                doc.add_paragraph()  # Linha em branco
-            
-            # Processa conteúdo do capítulo
-            for content_item in chapter.get('content', []):
-                if content_item.get('type') in ['p', 'h1', 'h2', 'h3']:
-                    content_text = content_item.get('content', '')
-                    if content_text.strip():
-                        marker = f"###ID{id_counter:04d}###"
-                        id_counter += 1
-                        total_texts += 1
-                        
-                        # APENAS o conteúdo textual puro
-                        doc.add_paragraph(marker)
-                        para = doc.add_paragraph(content_text)
-                        para.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
-                        doc.add_paragraph()  # Linha em branco
-    
-    # Salva o arquivo
-    doc.save(output_file)
+    print(f"🧹 Criando arquivo .docx LIMPO para tradução...")
+    print(f"   ℹ️  Incluindo Oração Dedicatória e Prefácio")
+    print(f"   ℹ️  Removendo metadados como 'Chapter 1', 'Part 1' etc.")
+    print(f"   📂 Origem: {input_file}")
+    print(f"   📂 Destino: {output_file}")
+    
+    # Carrega o arquivo JSON
+    if book_data is None:
+        book_data = Book.load(input_file)
+    
+    # Os segmentos são gravados à medida que são gerados
+    segments = iter_translation_segments(book_data)
+    if engine == 'ooxml':
+        manifest = write_docx_ooxml(segments, output_file, max_bytes, max_segments)
+        total_texts = manifest['segments']
+    else:
+        manifest = None
+        total_texts = write_docx_python_docx(segments, output_file)
+    
+    if manifest is not None and len(manifest['shards']) > 1:
+        return report_docx_shards(output_file, manifest)
     
     # Verifica o tamanho do arquivo
     file_size = os.path.getsize(output_file)
@@ -218,10 +260,32 @@ def create_clean_docx_for_translation(input_file: str, output_file: str):
     
     if file_size_mb > 10:
         print(f"   ⚠️  ATENÇÃO: Arquivo maior que 10MB. Google Translate tem limite de 10MB.")
+        print(f"   💡 Use --max-shard-bytes para dividir o documento em partes menores.")
         return False
     
     return True
 
+def report_docx_shards(output_file: str, manifest: dict) -> bool:
+    """
+    Mostra as partes de um DOCX dividido.
+    
+    Returns:
+        bool: True se todas as partes respeitam o limite de tamanho
+    """
+    print(f"\n✅ Arquivo .docx LIMPO criado com sucesso, dividido em {len(manifest['shards'])} partes!")
+    for shard in manifest['shards']:
+        print(f"   📂 {shard['file']}: IDs {shard['first_id']}–{shard['last_id']} "
+              f"({shard['segments']} textos, {shard['bytes'] / (1024 * 1024):.2f} MB)")
+    print(f"   🗂️  Manifesto: {manifest_path(output_file)}")
+    print(f"   📝 Total de textos: {manifest['segments']}")
+    print(f"   🎯 SEM metadados contaminantes!")
+    
+    oversized = [shard for shard in manifest['shards']
+                 if manifest['max_bytes'] and shard['bytes'] > manifest['max_bytes']]
+    for shard in oversized:
+        print(f"   ⚠️  {shard['file']} passa do limite: um único texto maior que {manifest['max_bytes']} bytes")
+    return not oversized
+
 def create_translated_xhtml_files(translated_texts: dict):
     """
     Cria arquivos XHTML traduzidos a partir dos textos do DOCX.
@@ -324,102 +388,172 @@ def create_translated_xhtml_files(translated_texts: dict):
         print(f"   ✅ Prefácio criado: {preface_file}")
 
 
-def apply_portuguese_ad_hoc_fixes(json_data):
+# Correções específicas para português em data/rules/ad_hoc_pt.json
+PORTUGUESE_RULES = 'ad_hoc_pt'
+
+PORTUGUESE_FIELD_LABELS = {
+    'part_title': 'Parte',
+    'part_subtitle': 'Subtítulo',
+    'chapter_title': 'Capítulo',
+}
+
+def apply_portuguese_ad_hoc_fixes(json_data, change_log=None):
     """
     Aplica correções ad hoc específicas para o português
     Corrige "Filotéia" para "Filoteia" em todo o JSON
-    """
-    fixes_applied = 0
     
-    # Correções específicas para português
-    corrections = {
-        "Filotéia": "Filoteia",
-        "filotéia": "filoteia",
-        # Adicione outras correções portuguesas aqui se necessário
-    }
+    Args:
+        json_data (list): Partes do livro (alteradas no lugar)
+        change_log (ChangeLog, optional): Log estruturado a completar
     
+    Returns:
+        int: Correções aplicadas
+    """
     print("🔧 Aplicando correções ad hoc para português...")
     
-    for part in json_data:
-        # Corrigir títulos de partes
-        if 'part_title' in part:
-            original = part['part_title']
-            for wrong, correct in corrections.items():
-                if wrong in original:
-                    part['part_title'] = original.replace(wrong, correct)
-                    fixes_applied += 1
-                    print(f"   ✏️  Parte: '{wrong}' → '{correct}'")
-        
-        # Corrigir subtítulos de partes
-        if 'part_subtitle' in part:
-            original = part['part_subtitle']
-            for wrong, correct in corrections.items():
-                if wrong in original:
-                    part['part_subtitle'] = original.replace(wrong, correct)
-                    fixes_applied += 1
-                    print(f"   ✏️  Subtítulo: '{wrong}' → '{correct}'")
-        
-        # Corrigir capítulos
-        for chapter in part.get('chapters', []):
-            if 'chapter_title' in chapter:
-                original = chapter['chapter_title']
-                for wrong, correct in corrections.items():
-                    if wrong in original:
-                        chapter['chapter_title'] = original.replace(wrong, correct)
-                        fixes_applied += 1
-                        print(f"   ✏️  Capítulo: '{wrong}' → '{correct}'")
-            
-            # Corrigir conteúdo
-            for paragraph in chapter.get('content', []):
-                if 'content' in paragraph:
-                    original = paragraph['content']
-                    for wrong, correct in corrections.items():
-                        if wrong in original:
-                            paragraph['content'] = original.replace(wrong, correct)
-                            # Recalcular word_count
-                            paragraph['word_count'] = len(paragraph['content'].split())
-                            fixes_applied += 1
-                            # Mostrar apenas primeiras palavras para não poluir o log
-                            preview = original[:50] + "..." if len(original) > 50 else original
-                            print(f"   ✏️  Texto: '{wrong}' em '{preview}'")
-    
-    return fixes_applied
+    log = RuleEngine([PORTUGUESE_RULES]).apply_book(json_data)
+    for change in log.changes:
+        for wrong, correct in change['rules']:
+            if change['field'] == 'content':
+                # Mostrar apenas primeiras palavras para não poluir o log
+                original = change['original']
+                preview = original[:50] + "..." if len(original) > 50 else original
+                print(f"   ✏️  Texto: '{wrong}' em '{preview}'")
+            else:
+                print(f"   ✏️  {PORTUGUESE_FIELD_LABELS[change['field']]}: '{wrong}' → '{correct}'")
+    
+    if change_log is not None:
+        change_log.extend(log)
+    return log.corrections
 
-def reconstruct_from_clean_docx(docx_file: str, output_json: str, original_json: str):
+def read_translated_texts(docx_file: str) -> dict:
+    """
+    Textos traduzidos do .docx, por marcador ({'###ID0001###': texto}).
+    Lê o word/document.xml em fluxo (docx_ooxml.py); se o pacote não puder
+    ser lido assim, recorre ao python-docx.
+    """
+    try:
+        return dict(iter_docx_segments(docx_file))
+    except (KeyError, zipfile.BadZipFile, ET.ParseError) as e:
+        print(f"   ⚠️ Leitura direta do .docx falhou ({e}); usando python-docx")
+        doc = Document(docx_file)
+        return dict(pair_markers(para.text for para in doc.paragraphs))
+
+def find_translated_shards(output_dir: str, clean_docx: str) -> list:
+    """
+    Partes traduzidas de um DOCX dividido: arquivos .docx com 'traduzido' e
+    '_partNN' no nome, procurados só se existir o manifesto da divisão de clean_docx.
+    
+    Returns:
+        list: Caminhos das partes (vazia se o documento não foi dividido)
+    """
+    if not os.path.exists(manifest_path(clean_docx)) or not os.path.isdir(output_dir):
+        return []
+    return sorted(os.path.join(output_dir, f) for f in os.listdir(output_dir)
+                  if f.endswith('.docx') and 'traduzido' in f.lower() and is_shard_file(f))
+
+def find_translated_single(output_dir: str) -> str:
+    """
+    DOCX traduzido avulso: o primeiro .docx com 'traduzido' no nome que não é
+    uma parte ('_partNN'). Partes nunca valem pelo documento inteiro.
+    
+    Returns:
+        str: Caminho do arquivo, ou None se não houver
+    """
+    if not os.path.isdir(output_dir):
+        return None
+    docx_files = sorted(f for f in os.listdir(output_dir)
+                        if f.endswith('.docx') and 'traduzido' in f.lower() and not is_shard_file(f))
+    return os.path.join(output_dir, docx_files[0]) if docx_files else None
+
+def load_translation_manifest(clean_docx: str) -> dict:
+    """Manifesto da divisão de clean_docx, ou None (com aviso) se não existir"""
+    try:
+        return load_manifest(manifest_path(clean_docx))
+    except FileNotFoundError:
+        print(f"   ⚠️  Manifesto não encontrado: {manifest_path(clean_docx)}; os IDs das partes não serão conferidos")
+        return None
+
+def read_translated_shards(docx_files: list, workers: int = None, manifest: dict = None) -> dict:
+    """
+    Textos traduzidos de um conjunto de .docx (as partes de um documento
+    dividido, em qualquer ordem e com qualquer nome), lidos em paralelo.
+    
+    Args:
+        docx_files (list): Arquivos .docx traduzidos
+        workers (int, optional): Processos de leitura (padrão: número de CPUs)
+        manifest (dict, optional): Manifesto da divisão (load_translation_manifest),
+            para conferir se todos os IDs de cada parte foram encontrados
+    
+    Returns:
+        dict: Textos de todas as partes, por marcador
+    """
+    docx_files = sorted(docx_files)
+    workers = min(workers or os.cpu_count() or 1, len(docx_files))
+    if workers > 1:
+        print(f"   ⚙️  Lendo {len(docx_files)} partes com {workers} processos")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(read_translated_texts, docx_files))
+    else:
+        results = [read_translated_texts(docx_file) for docx_file in docx_files]
+    
+    translated_texts = {}
+    for docx_file, texts in zip(docx_files, results):
+        ids = sorted(marker_id(marker) for marker in texts)
+        id_range = f" (IDs {ids[0]}–{ids[-1]})" if ids else ""
+        print(f"   📄 {os.path.basename(docx_file)}: {len(texts)} textos{id_range}")
+        repeated = translated_texts.keys() & texts.keys()
+        if repeated:
+            print(f"   ⚠️  {len(repeated)} marcadores repetidos em {os.path.basename(docx_file)}; vale este arquivo")
+        translated_texts.update(texts)
+    
+    if manifest:
+        found = {marker_id(marker) for marker in translated_texts}
+        for shard in manifest['shards']:
+            if shard['first_id'] is None:
+                continue
+            missing = sum(1 for number in range(shard['first_id'], shard['last_id'] + 1) if number not in found)
+            if missing:
+                print(f"   ⚠️  {shard['file']}: {missing} de {shard['segments']} textos não encontrados")
+    
+    return translated_texts
+
+def reconstruct_from_clean_docx(docx_file, output_json: str, original_json: str,
+                                original_data: Book = None, workers: int = None, manifest: dict = None):
     """
     Reconstrói o arquivo JSON a partir do .docx traduzido LIMPO.
     Inclui processamento da Oração Dedicatória e Prefácio traduzidos.
     
     Args:
-        docx_file (str): Arquivo .docx traduzido pelo Google Translate
+        docx_file (str | list): Arquivo .docx traduzido pelo Google Translate ou,
+            para um documento dividido, a lista das partes traduzidas
         output_json (str): Arquivo JSON de saída em português
         original_json (str): Arquivo JSON original em inglês (para estrutura)
+        original_data (Book, optional): Livro em inglês já carregado em memória;
+            se informado, original_json não é lido (o objeto é modificado)
+        workers (int, optional): Processos para ler as partes (documento dividido)
+        manifest (dict, optional): Manifesto da divisão (documento dividido)
+        
+    Returns:
+        Book: Estrutura do livro em português
     """
     print(f"🔄 Reconstruindo JSON a partir do .docx traduzido...")
-    print(f"   📂 Arquivo traduzido: {docx_file}")
+    if isinstance(docx_file, (list, tuple)):
+        print(f"   📂 Partes traduzidas: {len(docx_file)}")
+    else:
+        print(f"   📂 Arquivo traduzido: {docx_file}")
     print(f"   📂 JSON original: {original_json}")
     print(f"   📂 JSON de saída: {output_json}")
     
     # Carrega arquivo original para manter estrutura
-    with open(original_json, 'r', encoding='utf-8') as f:
-        original_data = json.load(f)
-    
-    # Extrai textos traduzidos do .docx
-    doc = Document(docx_file)
-    translated_texts = {}
+    if original_data is None:
+        original_data = Book.load(original_json)
     
-    # Processa parágrafos do documento
-    current_id = None
-    for para in doc.paragraphs:
-        text = para.text.strip()
-        
-        # Verifica se é um marcador ID
-        if text.startswith('###ID') and text.endswith('###'):
-            current_id = text
-        elif current_id and text and not text.startswith('<!--'):
-            # É um texto traduzido
-            translated_texts[current_id] = text
-            current_id = None
+    # Extrai textos traduzidos do .docx (ou de todas as partes)
+    if isinstance(docx_file, (list, tuple)):
+        translated_texts = read_translated_shards(docx_file, workers, manifest)
+    else:
+        translated_texts = read_translated_texts(docx_file)
     
     print(f"   📝 Textos traduzidos extraídos: {len(translated_texts)}")
     
@@ -448,84 +582,79 @@ def reconstruct_from_clean_docx(docx_file: str, output_json: str, original_json:
         if 'part_title' in part:
             marker = f"###ID{id_counter:04d}###"
             if marker in translated_texts:
-                part['part_title'] = translated_texts[marker]
+                part.part_title = translated_texts[marker]
             id_counter += 1
         
         # Traduz subtítulo da parte
         if 'part_subtitle' in part:
             marker = f"###ID{id_counter:04d}###"
             if marker in translated_texts:
-                part['part_subtitle'] = translated_texts[marker]
+                part.part_subtitle = translated_texts[marker]
             id_counter += 1
         
         # Traduz capítulos
-        for chapter in part.get('chapters', []):
+        for chapter in part.chapters or []:
             # Traduz título do capítulo
             if 'chapter_title' in chapter:
                 marker = f"###ID{id_counter:04d}###"
                 if marker in translated_texts:
-                    chapter['chapter_title'] = translated_texts[marker]
+                    chapter.chapter_title = translated_texts[marker]
                 id_counter += 1
             
             # Traduz conteúdo
-            for content_item in chapter.get('content', []):
-                if content_item.get('type') in ['p', 'h1', 'h2', 'h3'] and content_item.get('content', '').strip():
+            for content_item in chapter.content or []:
+                if content_item.type in ['p', 'h1', 'h2', 'h3'] and (content_item.content or '').strip():
                     marker = f"###ID{id_counter:04d}###"
                     if marker in translated_texts:
-                        content_item['content'] = translated_texts[marker]
-                        # Recalcula word count
-                        content_item['word_count'] = len(translated_texts[marker].split())
+                        # word_count recalculado só se a tradução mudou o texto
+                        content_item.content = translated_texts[marker]
                     id_counter += 1
     
-    # Recompute word_count for every content item as the last step before saving
-    def _recompute_counts(struct):
-        items = 0
-        for part in struct:
-            for ch in part.get('chapters', []):
-                for it in ch.get('content', []):
-                    if isinstance(it, dict) and 'content' in it:
-                        it['word_count'] = len((it.get('content') or '').split())
-                        items += 1
-        return items
-    recomputed_items = _recompute_counts(original_data)
-    
     # Aplicar correções ad hoc para português (antes de salvar)
     print(f"\n🔧 Aplicando correções ad hoc para português...")
     fixes_applied = apply_portuguese_ad_hoc_fixes(original_data)
     
-    # Recalcular word_count novamente após as correções
+    # O motor de regras já atualiza o word_count dos parágrafos alterados
     if fixes_applied > 0:
-        final_recomputed = _recompute_counts(original_data)
         print(f"   📊 Correções aplicadas: {fixes_applied}")
-        print(f"   🔢 word_count recalculado novamente em {final_recomputed} itens")
     
     # Salva arquivo JSON traduzido
-    with open(output_json, 'w', encoding='utf-8') as f:
-        json.dump(original_data, f, indent=2, ensure_ascii=False)
+    original_data.save(output_json)
     
     print(f"✅ Arquivo JSON em português criado: {output_json}")
     
     # Estatísticas
     total_parts = len(original_data)
-    total_chapters = sum(len(part.get('chapters', [])) for part in original_data)
-    total_content = sum(
-        len(chapter.get('content', [])) 
-        for part in original_data 
-        for chapter in part.get('chapters', [])
-    )
+    total_chapters = sum(len(part.chapters or []) for part in original_data)
+    total_content = sum(len(chapter.content or []) for chapter in original_data.chapters())
     
     print(f"\n📊 ESTATÍSTICAS DA TRADUÇÃO:")
     print(f"   📚 Partes: {total_parts}")
     print(f"   📖 Capítulos: {total_chapters}")
     print(f"   📝 Itens de conteúdo: {total_content}")
     print(f"   🔄 Textos traduzidos aplicados: {len(translated_texts)}")
-    print(f"   🔢 word_count recalculado em {recomputed_items} itens")
     if fixes_applied > 0:
         print(f"   🔧 Correções ad hoc aplicadas: {fixes_applied}")
         print(f"   ✨ Filotéia → Filoteia corrigido em todo o texto")
+    
+    return original_data
 
 def main():
     """Função principal"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Gera o DOCX limpo para tradução no Google Translate")
+    parser.add_argument('--engine', choices=DOCX_ENGINES, default='ooxml',
+                        help="Escritor do DOCX: OOXML em fluxo (padrão) ou python-docx")
+    parser.add_argument('--max-shard-bytes', type=int, default=GOOGLE_TRANSLATE_LIMIT,
+                        help="Divide o DOCX em partes de até N bytes (padrão: limite de 10MB do Google "
+                             "Translate; 0 = sem divisão por tamanho)")
+    parser.add_argument('--max-shard-segments', type=int, default=None,
+                        help="Divide o DOCX em partes de até N textos")
+    args = parser.parse_args()
+    if args.engine != 'ooxml':
+        args.max_shard_bytes = args.max_shard_segments = None
+    
     print("🧹 GERADOR DE DOCX LIMPO PARA TRADUÇÃO")
     print("Remove metadados contaminantes como 'Chapter 1', 'Part 1' etc.")
     print("=" * 60)
@@ -546,13 +675,15 @@ def main():
         return
     
     # Gera .docx limpo
-    success = create_clean_docx_for_translation(input_json, output_docx)
+    success = create_clean_docx_for_translation(input_json, output_docx, engine=args.engine,
+                                                max_bytes=args.max_shard_bytes or None,
+                                                max_segments=args.max_shard_segments)
     
     if success:
         print(f"\n🎯 PRÓXIMOS PASSOS:")
-        print(f"1. 📤 Faça upload do arquivo '{output_docx}' no Google Translate")
+        print(f"1. 📤 Faça upload do arquivo '{output_docx}' (ou de cada parte) no Google Translate")
         print(f"2. 🇧🇷 Traduza de Inglês para Português")
-        print(f"3. 📥 Baixe o arquivo traduzido")
+        print(f"3. 📥 Baixe o arquivo traduzido (cada parte com 'traduzido' no nome)")
         print(f"4. 🔄 Execute a função de reconstrução para gerar o JSON em português")
         print(f"\n✨ O arquivo está LIMPO, sem metadados contaminantes!")
     else: